@@ -1,11 +1,12 @@
-from flask import Flask, jsonify, g, request
+from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_limiter.errors import RateLimitExceeded
 from .config import Config, TestingConfig
 from .extensions import db, migrate, jwt, limiter
-from app.models.user import User
 from app.celery_app import create_celery
 from app.utils.security import register_jwt_callbacks
+from app.utils.uploads import StreamingUploadRequest
+from app.ml.backends import validate_backend_config
 from app.audit.logging_config import add_console_handlers, get_technical_logger, get_audit_logger
 from app.audit.audit import log_tech
 
@@ -13,6 +14,8 @@ from app.audit.audit import log_tech
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    # Uploaded files are streamed to disk and hashed while the body is parsed
+    app.request_class = StreamingUploadRequest
 
     # Inicializar loggers (agregar consola en testing o debug)
     if app.debug or isinstance(config_class, type) and config_class is TestingConfig:
@@ -23,6 +26,9 @@ def create_app(config_class=Config):
     
     log_tech.info("Iniciando aplicación NeuroScreen")
 
+    # Fail at startup instead of ignoring INFERENCE_BACKEND on every record
+    validate_backend_config()
+
     # Enable CORS with secure configuration
     CORS(app, 
          resources={r"/api/*": {
@@ -43,32 +49,6 @@ def create_app(config_class=Config):
     def user_identity_lookup(user):
         return str(user)
 
-    @jwt.user_lookup_loader
-    def user_lookup_callback(_jwt_header, jwt_data):
-        identity = jwt_data["sub"]
-        try:
-            from uuid import UUID
-            user_id = UUID(identity)
-        except Exception:
-            user_id = identity
-        return db.session.get(User, user_id)
-    
-    # Middleware para registrar información del usuario en g (global)
-    @app.before_request
-    def before_request():
-        # Almacenar info del usuario en g para uso en loggers
-        try:
-            from flask_jwt_extended import get_jwt_identity
-            user_id = get_jwt_identity()
-            if user_id:
-                g.user_id = user_id
-                # Intentar obtener email del usuario para auditoría
-                user = db.session.get(User, user_id)
-                if user:
-                    g.user_email = user.email
-        except Exception:
-            pass
-    
     @app.errorhandler(RateLimitExceeded)
     def handle_rate_limit(e):
         return jsonify({
@@ -86,6 +66,14 @@ def create_app(config_class=Config):
 
     app.register_blueprint(api_bp, url_prefix="/api")
 
+    # Only the API process: the worker warms up each pool process after the fork
+    if app.config.get("WARM_UP_MODEL_ON_API_START") and app.config.get("APP_ROLE") == "api":
+        from app.ml.warmup import warm_up_model
+        try:
+            warm_up_model()
+        except Exception as e:
+            log_tech.error(f"Model warm-up failed: {e}")
+
     return app
 
 
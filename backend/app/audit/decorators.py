@@ -20,7 +20,10 @@ def audit(action, resource, details_fn=None):
 
             except AppError as e:
                 log_action(action=action, resource=resource, details=details, status="failed")
-                return jsonify({"error": e.message}), e.http_status
+                headers = {}
+                if getattr(e, "retry_after", None) is not None:
+                    headers["Retry-After"] = str(e.retry_after)
+                return jsonify({"error": e.message}), e.http_status, headers
 
             except Exception as e:
                 current_app.logger.exception(e)
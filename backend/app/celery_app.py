@@ -1,22 +1,47 @@
+from celery.signals import worker_process_init
 from app.extensions import celery 
 
-def create_celery(app):
-    celery.conf.update(
-        broker_url=app.config["BROKER_URL"],
-        result_backend=app.config["RESULT_BACKEND"],
+def celery_settings(config) -> dict:
+    """Celery settings from the Flask app config"""
+    return dict(
+        broker_url=config["BROKER_URL"],
+        result_backend=config["RESULT_BACKEND"],
         task_serializer="json",
         result_serializer="json",
         accept_content=["json"],
-        task_always_eager=app.config.get("CELERY_TASK_ALWAYS_EAGER", False),
-        task_eager_propagates=app.config.get("CELERY_TASK_EAGER_PROPAGATES", False),
+        task_always_eager=config.get("CELERY_TASK_ALWAYS_EAGER", False),
+        task_eager_propagates=config.get("CELERY_TASK_EAGER_PROPAGATES", False),
         timezone="UTC",
         enable_utc=True,
+        # Pool processes warm up the model before reporting alive
+        worker_proc_alive_timeout=config.get("WORKER_PROC_ALIVE_TIMEOUT_SECONDS", 4.0),
     )
 
+
+def create_celery(app):
+    celery.conf.update(**celery_settings(app.config))
+
     class ContextTask(celery.Task):
         def __call__(self, *args, **kwargs):
             with app.app_context():
                 return self.run(*args, **kwargs)
 
     celery.Task = ContextTask
+
+    @worker_process_init.connect(weak=False)
+    def warm_up_worker_process(**kwargs):
+        # Runs in every pool process after the fork, before it takes tasks
+        if not app.config.get("WARM_UP_MODEL_ON_WORKER_START", False):
+            return
+
+        from app.ml.warmup import warm_up_model
+        from app.audit.audit import log_tech
+
+        try:
+            with app.app_context():
+                warm_up_model()
+        except Exception as e:
+            # The first task will load the model lazily as before
+            log_tech.error(f"Model warm-up failed: {e}")
+
     return celery
\ No newline at end of file
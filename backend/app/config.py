@@ -10,6 +10,20 @@ class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRES = 86400  # 24 hours
     SESSION_DURATION_MINUTES = int(os.getenv("SESSION_DURATION_MINUTES", 30))
+    # Seconds a session read from the database answers authenticated requests
+    # without querying it again; the sliding expiration is written back when
+    # it is re-read (0 disables the cache)
+    SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", 30))
+    # "throttled": a request only writes the new expiration when less than
+    # SESSION_REFRESH_THRESHOLD_SECONDS of the stored one remain; other refreshes
+    # are buffered and written in one UPDATE every SESSION_REFRESH_FLUSH_SECONDS.
+    # "always": write it on every database read of the session
+    SESSION_REFRESH_MODE = os.getenv("SESSION_REFRESH_MODE", "throttled")
+    SESSION_REFRESH_THRESHOLD_SECONDS = float(os.getenv("SESSION_REFRESH_THRESHOLD_SECONDS", 15 * 60))
+    SESSION_REFRESH_FLUSH_SECONDS = float(os.getenv("SESSION_REFRESH_FLUSH_SECONDS", 60))
+
+    # Session invalidations and EEG status events are broadcast over Redis pub/sub
+    REDIS_URL = os.getenv("REDIS_URL")
 
     BROKER_URL = os.getenv("CELERY_BROKER_URL")
     RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
@@ -29,6 +43,61 @@ class Config:
     EEG_UPLOAD_FOLDER = os.getenv("EEG_UPLOAD_FOLDER", "uploads/eeg")
     EEG_MAX_FILE_SIZE_BYTES: int = int(os.getenv("EEG_MAX_FILE_SIZE_MB", 200)) * 1024 * 1024  # Convert MB to Bytes
     SAVE_EEG_FILES = os.getenv("SAVE_EEG_FILES", "false").lower() == "true"
+    # Format uploads are stored in: "dense" (.npy array + .json header, memory-mapped
+    # by the worker) or "parquet" (long format, one row per sample)
+    EEG_STORAGE_FORMAT = os.getenv("EEG_STORAGE_FORMAT", "dense")
+    # Convert uploads in the worker (first stage of the pipeline) instead of inside
+    # the upload request, which then only saves the file and checks its header
+    EEG_ASYNC_CONVERSION = os.getenv("EEG_ASYNC_CONVERSION", "true").lower() == "true"
+    # Rows per chunk when streaming an upload into the dense format
+    EEG_READ_CHUNK_ROWS = int(os.getenv("EEG_READ_CHUNK_ROWS", 1_000_000))
+    # Rows per row group of parquet uploads; smaller groups let trial/channel filters skip more
+    EEG_PARQUET_ROW_GROUP_ROWS = int(os.getenv("EEG_PARQUET_ROW_GROUP_ROWS", 64 * 1024))
+    # "window" (per-window band filtering) or "trial" (filter whole trials, then window)
+    EEG_FILTER_MODE = os.getenv("EEG_FILTER_MODE", "window")
+    # Preprocessed tensors shared between tasks, stored under EEG_UPLOAD_FOLDER (0 disables)
+    EEG_TENSOR_CACHE_MAX_BYTES: int = int(os.getenv("EEG_TENSOR_CACHE_MAX_MB", 1024)) * 1024 * 1024
+    # Reuse the prediction and visualizations of an identical earlier upload
+    # (same content hash, model version and preprocessing) instead of running inference
+    EEG_DEDUP_PREDICTIONS = os.getenv("EEG_DEDUP_PREDICTIONS", "true").lower() == "true"
+    # Server-Sent Events of /eeg-records/<id>/status/stream: a keep-alive comment
+    # every HEARTBEAT seconds, and the stream closes after MAX seconds
+    EEG_STATUS_STREAM_HEARTBEAT_SECONDS = float(os.getenv("EEG_STATUS_STREAM_HEARTBEAT_SECONDS", 15))
+    EEG_STATUS_STREAM_MAX_SECONDS = float(os.getenv("EEG_STATUS_STREAM_MAX_SECONDS", 300))
+    # Each open stream holds a gunicorn thread: streams beyond this many per
+    # worker process get 503 (clients poll /status instead). Keep it below
+    # --threads so the other requests always have threads left
+    EEG_STATUS_STREAMS_PER_WORKER = int(os.getenv("EEG_STATUS_STREAMS_PER_WORKER", 8))
+    # Channel importance and topomap (gradient attribution): always computed with
+    # the Keras model, so they load TensorFlow even when INFERENCE_BACKEND is
+    # "tflite". Set to false for a worker without TensorFlow (waveforms only)
+    EEG_CHANNEL_ATTRIBUTION = os.getenv("EEG_CHANNEL_ATTRIBUTION", "true").lower() == "true"
+    # Compute channel importance in the same model pass as the prediction; only
+    # with INFERENCE_BACKEND=keras, other backends predict with run_inference and
+    # attribution runs in the visualization task
+    EEG_FUSED_ATTRIBUTION = os.getenv("EEG_FUSED_ATTRIBUTION", "true").lower() == "true"
+    EEG_ATTRIBUTION_BATCH_SIZE = int(os.getenv("EEG_ATTRIBUTION_BATCH_SIZE", 32))
+    # Micro-batching of run_inference across records in flight in the same process
+    # (worker with --pool threads); applies when the fused path is not taken
+    EEG_INFERENCE_BATCHING = os.getenv("EEG_INFERENCE_BATCHING", "false").lower() == "true"
+    EEG_INFERENCE_MAX_BATCH = int(os.getenv("EEG_INFERENCE_MAX_BATCH", 256))
+    EEG_INFERENCE_MAX_WAIT_MS = float(os.getenv("EEG_INFERENCE_MAX_WAIT_MS", 20))
+    # Forward pass of run_inference: "keras" or "tflite" (model exported with
+    # `python -m app.ml.export_model`)
+    INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "keras")
+    TFLITE_MODEL_PATH = os.getenv("TFLITE_MODEL_PATH", "dl_models/eegnet_model_balanced.tflite")
+    TFLITE_NUM_THREADS = int(os.getenv("TFLITE_NUM_THREADS", 2))
+
+    # "api" or "worker" (set by Docker-compose), the worker also runs create_app()
+    APP_ROLE = os.getenv("APP_ROLE", "api")
+
+    # Load the model and trace its graph at startup instead of on the first EEG
+    WARM_UP_MODEL_ON_WORKER_START = os.getenv("WARM_UP_MODEL_ON_WORKER_START", "true").lower() == "true"
+    WARM_UP_MODEL_ON_API_START = os.getenv("WARM_UP_MODEL_ON_API_START", "false").lower() == "true"
+    # Seconds a new worker pool process may take to start (Celery's
+    # worker_proc_alive_timeout, 4 s by default) before it is killed and
+    # replaced; warm-up runs inside that window
+    WORKER_PROC_ALIVE_TIMEOUT_SECONDS = float(os.getenv("WORKER_PROC_ALIVE_TIMEOUT_SECONDS", 60))
 
 
 class TestingConfig(Config):
@@ -42,4 +111,6 @@ class TestingConfig(Config):
     WTF_CSRF_ENABLED = False
     RATELIMIT_ENABLED = False
     # Save EEG files during testing for validation
-    SAVE_EEG_FILES = True
\ No newline at end of file
+    SAVE_EEG_FILES = True
+    WARM_UP_MODEL_ON_WORKER_START = False
+    WARM_UP_MODEL_ON_API_START = False
\ No newline at end of file
@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from app.domain.storage.dense_eeg import DenseEeg
 
 class EegReaderInterface(ABC):
     """Interface for reading EEG data files in different formats"""
@@ -7,6 +12,21 @@ class EegReaderInterface(ABC):
     # Required columns for EEG inference
     REQUIRED_COLUMNS = {'channel', 'trial', 'value', 'sample'}
 
+    # Whether iter_chunks streams the file instead of yielding read() once
+    STREAMING = False
+
+    # Compact dtypes for streamed chunks; 'trial' only when the ids are integers
+    # that fit (any id is accepted, trials are only grouped by it)
+    CHUNK_DTYPES = {'channel': 'category', 'trial': 'int32', 'sample': 'int32', 'value': 'float32'}
+
+    # The same compact types for Arrow tables ('channel' dictionary-encoded)
+    ARROW_TYPES = {
+        'channel': pa.dictionary(pa.int32(), pa.string()),
+        'trial': pa.int32(),
+        'sample': pa.int32(),
+        'value': pa.float32(),
+    }
+
     @abstractmethod
     def read(self, file_path: str) -> pd.DataFrame:
         """
@@ -22,7 +42,189 @@ class EegReaderInterface(ABC):
             ValueError: If required columns are missing
         """
         pass
-    
+
+    def sniff(self, file_path: str) -> None:
+        """
+        Cheap check that an uploaded file looks like a valid EEG file.
+
+        Only the header, schema or first record is read; the full parse runs
+        later, when the upload is converted. The default accepts any file.
+
+        Args:
+            file_path: Path to the EEG file
+
+        Raises:
+            ValueError: If the file is not valid or required columns are missing
+        """
+        pass
+
+    def iter_chunks(self, file_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Read EEG file as a sequence of DataFrames of at most chunk_rows rows.
+
+        Readers that can stream override this; the default yields the whole
+        file from read() as a single chunk.
+
+        Args:
+            file_path: Path to the EEG file
+            chunk_rows: Maximum number of rows per chunk
+
+        Yields:
+            pd.DataFrame: DataFrames with columns ['channel', 'sample', 'trial', 'value']
+
+        Raises:
+            ValueError: If required columns are missing
+        """
+        yield self.read(file_path)
+
+    def read_subset(
+        self,
+        file_path: str,
+        columns: list[str] | None = None,
+        trials: list | None = None,
+        channels: list[str] | None = None,
+        samples: tuple[int, int] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Read only some columns and rows of an EEG file.
+
+        Readers that can push the selection down to the file (parquet)
+        override this; the default reads the whole file and filters it.
+
+        Args:
+            file_path: Path to the EEG file
+            columns: Required columns to return (None for all of them)
+            trials: Trial ids to keep (None for all)
+            channels: Channels to keep (None for all)
+            samples: [start, stop) range of 'sample' to keep (None for all)
+
+        Returns:
+            pd.DataFrame: DataFrame with the selected columns, in sorted order
+
+        Raises:
+            ValueError: If required columns are missing
+        """
+        columns = self._subset_columns(columns)
+        df = self.read(file_path)
+
+        mask = np.ones(len(df), dtype=bool)
+        if trials is not None:
+            mask &= df['trial'].isin(trials).to_numpy()
+        if channels is not None:
+            mask &= df['channel'].isin(channels).to_numpy()
+        if samples is not None:
+            sample = df['sample'].to_numpy()
+            mask &= (sample >= samples[0]) & (sample < samples[1])
+        return df.loc[mask, columns].reset_index(drop=True)
+
+    def read_table(self, file_path: str, channels: list[str] | None = None) -> pa.Table:
+        """
+        Read EEG file as an Arrow table with only the required columns.
+
+        Readers with a native Arrow path override this to skip pandas; the
+        default converts the DataFrame from read_subset.
+
+        Args:
+            file_path: Path to the EEG file
+            channels: Channels to keep (None for all); readers may return more
+
+        Returns:
+            pa.Table: Table with columns ['channel', 'sample', 'trial', 'value']
+
+        Raises:
+            ValueError: If required columns are missing
+        """
+        return pa.Table.from_pandas(self.read_subset(file_path, channels=channels), preserve_index=False)
+
+    def trial_ids(self, file_path: str) -> list:
+        """
+        Trial ids of an EEG file in order of first appearance.
+
+        Args:
+            file_path: Path to the EEG file
+
+        Returns:
+            list: The distinct values of the 'trial' column
+        """
+        return self.read_subset(file_path, columns=['trial'])['trial'].unique().tolist()
+
+    def read_dense(self, file_path: str, channels: list[str] | None = None) -> DenseEeg | None:
+        """
+        Read EEG file straight into the dense (trials, channels, samples) layout.
+
+        Readers of formats that are already dense override this; the default
+        returns None and callers pivot the long format from read().
+
+        Args:
+            file_path: Path to the EEG file
+            channels: Channels the caller needs (None for all); readers may
+                return more, callers select with DenseEeg.channel_indices
+
+        Returns:
+            DenseEeg | None: The recording, or None if the format is long
+        """
+        return None
+
+    def _validate_columns(self, columns) -> None:
+        """
+        Validate that required columns exist.
+
+        Raises:
+            ValueError: If any required columns are missing
+        """
+        missing_columns = self.REQUIRED_COLUMNS - set(columns)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(sorted(missing_columns))}")
+
+    def _compact_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cast a frame with the required columns to CHUNK_DTYPES.
+
+        Trial ids keep their parsed dtype unless they are integers within the
+        int32 range, so string or float ids are not truncated.
+
+        Raises:
+            ValueError: If 'sample' or 'value' are not numeric
+        """
+        dtypes = dict(self.CHUNK_DTYPES)
+        if not _fits_int32(df['trial']):
+            del dtypes['trial']
+        try:
+            return df.astype(dtypes)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid EEG data: 'sample' and 'value' must be numeric ({e})")
+
+    def _compact_table(self, table: pa.Table) -> pa.Table:
+        """
+        Cast the 'trial' column of an Arrow table to ARROW_TYPES like
+        _compact_dtypes does; the other columns are parsed with ARROW_TYPES.
+        """
+        trial = table.column('trial')
+        if not pa.types.is_integer(trial.type) or trial.type == self.ARROW_TYPES['trial']:
+            return table
+        try:
+            compact = trial.cast(self.ARROW_TYPES['trial'])
+        except pa.ArrowInvalid:
+            # Out of the int32 range: keep the ids as parsed
+            return table
+        return table.set_column(table.schema.get_field_index('trial'), 'trial', compact)
+
+    @staticmethod
+    def _filter_channels(table: pa.Table, channels: list[str] | None) -> pa.Table:
+        """Rows of `table` whose channel is in `channels` (all of them for None)"""
+        if channels is None:
+            return table
+        return table.filter(pc.is_in(table.column('channel'), value_set=pa.array(channels, pa.string())))
+
+    def _subset_columns(self, columns: list[str] | None) -> list[str]:
+        """Sorted columns of a read_subset call, all required columns by default"""
+        if columns is None:
+            return sorted(self.REQUIRED_COLUMNS)
+        unknown = set(columns) - self.REQUIRED_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+        return sorted(columns)
+
     def _validate_and_filter_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Validate that required columns exist and return DataFrame with only those columns.
@@ -36,9 +238,15 @@ class EegReaderInterface(ABC):
         Raises:
             ValueError: If any required columns are missing
         """
-        missing_columns = self.REQUIRED_COLUMNS - set(df.columns)
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {', '.join(sorted(missing_columns))}")
-        
+        self._validate_columns(df.columns)
+
         # Return only required columns
         return df[sorted(self.REQUIRED_COLUMNS)]
+
+
+def _fits_int32(column: pd.Series) -> bool:
+    """Whether an integer column can be stored as int32 without overflow"""
+    if not pd.api.types.is_integer_dtype(column):
+        return False
+    info = np.iinfo(np.int32)
+    return column.empty or (info.min <= column.min() and column.max() <= info.max)
@@ -2,6 +2,7 @@ from app.domain.reader.parquet_reader import ParquetEegReader
 from app.domain.reader.csv_reader import CsvEegReader
 from app.domain.reader.json_reader import JsonEegReader
 from app.domain.reader.edf_reader import EdfEegReader
+from app.domain.reader.dense_reader import DenseEegReader
 from app.domain.reader.eeg_reader_factory import EegReaderFactory
 
 __all__ = [
@@ -9,5 +10,6 @@ __all__ = [
     'CsvEegReader',
     'JsonEegReader',
     'EdfEegReader',
+    'DenseEegReader',
     'EegReaderFactory',
 ]
@@ -1,13 +1,24 @@
+from typing import Iterator
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 from app.domain.interfaces.eeg_reader_interface import EegReaderInterface
 
 
 class CsvEegReader(EegReaderInterface):
     """Reader for .csv EEG files"""
 
+    STREAMING = True
+
+    # Only the dtypes that accept any input; the numeric ones are applied by
+    # _compact_dtypes, which reports bad values as validation errors
+    PARSE_DTYPES = {'channel': 'category'}
+
     def read(self, file_path: str) -> pd.DataFrame:
         """
         Read a CSV file and validate required columns.
+
+        Only the required columns are parsed, then cast to the compact chunk dtypes.
         
         Args:
             file_path: Path to the .csv file
@@ -15,5 +26,64 @@ class CsvEegReader(EegReaderInterface):
         Returns:
             pd.DataFrame: DataFrame with only required columns
         """
-        df = pd.read_csv(file_path)
-        return self._validate_and_filter_columns(df)
+        self._validate_columns(self._header(file_path))
+        df = pd.read_csv(file_path, usecols=list(self.REQUIRED_COLUMNS), dtype=self.PARSE_DTYPES)
+        return self._compact_dtypes(df[sorted(self.REQUIRED_COLUMNS)])
+
+    def sniff(self, file_path: str) -> None:
+        """Validate the required columns from the CSV header row"""
+        self._validate_columns(self._header(file_path))
+
+    def iter_chunks(self, file_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Stream a CSV file in chunks of chunk_rows rows.
+
+        Only the required columns are parsed, so peak memory is bounded by
+        the chunk size instead of the file size.
+
+        Args:
+            file_path: Path to the .csv file
+            chunk_rows: Maximum number of rows per chunk
+
+        Yields:
+            pd.DataFrame: DataFrames with only required columns
+        """
+        self._validate_columns(self._header(file_path))
+        with pd.read_csv(
+            file_path,
+            usecols=list(self.REQUIRED_COLUMNS),
+            dtype=self.PARSE_DTYPES,
+            chunksize=chunk_rows,
+        ) as chunks:
+            for chunk in chunks:
+                yield self._compact_dtypes(chunk[sorted(self.REQUIRED_COLUMNS)])
+
+    def read_table(self, file_path: str, channels: list[str] | None = None) -> pa.Table:
+        """
+        Read a CSV file straight into an Arrow table.
+
+        pyarrow's multithreaded parser reads only the required columns with
+        the compact Arrow types; no pandas frame is built.
+
+        Args:
+            file_path: Path to the .csv file
+            channels: Channels to keep (None for all)
+
+        Returns:
+            pa.Table: Table with only required columns
+        """
+        self._validate_columns(self._header(file_path))
+        table = pa_csv.read_csv(
+            file_path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=sorted(self.REQUIRED_COLUMNS),
+                column_types={
+                    column: arrow_type for column, arrow_type in self.ARROW_TYPES.items() if column != 'trial'
+                },
+            ),
+        )
+        return self._filter_channels(self._compact_table(table), channels)
+
+    @staticmethod
+    def _header(file_path: str) -> list[str]:
+        return list(pd.read_csv(file_path, nrows=0).columns)
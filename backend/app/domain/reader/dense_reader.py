@@ -0,0 +1,27 @@
+import pandas as pd
+from app.domain.interfaces.eeg_reader_interface import EegReaderInterface
+from app.domain.storage.dense_eeg import DenseEeg, dense_to_frame, read_dense
+
+
+class DenseEegReader(EegReaderInterface):
+    """Reader for the dense .npy + .json files stored at upload"""
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        """
+        Read a dense EEG file back into the long format.
+
+        Consumers that can work on the (trials, channels, samples) array should
+        use app.domain.storage.dense_eeg.read_dense instead, which does not copy.
+
+        Args:
+            file_path: Path to the .npy file (its header sits next to it)
+
+        Returns:
+            pd.DataFrame: DataFrame with only required columns
+        """
+        df = dense_to_frame(read_dense(file_path))
+        return self._validate_and_filter_columns(df)
+
+    def read_dense(self, file_path: str, channels: list[str] | None = None) -> DenseEeg:
+        """Memory-map the stored array (all its channels, whatever `channels` asks for)"""
+        return read_dense(file_path)
@@ -1,21 +1,226 @@
+import os
+from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 from app.domain.interfaces.eeg_reader_interface import EegReaderInterface
+from app.domain.storage.dense_eeg import DenseEeg, dense_to_frame
+
+# Fixed-width ASCII fields of the EDF header: (name, width)
+HEADER_FIELDS = (
+    ("version", 8), ("patient", 80), ("recording", 80), ("start_date", 8),
+    ("start_time", 8), ("header_bytes", 8), ("reserved", 44),
+    ("n_records", 8), ("record_duration", 8), ("n_signals", 4),
+)
+SIGNAL_FIELDS = (
+    ("label", 16), ("transducer", 80), ("physical_dimension", 8),
+    ("physical_min", 8), ("physical_max", 8), ("digital_min", 8),
+    ("digital_max", 8), ("prefiltering", 80), ("samples_per_record", 8),
+    ("reserved", 32),
+)
+ANNOTATION_LABEL = "EDF Annotations"
+
+
+def channel_name(label: str) -> str:
+    """Channel of an EDF signal label: "EEG Fp1-REF" -> "FP1" (CHANNELS are upper case)"""
+    name = label.strip().upper()
+    if name.startswith("EEG "):
+        name = name[4:].strip()
+    return name.split("-")[0].strip()
+
+
+@dataclass
+class EdfSignal:
+    label: str
+    samples_per_record: int
+    offset: int  # first sample of this signal inside a data record
+    gain: float
+    physical_offset: float
+
+
+class EdfFile:
+    """
+    An EDF/EDF+ file with its data records memory-mapped as int16.
+
+    Only the records and signal slots a read touches are paged in; samples
+    are scaled from digital to physical units on read.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            header = _read_fields(f, HEADER_FIELDS)
+            try:
+                n_signals = int(header["n_signals"])
+                header_bytes = int(header["header_bytes"])
+                self.record_duration = float(header["record_duration"])
+            except ValueError:
+                raise ValueError("Invalid EDF file: malformed header")
+            if header_bytes != 256 * (n_signals + 1):
+                raise ValueError("Invalid EDF file: header size does not match the number of signals")
+
+            columns = {}
+            for name, width in SIGNAL_FIELDS:
+                raw = f.read(width * n_signals)
+                if len(raw) != width * n_signals:
+                    raise ValueError("Invalid EDF file: truncated header")
+                columns[name] = [
+                    raw[i * width:(i + 1) * width].decode("ascii", "replace").strip()
+                    for i in range(n_signals)
+                ]
+
+        self.signals = []
+        offset = 0
+        for i in range(n_signals):
+            try:
+                samples = int(columns["samples_per_record"][i])
+                phys_min, phys_max = float(columns["physical_min"][i]), float(columns["physical_max"][i])
+                dig_min, dig_max = int(columns["digital_min"][i]), int(columns["digital_max"][i])
+            except ValueError:
+                raise ValueError(f"Invalid EDF file: malformed header of signal {i}")
+            gain = (phys_max - phys_min) / (dig_max - dig_min) if dig_max != dig_min else 1.0
+            self.signals.append(EdfSignal(
+                label=columns["label"][i],
+                samples_per_record=samples,
+                offset=offset,
+                gain=gain,
+                physical_offset=phys_min - gain * dig_min,
+            ))
+            offset += samples
+
+        record_samples = offset
+        data_bytes = os.path.getsize(file_path) - header_bytes
+        # -1 while the recording was still being written: derive from the size
+        n_records = int(header["n_records"])
+        if n_records < 0:
+            n_records = data_bytes // (2 * record_samples)
+        if n_records <= 0 or record_samples == 0:
+            raise ValueError("Invalid EDF file: no data records")
+        if data_bytes < n_records * record_samples * 2:
+            raise ValueError("Invalid EDF file: data records are truncated")
+
+        self.n_records = n_records
+        self.records = np.memmap(
+            file_path, dtype="<i2", mode="r", offset=header_bytes,
+            shape=(n_records, record_samples),
+        )
+
+    @property
+    def channels(self) -> dict[str, int]:
+        """Channel name -> signal index, without the EDF+ annotation signal"""
+        return {
+            channel_name(s.label): i for i, s in enumerate(self.signals)
+            if s.label != ANNOTATION_LABEL
+        }
+
+    def sampling_rate(self, index: int) -> float:
+        return self.signals[index].samples_per_record / self.record_duration
+
+    def n_samples(self, index: int) -> int:
+        return self.n_records * self.signals[index].samples_per_record
+
+    def read_signal(self, index: int, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Physical float32 samples [start, stop) of one signal, reading only the records covering them"""
+        signal = self.signals[index]
+        per_record = signal.samples_per_record
+        stop = self.n_samples(index) if stop is None else min(stop, self.n_samples(index))
+        if stop <= start:
+            return np.zeros(0, dtype=np.float32)
+
+        first, last = start // per_record, -(-stop // per_record)
+        digital = self.records[first:last, signal.offset:signal.offset + per_record].reshape(-1)
+        digital = digital[start - first * per_record:stop - first * per_record]
+        return (digital * signal.gain + signal.physical_offset).astype(np.float32)
+
+    def read_signals(self, indices: list[int], block_records: int = 256) -> np.ndarray:
+        """
+        Physical float32 (signals, samples) of signals sharing a sampling rate.
+
+        Records are read once, in blocks, and only the slots of the requested
+        signals are decoded from each block.
+        """
+        per_record = {self.signals[i].samples_per_record for i in indices}
+        if len(per_record) > 1:
+            raise ValueError("Signals must have the same number of samples per record")
+        per_record = per_record.pop() if per_record else 0
+
+        out = np.empty((len(indices), self.n_records * per_record), dtype=np.float32)
+        for first in range(0, self.n_records, block_records):
+            block = self.records[first:first + block_records]
+            start, stop = first * per_record, (first + len(block)) * per_record
+            for c, i in enumerate(indices):
+                signal = self.signals[i]
+                digital = block[:, signal.offset:signal.offset + per_record].reshape(-1)
+                out[c, start:stop] = digital * signal.gain + signal.physical_offset
+        return out
 
 
 class EdfEegReader(EegReaderInterface):
     """Reader for .edf EEG files"""
 
+    def sniff(self, file_path: str) -> None:
+        """Parse the EDF header and check the data records are complete"""
+        EdfFile(file_path)
+
     def read(self, file_path: str) -> pd.DataFrame:
         """
-        Read an EDF file and validate required columns.
-        
+        Read an EDF file and return it in the long format (a single trial 0).
+
+        Prefer read_dense, which decodes only the requested channels and
+        skips the long format.
+
         Args:
             file_path: Path to the .edf file
-            
+
         Returns:
             pd.DataFrame: DataFrame with only required columns
-            
+
         Raises:
-            ImportError: If mne is not installed
+            ValueError: If the file is not a valid EDF file
+        """
+        return self._validate_and_filter_columns(dense_to_frame(self.read_dense(file_path)))
+
+    def read_dense(self, file_path: str, channels: list[str] | None = None) -> DenseEeg:
         """
-        raise NotImplementedError("EDF reading is not implemented yet.")
+        Decode the requested channels of an EDF file into a (1, channels, samples) recording.
+
+        EDF holds one continuous recording, stored as trial 0. Channels are
+        matched by label ("EEG F1-REF" matches "F1"); requested channels that
+        are not in the file are left out. All selected channels must share the
+        same sampling rate.
+
+        Raises:
+            ValueError: If the file is not a valid EDF file, has none of the
+                requested channels or rates differ
+        """
+        edf = EdfFile(file_path)
+        available = edf.channels
+        names = list(available) if channels is None else [ch for ch in channels if ch in available]
+        if channels and not names:
+            # Nothing to decode (and no sampling rate to report)
+            raise ValueError(f"Missing required channels: {list(channels)}")
+        indices = [available[name] for name in names]
+
+        rates = {edf.sampling_rate(i) for i in indices}
+        if len(rates) > 1:
+            raise ValueError(f"EDF channels have different sampling rates: {sorted(rates)}")
+        fs = rates.pop() if rates else 0.0
+
+        data = edf.read_signals(indices)[None]
+
+        return DenseEeg(
+            data=data,
+            lengths=np.full((1, len(indices)), data.shape[-1], dtype=np.int64),
+            channels=names,
+            trials=[0],
+            fs=fs,
+        )
+
+
+def _read_fields(f, fields) -> dict:
+    fields_data = {}
+    for name, width in fields:
+        raw = f.read(width)
+        if len(raw) != width:
+            raise ValueError("Invalid EDF file: truncated header")
+        fields_data[name] = raw.decode("ascii", "replace").strip()
+    return fields_data
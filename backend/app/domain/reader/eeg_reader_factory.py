@@ -4,6 +4,7 @@ from app.domain.reader.parquet_reader import ParquetEegReader
 from app.domain.reader.csv_reader import CsvEegReader
 from app.domain.reader.json_reader import JsonEegReader
 from app.domain.reader.edf_reader import EdfEegReader
+from app.domain.reader.dense_reader import DenseEegReader
 
 
 class EegReaderFactory:
@@ -15,6 +16,7 @@ class EegReaderFactory:
         '.csv': CsvEegReader,
         '.json': JsonEegReader,
         '.edf': EdfEegReader,
+        '.npy': DenseEegReader,  # storage format, not accepted as upload
     }
     
     @classmethod
@@ -1,28 +1,138 @@
 import json
+import re
+from typing import Iterator
 import pandas as pd
+import pyarrow as pa
 from app.domain.interfaces.eeg_reader_interface import EegReaderInterface
 
+# Characters read from the file per refill of the parse buffer
+READ_BLOCK_CHARS = 1 << 20
+
 
 class JsonEegReader(EegReaderInterface):
     """Reader for .json EEG files"""
 
+    STREAMING = True
+
     def read(self, file_path: str) -> pd.DataFrame:
         """
         Read a JSON file and validate required columns.
-        
+
         JSON can be in two formats:
         - Array of objects: [{"channel": "Fp1", "trial": 0, "value": 0.5, "sample": 0}, ...]
         - Object with array key: {"data": [...]}
-        
+
         Args:
             file_path: Path to the .json file
-            
+
         Returns:
             pd.DataFrame: DataFrame with only required columns
         """
+        return pd.concat(list(self.iter_chunks(file_path, chunk_rows=1_000_000)), ignore_index=True)
+
+    def sniff(self, file_path: str) -> None:
+        """
+        Validate the keys of the first record, decoding only the first block.
+
+        Files without an array of records (e.g. an object of columns) are
+        only checked to start with a JSON array or object.
+        """
+        with open(file_path, 'r') as f:
+            stream = _JsonStream(f)
+            if stream.peek() not in ('[', '{'):
+                raise ValueError("Invalid JSON: expected an array or an object")
+            first = next(_iter_records(stream), None)
+        if first is not None:
+            self._validate_columns(first.keys())
+
+    def iter_chunks(self, file_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Parse a JSON file incrementally, in batches of chunk_rows records.
+
+        The array of records (top level or wrapped in an object) is decoded one
+        record at a time and collected into column lists, so only one batch of
+        records is alive at a time. Other layouts (e.g. an object of columns)
+        are loaded whole.
+
+        Args:
+            file_path: Path to the .json file
+            chunk_rows: Maximum number of records per chunk
+
+        Yields:
+            pd.DataFrame: DataFrames with only required columns
+        """
+        with open(file_path, 'r') as f:
+            records = _iter_records(_JsonStream(f))
+            rows = 0
+            for batch in self._batches(records, chunk_rows):
+                chunk = self._to_frame(batch)
+                rows += len(chunk)
+                yield chunk
+
+        if rows == 0:
+            yield self._read_whole(file_path)
+
+    def read_table(self, file_path: str, channels: list[str] | None = None) -> pa.Table:
+        """
+        Parse a JSON file into an Arrow table, without building pandas frames.
+
+        Records are decoded incrementally like in iter_chunks and each batch of
+        column lists becomes an Arrow record batch with the compact Arrow types.
+
+        Args:
+            file_path: Path to the .json file
+            channels: Channels to keep (None for all)
+
+        Returns:
+            pa.Table: Table with only required columns
+        """
+        with open(file_path, 'r') as f:
+            records = _iter_records(_JsonStream(f))
+            batches = [self._to_record_batch(batch) for batch in self._batches(records, 1_000_000)]
+
+        if not batches:
+            return super().read_table(file_path, channels)
+        return self._filter_channels(self._compact_table(pa.Table.from_batches(batches)), channels)
+
+    def _batches(self, records: Iterator[dict], chunk_rows: int) -> Iterator[dict]:
+        columns = sorted(self.REQUIRED_COLUMNS)
+        batch = {column: [] for column in columns}
+        n = 0
+        validated = False
+
+        for record in records:
+            if not validated:
+                self._validate_columns(record.keys())
+                validated = True
+            try:
+                for column in columns:
+                    batch[column].append(record[column])
+            except KeyError as e:
+                raise ValueError(f"Missing required columns: {e.args[0]}")
+            n += 1
+            if n == chunk_rows:
+                yield batch
+                batch = {column: [] for column in columns}
+                n = 0
+
+        if n:
+            yield batch
+
+    def _to_frame(self, batch: dict) -> pd.DataFrame:
+        return self._compact_dtypes(pd.DataFrame(batch))
+
+    def _to_record_batch(self, batch: dict) -> pa.RecordBatch:
+        arrays = [pa.array(batch['channel']).dictionary_encode().cast(self.ARROW_TYPES['channel'])]
+        arrays.append(pa.array(batch['sample']).cast(self.ARROW_TYPES['sample']))
+        # Trial ids as parsed, read_table casts them once for the whole table
+        arrays.append(pa.array(batch['trial']))
+        arrays.append(pa.array(batch['value']).cast(self.ARROW_TYPES['value']))
+        return pa.RecordBatch.from_arrays(arrays, names=['channel', 'sample', 'trial', 'value'])
+
+    def _read_whole(self, file_path: str) -> pd.DataFrame:
         with open(file_path, 'r') as f:
             data = json.load(f)
-        
+
         # Handle wrapped data (e.g., {"data": [...]})
         if isinstance(data, dict) and not all(k in self.REQUIRED_COLUMNS for k in data.keys()):
             # Look for a key that contains the actual data
@@ -31,6 +141,131 @@ class JsonEegReader(EegReaderInterface):
                     if isinstance(value[0], dict):
                         data = value
                         break
-        
+
         df = pd.DataFrame(data)
-        return self._validate_and_filter_columns(df)
+        return self._compact_dtypes(self._validate_and_filter_columns(df))
+
+
+class _JsonStream:
+    """Rolling text buffer over a file for incremental JSON decoding"""
+
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+    # What can follow a complete value; anything else may be the rest of a
+    # number cut by the end of the buffer ("0." + "5")
+    DELIMITERS = ' \t\n\r,:]}'
+
+    def __init__(self, f, block_chars: int | None = None):
+        self.f = f
+        self.block_chars = block_chars or READ_BLOCK_CHARS
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.batch_decode = True
+
+    def _fill(self) -> bool:
+        """Append the next block, dropping what was already consumed"""
+        if self.eof:
+            return False
+        block = self.f.read(self.block_chars)
+        if not block:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of file)"""
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def take(self, expected: str) -> None:
+        if self.peek() != expected:
+            raise ValueError(f"Invalid JSON: expected '{expected}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in self.DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError(f"Invalid JSON: {e}")
+            self._fill()
+
+
+def _iter_records(stream: _JsonStream) -> Iterator[dict]:
+    """
+    Records of a top-level array, or of the first array of objects inside a
+    top-level object (the {"data": [...]} layout). Yields nothing for other layouts.
+    """
+    first = stream.peek()
+    if first == '[':
+        yield from _iter_array(stream)
+    elif first == '{':
+        stream.take('{')
+        while stream.peek() != '}':
+            stream.value()  # key
+            stream.take(':')
+            if stream.peek() == '[':
+                stream.take('[')
+                if stream.peek() == '{':
+                    yield from _iter_array(stream, opened=True)
+                    return
+                # Not an array of records: skip its items
+                while stream.peek() != ']':
+                    stream.value()
+                    if stream.peek() == ',':
+                        stream.take(',')
+                stream.take(']')
+            else:
+                stream.value()
+            if stream.peek() == ',':
+                stream.take(',')
+
+
+def _iter_array(stream: _JsonStream, opened: bool = False) -> Iterator[dict]:
+    if not opened:
+        stream.take('[')
+    while stream.peek() != ']':
+        records = _buffered_records(stream) or [stream.value()]
+        for record in records:
+            if not isinstance(record, dict):
+                raise ValueError("Invalid JSON: expected an array of objects")
+        yield from records
+        if stream.peek() == ',':
+            stream.take(',')
+        elif stream.peek() != ']':
+            raise ValueError(f"Invalid JSON: expected ',' or ']' at offset {stream.pos}")
+
+
+def _buffered_records(stream: _JsonStream) -> list | None:
+    """
+    Decode every complete record left in the buffer with one json.loads call.
+
+    The text up to the last '}' parses as a list of objects only if that brace
+    closes a record; otherwise (nested objects, braces in strings) it is
+    invalid and the caller decodes records one at a time from then on.
+    """
+    if not stream.batch_decode:
+        return None
+    end = stream.buffer.rfind('}', stream.pos)
+    if end < 0:
+        return None
+    try:
+        records = json.loads('[' + stream.buffer[stream.pos:end + 1] + ']')
+    except json.JSONDecodeError:
+        stream.batch_decode = False
+        return None
+    stream.pos = end + 1
+    return records
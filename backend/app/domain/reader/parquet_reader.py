@@ -1,5 +1,9 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from app.domain.interfaces.eeg_reader_interface import EegReaderInterface
+from app.domain.storage.parquet_eeg import stored_trial_order
 
 class ParquetEegReader(EegReaderInterface):
     """Reader for .parquet EEG files"""
@@ -7,6 +11,8 @@ class ParquetEegReader(EegReaderInterface):
     def read(self, file_path: str) -> pd.DataFrame:
         """
         Read a parquet file and validate required columns.
+
+        Only the required columns are read from the file.
         
         Args:
             file_path: Path to the .parquet file
@@ -14,5 +20,92 @@ class ParquetEegReader(EegReaderInterface):
         Returns:
             pd.DataFrame: DataFrame with only required columns
         """
-        df = pd.read_parquet(file_path)
-        return self._validate_and_filter_columns(df)
+        return self.read_subset(file_path)
+
+    def sniff(self, file_path: str) -> None:
+        """Validate the required columns from the parquet footer, no data is read"""
+        self._validate_columns(pq.read_schema(file_path).names)
+
+    def read_subset(
+        self,
+        file_path: str,
+        columns: list[str] | None = None,
+        trials: list | None = None,
+        channels: list[str] | None = None,
+        samples: tuple[int, int] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Read only some columns and rows of a parquet file.
+
+        The column projection and the filters are pushed down to pyarrow:
+        row groups whose statistics exclude the filters are not read, which
+        skips most of the file when it was written sorted by
+        (trial, channel, sample) (see storage.parquet_eeg.write_parquet).
+
+        Args:
+            file_path: Path to the .parquet file
+            columns: Required columns to return (None for all of them)
+            trials: Trial ids to keep (None for all)
+            channels: Channels to keep (None for all)
+            samples: [start, stop) range of 'sample' to keep (None for all)
+
+        Returns:
+            pd.DataFrame: DataFrame with the selected columns, in sorted order
+
+        Raises:
+            ValueError: If required columns are missing
+        """
+        columns = self._subset_columns(columns)
+        table = self._read_arrow(file_path, columns, trials, channels, samples)
+        return table.to_pandas()[columns]
+
+    def read_table(self, file_path: str, channels: list[str] | None = None) -> pa.Table:
+        """
+        Read a parquet file as an Arrow table, without converting it to pandas.
+
+        Only the required columns are read, 'channel' comes dictionary-encoded
+        and the channels filter is pushed down like in read_subset.
+
+        Args:
+            file_path: Path to the .parquet file
+            channels: Channels to keep (None for all)
+
+        Returns:
+            pa.Table: Table with only required columns
+        """
+        return self._read_arrow(
+            file_path, sorted(self.REQUIRED_COLUMNS), channels=channels, read_dictionary=['channel']
+        )
+
+    def _read_arrow(
+        self, file_path, columns, trials=None, channels=None, samples=None, read_dictionary=None
+    ) -> pa.Table:
+        self._validate_columns(pq.read_schema(file_path).names)
+
+        filters = []
+        if trials is not None:
+            filters.append(('trial', 'in', list(trials)))
+        if channels is not None:
+            filters.append(('channel', 'in', list(channels)))
+        if samples is not None:
+            filters.append(('sample', '>=', samples[0]))
+            filters.append(('sample', '<', samples[1]))
+
+        return pq.read_table(
+            file_path, columns=columns, filters=filters or None, read_dictionary=read_dictionary
+        )
+
+    def trial_ids(self, file_path: str) -> list:
+        """
+        Trial ids of a parquet file in order of first appearance.
+
+        Files written by write_parquet are sorted by trial, so their upload
+        order comes from the schema metadata. Otherwise only the 'trial'
+        column is read and deduplicated in Arrow, without converting it to pandas.
+        """
+        schema = pq.read_schema(file_path)
+        self._validate_columns(schema.names)
+        order = stored_trial_order(schema)
+        if order is not None:
+            return order
+        return pc.unique(pq.read_table(file_path, columns=['trial']).column('trial')).to_pylist()
@@ -0,0 +1,309 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Iterable
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Canonical on-disk EEG format written at upload:
+#   <name>.npy   float32 (trials, channels, samples), zero-padded on the right
+#   <name>.json  header with channel order, trial ids, lengths and fs
+DENSE_EXTENSION = ".npy"
+HEADER_EXTENSION = ".json"
+FORMAT_VERSION = 1
+
+
+@dataclass
+class DenseEeg:
+    """A dense EEG recording; `data` is a read-only memmap when loaded from disk"""
+    data: np.ndarray
+    lengths: np.ndarray
+    channels: list[str]
+    trials: list
+    fs: float
+
+    def channel_indices(self, channels: list[str]) -> np.ndarray:
+        """Positions of `channels` in the stored channel order"""
+        missing = [ch for ch in channels if ch not in self.channels]
+        if missing:
+            raise ValueError(f"Missing required channels: {missing}")
+        position = {ch: i for i, ch in enumerate(self.channels)}
+        return np.array([position[ch] for ch in channels], dtype=np.intp)
+
+
+def pivot_trials(df: pd.DataFrame, channels: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pivot a long-format EEG frame into a dense (trials, channels, samples) array.
+
+    Trials keep their order of appearance and channels follow `channels`. Inside
+    each (trial, channel) group the values are placed by their position once
+    sorted by 'sample', so shorter groups are zero-padded on the right. When
+    every group holds a contiguous range of distinct samples the sort is
+    skipped and values go straight to their offset from the group's first sample.
+
+    Returns:
+        data: (n_trials, n_channels, max_length) array with the dtype of 'value'
+        lengths: (n_trials, n_channels) number of samples per group (0 if absent)
+    """
+    trial_ids = df["trial"].unique()
+
+    mask = df["channel"].isin(channels).to_numpy()
+    trial_idx = pd.Index(trial_ids).get_indexer(df["trial"].to_numpy()[mask])
+    channel_idx = pd.Index(channels).get_indexer(df["channel"].to_numpy()[mask])
+    samples = df["sample"].to_numpy()[mask]
+    values = df["value"].to_numpy()[mask]
+
+    return _pivot(trial_idx, channel_idx, samples, values, len(trial_ids), len(channels))
+
+
+def pivot_table_trials(table: pa.Table, channels: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    pivot_trials for an Arrow table, without building a pandas frame.
+
+    Trial and channel positions are computed with Arrow kernels; a
+    dictionary-encoded 'channel' column is matched once per dictionary entry
+    instead of once per row. Only the index, sample and value buffers are
+    converted to NumPy.
+    """
+    trial = table.column("trial")
+    trial_ids = pc.unique(trial)
+    trial_idx = pc.index_in(trial, value_set=trial_ids).to_numpy()
+
+    wanted = pa.array(channels, type=pa.string())
+    channel_idx = np.concatenate(
+        [_channel_chunk_positions(chunk, wanted) for chunk in table.column("channel").chunks]
+        or [np.zeros(0, dtype=np.intp)]
+    )
+
+    mask = channel_idx >= 0
+    samples = table.column("sample").to_numpy()[mask]
+    values = table.column("value").to_numpy()[mask]
+
+    return _pivot(trial_idx[mask], channel_idx[mask], samples, values, len(trial_ids), len(channels))
+
+
+def _channel_chunk_positions(chunk: pa.Array, wanted: pa.Array) -> np.ndarray:
+    """Position in `wanted` of every row of a 'channel' chunk, -1 if not wanted"""
+    if pa.types.is_dictionary(chunk.type):
+        positions = pc.index_in(chunk.dictionary.cast(pa.string()), value_set=wanted)
+        return positions.fill_null(-1).to_numpy().astype(np.intp)[chunk.indices.to_numpy()]
+    positions = pc.index_in(chunk.cast(pa.string()), value_set=wanted)
+    return positions.fill_null(-1).to_numpy().astype(np.intp)
+
+
+def _pivot(trial_idx, channel_idx, samples, values, n_trials: int, n_channels: int):
+    n_groups = n_trials * n_channels
+    group = trial_idx * n_channels + channel_idx
+    lengths = np.bincount(group, minlength=n_groups)
+    max_length = int(lengths.max()) if lengths.size else 0
+    data = np.zeros((n_groups, max_length), dtype=values.dtype)
+
+    # Contiguous samples (the usual layout): each value goes at its offset from
+    # the group's first sample, no sort needed
+    samples = samples.astype(np.int64, copy=False)
+    first = np.full(n_groups, np.iinfo(np.int64).max)
+    last = np.full(n_groups, np.iinfo(np.int64).min)
+    np.minimum.at(first, group, samples)
+    np.maximum.at(last, group, samples)
+    present = lengths > 0
+
+    contiguous = np.array_equal(last[present] - first[present] + 1, lengths[present])
+    if contiguous:
+        positions = samples - first[group]
+        # Ranges match the counts, so the samples are unique (no repeat hiding
+        # a gap) only if every slot is hit
+        filled = np.zeros((n_groups, max_length), dtype=bool)
+        filled[group, positions] = True
+        contiguous = np.count_nonzero(filled) == len(samples)
+
+    if not contiguous:
+        # lexsort is stable: rows are grouped by (trial, channel) and ordered by sample
+        order = np.lexsort((samples, group))
+        group, values = group[order], values[order]
+        starts = np.cumsum(lengths) - lengths
+        positions = np.arange(len(group)) - starts[group]
+
+    data[group, positions] = values
+    return data.reshape(n_trials, n_channels, max_length), lengths.reshape(n_trials, n_channels)
+
+
+def header_path(dense_path: str) -> str:
+    return os.path.splitext(dense_path)[0] + HEADER_EXTENSION
+
+
+def is_dense_file(file_path: str) -> bool:
+    return file_path.lower().endswith(DENSE_EXTENSION)
+
+
+def dense_from_frame(df: pd.DataFrame, fs: float) -> DenseEeg:
+    """Pivot a long-format frame with every channel it contains, in order of appearance"""
+    channels = [str(ch) for ch in df["channel"].unique()]
+    data, lengths = pivot_trials(df, channels)
+    return DenseEeg(
+        data=data.astype(np.float32, copy=False),
+        lengths=lengths,
+        channels=channels,
+        trials=df["trial"].unique().tolist(),
+        fs=fs,
+    )
+
+
+def write_dense(dense: DenseEeg, dense_path: str) -> None:
+    """Write the .npy array and its JSON header next to it"""
+    np.save(dense_path, np.asarray(dense.data, dtype=np.float32))
+    _write_header(dense_path, dense.channels, dense.trials, dense.lengths, dense.fs)
+
+
+def _write_header(dense_path: str, channels, trials, lengths, fs: float) -> None:
+    header = {
+        "version": FORMAT_VERSION,
+        "channels": list(channels),
+        "trials": list(trials),
+        "lengths": np.asarray(lengths).tolist(),
+        "fs": fs,
+    }
+    with open(header_path(dense_path), "w") as f:
+        json.dump(header, f)
+
+
+def write_dense_from_chunks(
+    chunks: Callable[[], Iterable[pd.DataFrame]],
+    dense_path: str,
+    fs: float,
+) -> None:
+    """
+    Write a long-format recording read in chunks straight into the dense file.
+
+    Two passes over `chunks()` (a fresh iterator each time): the first one
+    collects trials, channels and per-group sample ranges; the second one
+    scatters each chunk into the memory-mapped output. Only one chunk and the
+    output pages being written are in memory at a time.
+
+    Values are placed by their 'sample' offset inside each (trial, channel)
+    group, which matches pivot_trials when samples are contiguous and
+    distinct. Groups with gaps or repeated samples fall back to pivoting the
+    whole recording, and so do groups whose sample ranges overlap across
+    chunks, since repeats cannot be ruled out there without a full pass.
+
+    Raises:
+        ValueError: If the recording has no samples
+    """
+    stats = []
+    repeated = False
+    for chunk in chunks():
+        repeated = repeated or bool(chunk.duplicated(["trial", "channel", "sample"]).any())
+        group = chunk.groupby(["trial", "channel"], observed=True, sort=False)["sample"]
+        part = group.agg(["min", "max", "count"]).reset_index()
+        part["channel"] = part["channel"].astype(str)
+        stats.append(part)
+
+    if not stats or sum(len(part) for part in stats) == 0:
+        raise ValueError("File contains no EEG samples")
+
+    parts = pd.concat(stats, ignore_index=True)
+    # Samples are distinct within each chunk; across chunks, only if the ranges
+    # of each group are disjoint (sorted by start, each one begins after the last)
+    ordered = parts.sort_values(["trial", "channel", "min"], kind="stable")
+    previous_max = ordered.groupby(["trial", "channel"], sort=False)["max"].shift()
+    repeated = repeated or bool((ordered["min"] <= previous_max).any())
+
+    # Chunks may split a group: combine, keeping order of first appearance
+    stats = (
+        parts
+        .groupby(["trial", "channel"], sort=False)
+        .agg({"min": "min", "max": "max", "count": "sum"})
+        .reset_index()
+    )
+
+    if repeated or ((stats["max"] - stats["min"] + 1) != stats["count"]).any():
+        frame = pd.concat(list(chunks()), ignore_index=True)
+        write_dense(dense_from_frame(frame, fs), dense_path)
+        return
+
+    trials = pd.Index(stats["trial"].unique())
+    channels = pd.Index(stats["channel"].unique())
+    t_idx = trials.get_indexer(stats["trial"])
+    c_idx = channels.get_indexer(stats["channel"])
+
+    lengths = np.zeros((len(trials), len(channels)), dtype=np.int64)
+    offsets = np.zeros_like(lengths)
+    lengths[t_idx, c_idx] = stats["count"].to_numpy()
+    offsets[t_idx, c_idx] = stats["min"].to_numpy()
+
+    tmp_path = f"{dense_path}.tmp"
+    try:
+        data = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32,
+            shape=(len(trials), len(channels), int(lengths.max())),
+        )
+        for chunk in chunks():
+            rows_t = trials.get_indexer(chunk["trial"])
+            rows_c = _channel_positions(chunk["channel"], channels)
+            positions = chunk["sample"].to_numpy() - offsets[rows_t, rows_c]
+            data[rows_t, rows_c, positions] = chunk["value"].to_numpy()
+        data.flush()
+        del data
+        os.replace(tmp_path, dense_path)
+    except Exception:
+        # A failed write (bad chunk, full disk) must not leave the partial array behind
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _write_header(dense_path, channels.tolist(), trials.tolist(), lengths, fs)
+
+
+def _channel_positions(channel: pd.Series, channels: pd.Index) -> np.ndarray:
+    if isinstance(channel.dtype, pd.CategoricalDtype):
+        # Look up each category once instead of every row
+        lookup = channels.get_indexer(channel.cat.categories.astype(str))
+        return lookup[channel.cat.codes.to_numpy()]
+    return channels.get_indexer(channel.astype(str))
+
+def read_dense(dense_path: str, mmap: bool = True) -> DenseEeg:
+    """Load a dense recording; with mmap the array is mapped read-only, not copied"""
+    with open(header_path(dense_path)) as f:
+        header = json.load(f)
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported dense EEG format version: {header.get('version')}")
+
+    data = np.load(dense_path, mmap_mode="r" if mmap else None)
+    return DenseEeg(
+        data=data,
+        lengths=np.asarray(header["lengths"], dtype=np.int64).reshape(data.shape[:2]),
+        channels=header["channels"],
+        trials=header["trials"],
+        fs=header["fs"],
+    )
+
+
+def dense_to_frame(dense: DenseEeg) -> pd.DataFrame:
+    """Back to the long format (one row per trial x channel x sample)"""
+    frames = []
+    for t, trial in enumerate(dense.trials):
+        for c, channel in enumerate(dense.channels):
+            n = int(dense.lengths[t, c])
+            if n == 0:
+                continue
+            frames.append(pd.DataFrame({
+                "channel": channel,
+                "sample": np.arange(n),
+                "trial": trial,
+                "value": np.asarray(dense.data[t, c, :n]),
+            }))
+    if not frames:
+        return pd.DataFrame(columns=["channel", "sample", "trial", "value"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def remove_eeg_file(file_path: str) -> None:
+    """Delete a stored EEG file and, for the dense format, its header"""
+    paths = [file_path]
+    if is_dense_file(file_path):
+        paths.append(header_path(file_path))
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
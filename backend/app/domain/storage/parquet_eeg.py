@@ -0,0 +1,37 @@
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Long-format parquet written at upload when EEG_STORAGE_FORMAT is "parquet".
+# Rows are sorted so each row group covers a narrow (trial, channel) range and
+# its min/max statistics let trial/channel filters skip the rest of the file.
+SORT_COLUMNS = ["trial", "channel", "sample"]
+ROW_GROUP_ROWS = 64 * 1024
+# Schema metadata key with the trial ids in upload order, which sorting loses
+TRIAL_ORDER_KEY = b"eeg.trial_order"
+
+
+def write_parquet(df: pd.DataFrame, path: str, row_group_rows: int = ROW_GROUP_ROWS) -> None:
+    """
+    Write a long-format frame sorted by (trial, channel, sample) in row groups
+    of row_group_rows. The trial ids in order of first appearance are kept in
+    the schema metadata (TRIAL_ORDER_KEY), so trial 0 is still the first one uploaded.
+    """
+    trials = pd.unique(df["trial"]).tolist()
+    df = df.sort_values(SORT_COLUMNS, kind="stable", ignore_index=True)
+    if isinstance(df["channel"].dtype, pd.CategoricalDtype):
+        # Plain strings keep the row group statistics usable for filters
+        df["channel"] = df["channel"].astype(str)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        TRIAL_ORDER_KEY: json.dumps(trials).encode(),
+    })
+    pq.write_table(table, path, row_group_size=row_group_rows)
+
+
+def stored_trial_order(schema: pa.Schema) -> list | None:
+    """Trial ids in upload order saved by write_parquet, None for other parquet files"""
+    order = (schema.metadata or {}).get(TRIAL_ORDER_KEY)
+    return None if order is None else json.loads(order)
@@ -15,4 +15,11 @@ class AuthenticationError(AppError):
     http_status = 401
 
 class PermissionError(AppError):
-    http_status = 403
\ No newline at end of file
+    http_status = 403
+
+class ServiceUnavailableError(AppError):
+    http_status = 503
+    def __init__(self, message: str, retry_after: int | None = None):
+        super().__init__(message)
+        # Seconds for the Retry-After header
+        self.retry_after = retry_after
\ No newline at end of file
@@ -0,0 +1,219 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+import numpy as np
+from app.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+BACKEND_KERAS = "keras"
+BACKEND_TFLITE = "tflite"
+BACKENDS = (BACKEND_KERAS, BACKEND_TFLITE)
+
+# Batch sizes the backends run; inputs are split into them and only the tail is padded
+PREDICT_BUCKETS = (8, 32, 128)
+
+
+def bucket_plan(n: int, buckets: tuple[int, ...]) -> list[int]:
+    """
+    Split n windows greedily into the largest buckets that fit; only the
+    tail (< smallest bucket) is padded, so padding stays under one small bucket.
+    """
+    buckets = sorted(buckets)
+    plan = []
+    while n > 0:
+        bucket = next((b for b in reversed(buckets) if b <= n), buckets[0])
+        plan.append(bucket)
+        n -= bucket
+    return plan
+
+
+class InferenceBackend(ABC):
+    """Runs the forward pass of the EEG model: (N, 204, 256, 1) -> (N, 1) probabilities"""
+
+    name: str
+
+    @abstractmethod
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        ...
+
+    @property
+    @abstractmethod
+    def version(self) -> str:
+        """Model version stored with the predictions made by this backend"""
+
+    def warm_up(self) -> None:
+        """Load the model and run it once so the first record does not pay for it"""
+        self.predict(np.zeros((1, 204, 256, 1), dtype=np.float32))
+
+
+class KerasBackend(InferenceBackend):
+    """The Keras model from model_loader, run through the bucketed tf.function predictor"""
+
+    name = BACKEND_KERAS
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        from app.ml.inference import get_predictor
+        return get_predictor().predict(X)
+
+    @property
+    def version(self) -> str:
+        from app.ml.model_loader import get_model_version
+        return get_model_version()
+
+    def warm_up(self) -> None:
+        from app.ml.inference import get_predictor
+        get_predictor().warm_up()
+
+
+class TFLiteBackend(InferenceBackend):
+    """
+    The model exported to TFLite (python -m app.ml.export_model), run on the
+    TFLite interpreter's CPU kernels.
+
+    One interpreter is kept per bucket size, each resized and allocated once,
+    so a call never reallocates tensors. Interpreters are not thread-safe, so
+    calls are serialized.
+    """
+
+    name = BACKEND_TFLITE
+
+    def __init__(self, model_path: str, buckets: tuple[int, ...] = PREDICT_BUCKETS,
+                 num_threads: int = 2):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"TFLite model not found at {model_path}; export it with "
+                f"`python -m app.ml.export_model`"
+            )
+        with open(model_path, "rb") as f:
+            self._model_content = f.read()
+
+        self.model_path = model_path
+        self.buckets = tuple(sorted(buckets))
+        self.num_threads = num_threads
+        self._interpreters = {}
+        self._lock = threading.Lock()
+
+        probe = self._new_interpreter()
+        self.input_shape = tuple(probe.get_input_details()[0]["shape_signature"][1:])
+        self.output_shape = tuple(probe.get_output_details()[0]["shape_signature"][1:])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        outputs = []
+
+        with self._lock:
+            start = 0
+            for bucket in bucket_plan(len(X), self.buckets):
+                chunk = X[start:start + bucket]
+                n = len(chunk)
+                if n < bucket:
+                    padding = np.zeros((bucket - n, *self.input_shape), dtype=np.float32)
+                    chunk = np.concatenate([chunk, padding])
+                outputs.append(self._invoke(bucket, chunk)[:n])
+                start += n
+
+        if not outputs:
+            return np.zeros((0, *self.output_shape), dtype=np.float32)
+        return np.concatenate(outputs)
+
+    @property
+    def version(self) -> str:
+        filename = os.path.basename(self.model_path)
+        return f"{os.path.splitext(filename)[0]}+tflite"
+
+    def warm_up(self) -> None:
+        with self._lock:
+            for bucket in self.buckets:
+                self._invoke(bucket, np.zeros((bucket, *self.input_shape), dtype=np.float32))
+
+    def _invoke(self, bucket: int, chunk: np.ndarray) -> np.ndarray:
+        interpreter = self._interpreters.get(bucket)
+        if interpreter is None:
+            interpreter = self._new_interpreter()
+            index = interpreter.get_input_details()[0]["index"]
+            interpreter.resize_tensor_input(index, (bucket, *self.input_shape), strict=True)
+            interpreter.allocate_tensors()
+            self._interpreters[bucket] = interpreter
+
+        interpreter.set_tensor(interpreter.get_input_details()[0]["index"], chunk)
+        interpreter.invoke()
+        # get_tensor copies, so the result survives the next invoke
+        return interpreter.get_tensor(interpreter.get_output_details()[0]["index"])
+
+    def _new_interpreter(self):
+        return _interpreter_class()(
+            model_content=self._model_content, num_threads=self.num_threads
+        )
+
+
+def _interpreter_class():
+    """
+    TFLite interpreter from the standalone runtimes if installed (no TensorFlow
+    import), falling back to the one bundled with TensorFlow.
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name: str) -> InferenceBackend:
+    if name == BACKEND_KERAS:
+        return KerasBackend()
+    if name == BACKEND_TFLITE:
+        return TFLiteBackend(Config.TFLITE_MODEL_PATH, num_threads=Config.TFLITE_NUM_THREADS)
+    raise ValueError(f"Unknown INFERENCE_BACKEND {name!r}, expected one of {BACKENDS}")
+
+
+def fused_attribution_enabled() -> bool:
+    """
+    Whether process_eeg_record predicts inside the attribution pass. That pass
+    runs the Keras model, so it only replaces run_inference with the keras
+    backend; with any other backend EEG_FUSED_ATTRIBUTION is ignored.
+    """
+    return (
+        Config.EEG_FUSED_ATTRIBUTION
+        and Config.EEG_CHANNEL_ATTRIBUTION
+        and Config.INFERENCE_BACKEND == BACKEND_KERAS
+    )
+
+
+def validate_backend_config() -> None:
+    """
+    Reject an unknown INFERENCE_BACKEND and warn about settings that would be
+    silently ignored.
+
+    Raises:
+        ValueError: If INFERENCE_BACKEND is unknown
+    """
+    if Config.INFERENCE_BACKEND not in BACKENDS:
+        raise ValueError(f"Unknown INFERENCE_BACKEND {Config.INFERENCE_BACKEND!r}, expected one of {BACKENDS}")
+    if Config.INFERENCE_BACKEND != BACKEND_KERAS and Config.EEG_CHANNEL_ATTRIBUTION:
+        logger.warning(
+            f"INFERENCE_BACKEND={Config.INFERENCE_BACKEND}: channel attribution still loads "
+            f"the Keras model; set EEG_CHANNEL_ATTRIBUTION=false to keep TensorFlow out of the worker"
+        )
+    if fused_attribution_enabled() and Config.EEG_INFERENCE_BATCHING:
+        logger.warning("EEG_INFERENCE_BATCHING has no effect while EEG_FUSED_ATTRIBUTION is on")
+
+
+def get_backend() -> InferenceBackend:
+    """Process-wide inference backend selected by Config.INFERENCE_BACKEND"""
+    global _backend
+    if _backend is None or _backend.name != Config.INFERENCE_BACKEND:
+        with _backend_lock:
+            if _backend is None or _backend.name != Config.INFERENCE_BACKEND:
+                _backend = create_backend(Config.INFERENCE_BACKEND)
+                logger.info(f"Inference backend: {_backend.name}")
+    return _backend
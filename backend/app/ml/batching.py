@@ -0,0 +1,122 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+from app.config import Config
+from app.ml.backends import get_backend
+from app.ml.inference import summarize_predictions
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBatcher:
+    """
+    Coalesces concurrent inference requests into a single predict call.
+
+    Each submitted record (its (N, C, T, 1) tensor) waits at most max_wait_ms
+    for other records to arrive; the gathered windows, up to max_batch_size,
+    go through one predict call and the probabilities are split back per
+    record. Records bigger than max_batch_size are predicted on their own.
+
+    Only useful when several records are in flight in the same process, e.g.
+    a Celery worker started with `--pool threads --concurrency N`.
+    """
+
+    def __init__(self, predict_fn=None, max_batch_size: int = 256, max_wait_ms: float = 20):
+        self._predict_fn = predict_fn or _model_predict
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, X: np.ndarray) -> Future:
+        """Queue a record; the future resolves to (label, raw_probability, confidence)"""
+        future = Future()
+        self._ensure_started()
+        self._queue.put((X, future))
+        return future
+
+    def infer(self, X: np.ndarray) -> tuple:
+        """Blocking version of submit, same return value as run_inference"""
+        return self.submit(X).result()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="inference-batcher", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        pending = None
+        while True:
+            first = pending if pending is not None else self._queue.get()
+            batch, pending = self._collect(first)
+            self._predict(batch)
+
+    def _collect(self, first: tuple) -> tuple[list, tuple | None]:
+        """Gather records until the batch is full or the oldest one waited max_wait_ms"""
+        batch = [first]
+        n_windows = len(first[0])
+        deadline = time.monotonic() + self.max_wait_s
+
+        while n_windows < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if n_windows + len(item[0]) > self.max_batch_size:
+                return batch, item  # starts the next batch
+            batch.append(item)
+            n_windows += len(item[0])
+
+        return batch, None
+
+    def _predict(self, batch: list) -> None:
+        try:
+            X = np.concatenate([X for X, _ in batch]) if len(batch) > 1 else batch[0][0]
+            preds = np.asarray(self._predict_fn(X))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        logger.debug(f"Batched inference: {len(batch)} records, {len(X)} windows")
+
+        offset = 0
+        for X_record, future in batch:
+            record_preds = preds[offset:offset + len(X_record)]
+            offset += len(X_record)
+            try:
+                future.set_result(summarize_predictions(record_preds))
+            except Exception as e:
+                future.set_exception(e)
+
+
+def _model_predict(X: np.ndarray) -> np.ndarray:
+    return get_backend().predict(X)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher() -> InferenceBatcher:
+    """Process-wide batcher configured from Config"""
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = InferenceBatcher(
+                    max_batch_size=Config.EEG_INFERENCE_MAX_BATCH,
+                    max_wait_ms=Config.EEG_INFERENCE_MAX_WAIT_MS,
+                )
+    return _batcher
@@ -0,0 +1,66 @@
+"""
+Export the Keras model to TFLite for INFERENCE_BACKEND=tflite.
+
+The exported model keeps a dynamic batch dimension and is checked against the
+Keras model on random windows before it is written.
+
+Usage (from backend/):
+    python -m app.ml.export_model [--output dl_models/eegnet_model_balanced.tflite]
+"""
+import argparse
+import os
+import numpy as np
+from app.config import Config
+
+# Largest absolute probability difference accepted between Keras and TFLite
+PARITY_ATOL = 1e-4
+
+
+def export_tflite(model) -> bytes:
+    """Convert a Keras model to a float32 TFLite flatbuffer"""
+    import tensorflow as tf
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    return converter.convert()
+
+
+def check_parity(model, model_content: bytes, n_windows: int = 16, seed: int = 0) -> float:
+    """Max absolute difference between Keras and TFLite predictions on random windows"""
+    from app.ml.backends import TFLiteBackend
+    import tempfile
+
+    X = np.random.default_rng(seed).standard_normal(
+        (n_windows, *model.inputs[0].shape[1:])
+    ).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "model.tflite")
+        with open(path, "wb") as f:
+            f.write(model_content)
+        tflite_preds = TFLiteBackend(path).predict(X)
+
+    return float(np.max(np.abs(tflite_preds - model.predict(X, verbose=0))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=Config.TFLITE_MODEL_PATH)
+    args = parser.parse_args()
+
+    from app.ml.model_loader import get_model, MODEL_PATH
+    model = get_model()
+    model_content = export_tflite(model)
+
+    max_diff = check_parity(model, model_content)
+    if max_diff > PARITY_ATOL:
+        raise SystemExit(f"TFLite export differs from {MODEL_PATH} by {max_diff:.2e}, not written")
+
+    tmp_path = f"{args.output}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(model_content)
+    os.replace(tmp_path, args.output)
+    print(f"Exported {MODEL_PATH} -> {args.output} "
+          f"({len(model_content) / 1024:.0f} KiB, max diff {max_diff:.2e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,94 @@
+import threading
 import numpy as np
 from app.ml.model_loader import get_model
+from app.ml.backends import PREDICT_BUCKETS, bucket_plan, get_backend
 from app.models.prediction_result import AlcoholismRisk
+from app.config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def run_inference(X: np.ndarray) -> tuple[AlcoholismRisk, float, float]:
+class BucketedPredictor:
+    """
+    Graph predictor for a Keras model without Keras' generic predict loop.
+
+    The model call is wrapped in a tf.function with a fixed input signature, so
+    it is traced once and never retraced for a new batch size. Inputs run in
+    chunks of a small set of bucket sizes (the tail zero-padded), which keeps
+    the shapes seen by the kernels (and their caches) bounded; padded rows are
+    dropped from the output. Each chunk is a single graph execution.
+    """
+
+    def __init__(self, model, buckets: tuple[int, ...] = PREDICT_BUCKETS):
+        import tensorflow as tf
+
+        self.model = model
+        self.buckets = tuple(sorted(buckets))
+        self.output_shape = tuple(model.outputs[0].shape[1:])
+        self.input_shape = tuple(model.inputs[0].shape[1:])
+        self._fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((None, *self.input_shape), tf.float32)],
+        )
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        outputs = []
+
+        start = 0
+        for bucket in bucket_plan(len(X), self.buckets):
+            chunk = X[start:start + bucket]
+            n = len(chunk)
+            if n < bucket:
+                padding = np.zeros((bucket - n, *self.input_shape), dtype=np.float32)
+                chunk = np.concatenate([chunk, padding])
+            outputs.append(self._fn(chunk).numpy()[:n])
+            start += n
+
+        if not outputs:
+            return np.zeros((0, *self.output_shape), dtype=np.float32)
+        return np.concatenate(outputs)
+
+    def warm_up(self) -> None:
+        """Run every bucket once so no call pays graph building or kernel setup"""
+        for bucket in self.buckets:
+            self._fn(np.zeros((bucket, *self.input_shape), dtype=np.float32))
+
+    @property
+    def tracing_count(self) -> int:
+        return self._fn.experimental_get_tracing_count()
+
+
+_predictor = None
+_predictor_lock = threading.Lock()
+
+
+def get_predictor() -> BucketedPredictor:
+    """Process-wide predictor for the loaded model"""
+    global _predictor
     model = get_model()
+    if _predictor is None or _predictor.model is not model:
+        with _predictor_lock:
+            if _predictor is None or _predictor.model is not model:
+                _predictor = BucketedPredictor(model)
+    return _predictor
+
+
+def run_inference(X: np.ndarray) -> tuple[AlcoholismRisk, float, float]:
+    if Config.EEG_INFERENCE_BATCHING:
+        # Coalesce with other records in flight in this process
+        from app.ml.batching import get_batcher
+        return get_batcher().infer(X)
+
+    preds = get_backend().predict(X)
+    return summarize_predictions(preds)
+
+
+def summarize_predictions(preds: np.ndarray) -> tuple[AlcoholismRisk, float, float]:
+    """Aggregate per-window probabilities into the record's label, probability and confidence"""
+    preds = np.asarray(preds).flatten()
 
-    preds = model.predict(X, verbose=0).flatten()
-    
     # DEBUG: Log prediction statistics
     mean_prob = float(np.mean(preds))
     std_prob = float(np.std(preds))
@@ -6,23 +6,34 @@ import numpy as np
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"  # Reduce TF logging overhead
 
-import tensorflow as tf
-from tensorflow import keras
-
-# Configure TensorFlow memory and threading
-tf.config.threading.set_intra_op_parallelism_threads(2)
-tf.config.threading.set_inter_op_parallelism_threads(2)
+# TensorFlow is imported on the first get_model() call, not with this module,
+# so processes that never run the model (the API) do not load it
 
 _model = None
 _model_version = None
 _model_lock = threading.Lock()
 MODEL_PATH = "dl_models/eegnet_model_balanced.keras"
 
+def _import_tensorflow():
+    """Import TensorFlow and configure its threading before the runtime starts"""
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(2)
+        tf.config.threading.set_inter_op_parallelism_threads(2)
+    except RuntimeError:
+        pass  # TF already initialized by other code in this process
+    return tf
+
+
 def get_model():
     global _model
     if _model is None:
         with _model_lock:
             if _model is None:  # double-checked locking
+                tf = _import_tensorflow()
+                from tensorflow import keras
+
                 np.random.seed(42)
                 tf.random.set_seed(42)
                 
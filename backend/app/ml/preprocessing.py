@@ -1,154 +1,212 @@
 import gc
+from functools import lru_cache
 import numpy as np
-from scipy.signal import butter, filtfilt
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import butter, sosfiltfilt
 from app.ml.eeg_config import CHANNELS, SAMPLING_RATE
 from app.domain.reader.eeg_reader_factory import EegReaderFactory
+from app.domain.storage.dense_eeg import pivot_table_trials
 import logging
 
 logger = logging.getLogger(__name__)
 
+FREQUENCY_BANDS = {
+    'delta': (0.5, 4),
+    'theta': (4, 8),
+    'alpha': (8, 13),
+    'beta': (13, 30),
+    'gamma': (30, 50)
+}
+
+# Version of the numerics below: bump it whenever a change alters the tensors,
+# so tensors cached by an older version are never served again
+PREPROCESSING_VERSION = 1
+
+# Plane order per channel in the model input
+BAND_NAMES = ['raw', *FREQUENCY_BANDS]
+
+# Windows filtered per vectorized call, bounds the float64 working set
+BAND_BATCH_WINDOWS = 64
+
+# Trial samples band-filtered per call in "trial" mode (channels x samples),
+# bounds the float64 bands held at once to this times len(BAND_NAMES)
+BAND_BATCH_SAMPLES = 1 << 20
+
+# Where the filter bank runs: on every window, or once per trial before windowing
+FILTER_MODE_WINDOW = "window"
+FILTER_MODE_TRIAL = "trial"
+FILTER_MODES = (FILTER_MODE_WINDOW, FILTER_MODE_TRIAL)
+
+
 def normalize_signal(signal: np.ndarray) -> np.ndarray:
     """Z-score normalization of a signal"""
     if np.std(signal) > 1e-8:
         return (signal - np.mean(signal)) / np.std(signal)
     return signal
 
+def normalize_planes(planes: np.ndarray) -> np.ndarray:
+    """Z-score normalization of every signal along the last axis at once"""
+    mean = planes.mean(axis=-1, keepdims=True)
+    std = planes.std(axis=-1, keepdims=True)
+    valid = std > 1e-8
+    return np.where(valid, (planes - mean) / np.where(valid, std, 1.0), planes)
+
+@lru_cache(maxsize=None)
+def _band_sos(band_name: str, fs: float) -> np.ndarray:
+    """Butterworth band-pass in second-order sections, designed once per (band, fs)"""
+    low, high = FREQUENCY_BANDS[band_name]
+    nyquist = fs / 2
+    low_norm = max(low / nyquist, 0.01)
+    high_norm = min(high / nyquist, 0.99)
+    return butter(4, [low_norm, high_norm], btype='band', output='sos')
+
+def extract_frequency_bands_batch(signals: np.ndarray, fs=256) -> np.ndarray:
+    """
+    Extract EEG frequency bands for a whole block of signals.
+
+    Args:
+        signals: (..., T) array, filtered along the last axis
+
+    Returns:
+        np.ndarray: (..., len(BAND_NAMES), T) float64 array, 'raw' first
+    """
+    signals = np.asarray(signals, dtype=np.float64)
+    planes = np.zeros(signals.shape[:-1] + (len(BAND_NAMES), signals.shape[-1]))
+    planes[..., 0, :] = signals
+
+    for i, band_name in enumerate(BAND_NAMES[1:], start=1):
+        sos = _band_sos(band_name, float(fs))
+        # Same edge padding filtfilt used with the (b, a) form of this filter
+        padlen = 3 * (2 * len(sos) + 1)
+        if signals.shape[-1] <= padlen:
+            continue  # too short to filter, band stays at zero
+        planes[..., i, :] = sosfiltfilt(sos, signals, axis=-1, padlen=padlen)
+
+    return planes
+
 def extract_frequency_bands(signal, fs=256):
     """Extract EEG frequency bands"""
-    bands = {
-        'delta': (0.5, 4),
-        'theta': (4, 8),
-        'alpha': (8, 13),
-        'beta': (13, 30),
-        'gamma': (30, 50)
-    }
+    planes = extract_frequency_bands_batch(signal, fs=fs)
+    return {band_name: planes[i] for i, band_name in enumerate(BAND_NAMES)}
 
-    nyquist = fs / 2
-    filtered_signals = {'raw': signal}
-
-    for band_name, (low, high) in bands.items():
-        try:
-            low_norm = max(low / nyquist, 0.01)
-            high_norm = min(high / nyquist, 0.99)
-
-            b, a = butter(4, [low_norm, high_norm], btype='band')
-            filtered = filtfilt(b, a, signal)
-            filtered_signals[band_name] = filtered
-        except:
-            filtered_signals[band_name] = np.zeros_like(signal)
-
-    return filtered_signals
-
-def get_channel_signal(trial_data, ch, start_idx, win_size) -> np.ndarray:
-    """Extracts a windowed signal from a channel with padding if necessary"""
-    ch_data = trial_data[trial_data['channel'] == ch].sort_values('sample')
-    if start_idx + win_size <= len(ch_data):
-        return ch_data['value'].iloc[start_idx:start_idx + win_size].values
-
-    available_signal = ch_data['value'].iloc[start_idx:].values
-    if len(available_signal) == 0:
-        return np.zeros(win_size)
-
-    return np.pad(available_signal, (0, win_size - len(available_signal)), mode='constant')
-
-
-def process_channel(signal, use_bands, channel_idx, sample) -> int:
-    """Process one channel: extract frequency bands or raw signal"""
-    if use_bands:
-        bands = extract_frequency_bands(signal, fs=SAMPLING_RATE)
-        for band_name in ['raw', 'delta', 'theta', 'alpha', 'beta', 'gamma']:
-            if band_name in bands:
-                band_signal = normalize_signal(bands[band_name])
-                sample[channel_idx, :, 0] = band_signal
-            channel_idx += 1
-    else:
-        signal = normalize_signal(signal)
-        sample[channel_idx, :, 0] = signal
-        channel_idx += 1
-    return channel_idx
+
+def _write_windows(out, channels, signals, win_size, step_size, to_planes) -> None:
+    """
+    Cut the windows of `signals` (channels, [planes,] samples) as strided views
+    and write to out[:, channels] the normalized planes that to_planes makes
+    of each block of (windows, channels, [planes,] win_size).
+    """
+    windows = sliding_window_view(signals, win_size, axis=-1)[..., ::step_size, :]
+    for w in range(0, windows.shape[-2], BAND_BATCH_WINDOWS):
+        block = np.moveaxis(windows[..., w:w + BAND_BATCH_WINDOWS, :], -2, 0)
+        out[w:w + len(block), channels] = normalize_planes(to_planes(block))
 
 
 def build_tensor_from_parquet(
     parquet_path: str,
     win_size: int = 256,
     step_size: int = 256,
-    use_bands: bool = True
+    use_bands: bool = True,
+    filter_mode: str = FILTER_MODE_WINDOW
 ) -> np.ndarray:
     """
-    Build 4D tensor (N, C, T, 1) from a single parquet EEG file.
+    Build 4D tensor (N, C, T, 1) from a single EEG file.
+
+    Dense files stored at upload (.npy + header) are memory-mapped and sliced
+    per trial, EDF files are decoded channel-wise into the same layout; any
+    other format is read as an Arrow table and pivoted once into the dense
+    (trials, channels, samples) layout. Every window is cut from it as a
+    strided view and the filter bank runs on blocks of (windows, channels, T)
+    at once.
+
+    filter_mode:
+        "window": band-filter each window on its own (what the model was trained on)
+        "trial":  band-filter each channel's full trial once and cut the windows
+                  from the filtered bands; no per-window edge padding and
+                  overlapping windows are not filtered twice
     """
-    df = EegReaderFactory.get_reader(parquet_path).read(parquet_path)
+    if filter_mode not in FILTER_MODES:
+        raise ValueError(
+            f"Invalid filter_mode '{filter_mode}'. Valid values: {', '.join(FILTER_MODES)}"
+        )
 
-    available_channels = set(df['channel'].unique())
     channels_to_use = CHANNELS
-
-    missing_channels = [ch for ch in channels_to_use if ch not in available_channels]
-    if missing_channels:
-        raise ValueError(f"Missing required channels: {missing_channels}")
-
-    actual_n_channels = len(channels_to_use) * 6
-
-    X_data = []
-
-    trials = df["trial"].unique()
-
-    for trial_id in trials:
-
-        trial_data = df[df["trial"] == trial_id]
-
-        channel_lengths = {
-            ch: len(trial_data[trial_data["channel"] == ch])
-            for ch in channels_to_use
-            if not trial_data[trial_data["channel"] == ch].empty
-        }
-
-        if not channel_lengths:
+    planes_per_channel = len(BAND_NAMES) if use_bands else 1
+
+    reader = EegReaderFactory.get_reader(parquet_path)
+    dense = reader.read_dense(parquet_path, channels_to_use)
+    if dense is not None:
+        # Dense at upload (memmap) or dense by nature (EDF): slice it, nothing to pivot
+        if dense.fs != SAMPLING_RATE:
+            raise ValueError(f"Sampling rate is {dense.fs} Hz, the model expects {SAMPLING_RATE} Hz")
+        channel_idx = dense.channel_indices(channels_to_use)
+        data, lengths = dense.data, dense.lengths[:, channel_idx]
+    else:
+        # Arrow columns pivoted without a pandas frame; parquet skips the other
+        # channels' row groups
+        table = reader.read_table(parquet_path, channels=channels_to_use)
+        data, lengths = pivot_table_trials(table, channels_to_use)
+
+        missing_channels = [ch for ch, n in zip(channels_to_use, lengths.sum(axis=0)) if n == 0]
+        if missing_channels:
+            raise ValueError(f"Missing required channels: {missing_channels}")
+        channel_idx = np.arange(len(channels_to_use))
+
+        del table
+        gc.collect()
+
+    # (trial, present channels, samples used, windows) of every trial with a full window
+    trial_plan = []
+    for t in range(data.shape[0]):
+        present = np.flatnonzero(lengths[t] > 0)
+        if present.size == 0:
             continue
 
-        min_length = min(channel_lengths.values())
-
+        min_length = int(lengths[t, present].min())
         if min_length < win_size:
             continue
 
-        n_windows = max(1, (min_length - win_size) // step_size + 1)
+        trial_plan.append((t, present, min_length, (min_length - win_size) // step_size + 1))
 
-        for w in range(n_windows):
-
-            start_idx = w * step_size
-            sample = np.zeros((actual_n_channels, win_size, 1), dtype=np.float32)
-
-            channel_idx = 0
-            valid_channels_count = 0
-
-            for ch in channels_to_use:
-
-                ch_data = trial_data[trial_data["channel"] == ch]
-
-                if ch_data.empty:
-                    channel_idx += 6 if use_bands else 1
-                    continue
-
-                signal = get_channel_signal(trial_data, ch, start_idx, win_size)
-                channel_idx = process_channel(signal, use_bands, channel_idx, sample)
-                valid_channels_count += 1
-
-            if valid_channels_count > 0:
-                X_data.append(sample)
-
-    del df
-    gc.collect()
-
-    if not X_data:
+    n_samples = sum(n_windows for *_, n_windows in trial_plan)
+    if n_samples == 0:
         return np.array([])
 
-    result = np.array(X_data, dtype=np.float32)
-    
-    # DEBUG: Log statistics about processed data
-    logger.debug(f"Preprocessed {parquet_path}: "
-                f"shape={result.shape}, "
-                f"min={np.min(result):.4f}, "
-                f"max={np.max(result):.4f}, "
-                f"mean={np.mean(result):.4f}, "
-                f"std={np.std(result):.4f}")
+    # The model input keeps 6 planes per channel; in raw mode only the first
+    # len(channels) planes are filled
+    result = np.zeros((n_samples, len(channels_to_use) * len(BAND_NAMES), win_size), dtype=np.float32)
+    planes_view = result.reshape(n_samples, -1, planes_per_channel, win_size)
+
+    i = 0
+    for t, present, min_length, n_windows in trial_plan:
+        signals = data[t, channel_idx[present], :min_length]
+        out = planes_view[i:i + n_windows]
+        if not use_bands:
+            _write_windows(out, present, signals, win_size, step_size,
+                           lambda block: np.asarray(block, dtype=np.float64)[:, :, None, :])
+        elif filter_mode == FILTER_MODE_TRIAL:
+            # A few channels of one trial at a time: the filtered bands of
+            # whole trials never coexist
+            block_channels = max(1, BAND_BATCH_SAMPLES // min_length)
+            for c in range(0, len(present), block_channels):
+                bands = extract_frequency_bands_batch(signals[c:c + block_channels], fs=SAMPLING_RATE)  # (C, 6, L)
+                _write_windows(out, present[c:c + block_channels], bands, win_size, step_size,
+                               lambda block: block)  # (W, C, 6, T), already filtered
+        else:
+            _write_windows(out, present, signals, win_size, step_size,
+                           lambda block: extract_frequency_bands_batch(block, fs=SAMPLING_RATE))
+        i += n_windows
+
+    result = result.reshape(n_samples, -1, win_size, 1)
+
+    # DEBUG: Log statistics about processed data (only computed when enabled:
+    # np.std allocates a temporary as large as the tensor)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Preprocessed {parquet_path}: "
+                    f"shape={result.shape}, "
+                    f"min={np.min(result):.4f}, "
+                    f"max={np.max(result):.4f}, "
+                    f"mean={np.mean(result):.4f}, "
+                    f"std={np.std(result):.4f}")
     
     return result
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+import numpy as np
+from app.config import Config
+from app.ml.preprocessing import PREPROCESSING_VERSION, build_tensor_from_parquet
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRNAME = "tensor_cache"
+
+# Temp files older than this belong to writers that crashed before the rename
+TMP_MAX_AGE_SECONDS = 3600
+
+
+def file_digest(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash: str, params: dict) -> str:
+    """Key of a tensor: file content, preprocessing version and the parameters used on it"""
+    payload = json.dumps(
+        {"content": content_hash, "preprocessing_version": PREPROCESSING_VERSION, **params},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cache_dir() -> str:
+    return os.path.join(Config.EEG_UPLOAD_FOLDER, CACHE_DIRNAME)
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(_cache_dir(), f"{key}.npy")
+
+
+def get_or_build_tensor(file_path: str, content_hash: str | None = None, **params) -> np.ndarray:
+    """
+    Return the preprocessed tensor of an EEG file, building it only on a cache miss.
+
+    Hits are loaded memory-mapped (read-only) straight from the upload volume, so
+    a second task on the same file skips re-tensorizing. Misses are built with
+    build_tensor_from_parquet(file_path, **params) and stored for later tasks.
+
+    Args:
+        file_path: Path to the EEG file
+        content_hash: SHA-256 of the file if already known; computed otherwise
+        **params: Keyword arguments for build_tensor_from_parquet
+    """
+    if Config.EEG_TENSOR_CACHE_MAX_BYTES <= 0:
+        return build_tensor_from_parquet(file_path, **params)
+
+    key = cache_key(content_hash or file_digest(file_path), params)
+    entry_path = _entry_path(key)
+
+    try:
+        X = np.load(entry_path, mmap_mode="r")
+        os.utime(entry_path)  # mtime is the LRU timestamp
+        logger.debug(f"Tensor cache hit for {file_path}: {key}")
+        return X
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Discarding unreadable tensor cache entry {entry_path}: {e}")
+        _remove(entry_path)
+
+    X = build_tensor_from_parquet(file_path, **params)
+    if X.size == 0:
+        return X
+
+    try:
+        os.makedirs(_cache_dir(), exist_ok=True)
+        # Write to a unique temp name and rename, so readers never see partial files
+        tmp_path = f"{entry_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, X)
+        os.replace(tmp_path, entry_path)
+        evict_tensor_cache(Config.EEG_TENSOR_CACHE_MAX_BYTES)
+    except OSError as e:
+        # The cache is an optimization: never fail the task because of it
+        logger.warning(f"Could not store tensor cache entry for {file_path}: {e}")
+
+    return X
+
+
+def discard_cached_tensor(file_path: str, content_hash: str | None = None, **params) -> None:
+    """Remove the cached tensor of a file, e.g. when the file itself is deleted"""
+    if Config.EEG_TENSOR_CACHE_MAX_BYTES <= 0:
+        return
+    if content_hash is None:
+        if not os.path.exists(file_path):
+            return
+        content_hash = file_digest(file_path)
+    _remove(_entry_path(cache_key(content_hash, params)))
+
+
+def evict_tensor_cache(max_bytes: int) -> int:
+    """
+    Delete least recently used entries until the cache fits in max_bytes, and
+    temp files older than TMP_MAX_AGE_SECONDS left by crashed writers.
+
+    Returns:
+        int: Number of entries removed
+    """
+    stats = []
+    orphan_before = time.time() - TMP_MAX_AGE_SECONDS
+    try:
+        for entry in os.scandir(_cache_dir()):
+            if entry.name.endswith(".npy"):
+                stat = entry.stat()
+                stats.append((stat.st_mtime, stat.st_size, entry.path))
+            elif entry.name.endswith(".tmp"):
+                try:
+                    if entry.stat().st_mtime < orphan_before:
+                        _remove(entry.path)
+                except FileNotFoundError:
+                    pass  # renamed by its writer meanwhile
+    except FileNotFoundError:
+        return 0
+
+    stats.sort()
+    total = sum(size for _, size, _ in stats)
+
+    removed = 0
+    for _, size, path in stats:
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -1,10 +1,10 @@
 # backend/app/ml/visualization.py
 
 import numpy as np
-import tensorflow as tf
 from app.ml.eeg_config import CHANNELS, SAMPLING_RATE
 from app.ml.model_loader import get_model
 from app.domain.reader.eeg_reader_factory import EegReaderFactory
+from app.domain.reader.edf_reader import EdfEegReader, EdfFile
 
 # Posiciones para topomap 2D
 EEG_POSITIONS_2D = {
@@ -82,22 +82,10 @@ def generate_waveforms(
           "duration_ms": 1000.0
         }
     """
-    import pandas as pd
     from app.ml.preprocessing import normalize_signal
 
-    df = EegReaderFactory.get_reader(parquet_path).read(parquet_path)
-    trials = df["trial"].unique()
-
-    if trial_index >= len(trials):
-        trial_index = 0
-    trial_data = df[df["trial"] == trials[trial_index]]
-
     channels_data = {}
-    for ch in CHANNELS:
-        ch_data = trial_data[trial_data["channel"] == ch].sort_values("sample")
-        if ch_data.empty:
-            continue
-        signal = ch_data["value"].iloc[:win_size].values
+    for ch, signal in _first_window_signals(parquet_path, trial_index, win_size):
         if len(signal) < win_size:
             signal = np.pad(signal, (0, win_size - len(signal)), mode="constant")
 
@@ -121,36 +109,150 @@ def generate_waveforms(
     }
 
 
-def generate_channel_importance(X: np.ndarray) -> dict:
+def _first_window_signals(file_path: str, trial_index: int, win_size: int):
+    """
+    (canal, primeras win_size muestras) de un trial, para los CHANNELS presentes.
+
+    Con el formato denso solo se lee ese trozo del memmap; en EDF solo los
+    data records de la ventana; en parquet se leen solo las columnas, el
+    trial y las muestras necesarias.
+    """
+    reader = EegReaderFactory.get_reader(file_path)
+    if isinstance(reader, EdfEegReader):
+        # Un EDF es un único trial 0: no se decodifican los canales completos
+        edf = EdfFile(file_path)
+        available = edf.channels
+        for ch in CHANNELS:
+            if ch in available:
+                yield ch, edf.read_signal(available[ch], 0, win_size)
+        return
+
+    dense = reader.read_dense(file_path, CHANNELS)
+    if dense is not None:
+        if trial_index >= len(dense.trials):
+            trial_index = 0
+        for ch in CHANNELS:
+            if ch not in dense.channels:
+                continue
+            c = dense.channels.index(ch)
+            length = min(int(dense.lengths[trial_index, c]), win_size)
+            if length:
+                yield ch, np.array(dense.data[trial_index, c, :length])
+        return
+
+    trials = reader.trial_ids(file_path)
+
+    if trial_index >= len(trials):
+        trial_index = 0
+    selection = dict(columns=["channel", "sample", "value"], trials=[trials[trial_index]], channels=CHANNELS)
+
+    # Muestras [0, win_size): con el parquet ordenado solo se leen los row groups del inicio
+    # de cada canal. Si algún canal no llena la ventana desde 0, se lee el trial completo
+    trial_data = reader.read_subset(file_path, samples=(0, win_size), **selection)
+    counts = trial_data["channel"].value_counts()
+    if trial_data.empty or (counts[counts > 0] < win_size).any():
+        trial_data = reader.read_subset(file_path, **selection)
+
+    for ch in CHANNELS:
+        ch_data = trial_data[trial_data["channel"] == ch].sort_values("sample")
+        if ch_data.empty:
+            continue
+        yield ch, ch_data["value"].iloc[:win_size].values
+
+
+# Ventanas por paso de GradientTape: acota la memoria sin importar la duración del registro
+ATTRIBUTION_BATCH_SIZE = 32
+
+
+def _taped_batches(X: np.ndarray, batch_size: int):
+    """
+    Recorre X en mini-batches con un forward/backward grabado por batch.
+
+    Solo un batch vive como tensor de TF a la vez; X puede ser un memmap.
+
+    Yields:
+        predictions: (B, outputs) salidas del modelo para el batch
+        attribution: (C*bands,) media de grads * X del batch sobre ventanas y tiempo
+    """
+    import tensorflow as tf
+
+    model = get_model()
+    class_idx = None
+
+    for start in range(0, len(X), batch_size):
+        X_tf = tf.convert_to_tensor(X[start:start + batch_size], dtype=tf.float32)
+
+        with tf.GradientTape() as tape:
+            tape.watch(X_tf)
+
+            predictions = model(X_tf, training=False)
+
+            # Misma clase para todos los batches: la del primer ejemplo
+            if class_idx is None:
+                class_idx = int(tf.argmax(predictions[0]).numpy())
+            loss = predictions[:, class_idx]
+
+        grads = tape.gradient(loss, X_tf)
+
+        if grads is None:
+            raise ValueError(
+                "GradientTape returned None gradients. Verifica que el modelo "
+                "sea diferenciable y que X_tf esté siendo watched correctamente."
+            )
+
+        attribution = tf.reduce_mean(grads * X_tf, axis=[0, 2, 3])
+        yield predictions.numpy(), attribution.numpy().astype(np.float64)
+
+
+def _streaming_attribution(X: np.ndarray, batch_size: int, keep_predictions: bool):
+    """Media acumulada de grads * X por canal/banda sobre todos los mini-batches."""
+    preds = []
+    mean = np.zeros(X.shape[1], dtype=np.float64)
+    seen = 0
+
+    for batch_preds, batch_mean in _taped_batches(X, batch_size):
+        n = len(batch_preds)
+        seen += n
+        mean += (batch_mean - mean) * (n / seen)
+        if keep_predictions:
+            preds.append(batch_preds)
+
+    return preds, mean
+
+
+def generate_channel_importance(X: np.ndarray, batch_size: int = ATTRIBUTION_BATCH_SIZE) -> dict:
     """
     Gradient × Input attribution para estimar importancia por canal.
 
+    Se procesa en mini-batches de batch_size ventanas acumulando la media,
+    así el pico de memoria no depende de la duración del registro.
+
     Input shape:
     (N, C*bands, T, 1)
     """
-    model = get_model()
-    X_tf = tf.convert_to_tensor(X, dtype=tf.float32)
+    _, attribution = _streaming_attribution(X, batch_size, keep_predictions=False)
+    return channel_importance_from_attribution(attribution)
 
-    with tf.GradientTape() as tape:
-        tape.watch(X_tf)
 
-        predictions = model(X_tf, training=False)
-
-        class_idx = int(tf.argmax(predictions[0]).numpy())
-        loss = predictions[:, class_idx]
+def predict_with_attribution(X: np.ndarray, batch_size: int = ATTRIBUTION_BATCH_SIZE) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Predicciones y atribución Gradient × Input en un solo forward/backward por mini-batch.
 
-    grads = tape.gradient(loss, X_tf)
+    Evita el segundo paso completo del modelo de generate_channel_importance:
+    el mismo forward grabado en la GradientTape da las probabilidades.
 
-    if grads is None:
-        raise ValueError(
-            "GradientTape returned None gradients. Verifica que el modelo "
-            "sea diferenciable y que X_tf esté siendo watched correctamente."
-        )
+    Returns:
+        preds: (N, outputs) salidas del modelo
+        attribution: (C*bands,) media de grads * X sobre ventanas y tiempo
+    """
+    preds, attribution = _streaming_attribution(X, batch_size, keep_predictions=True)
+    return np.concatenate(preds), attribution
 
-    attribution = (grads * X_tf).numpy()      # (N, C*bands, T, 1)
-    attribution = attribution.mean(axis=0)    # (C*bands, T, 1)
-    attribution = attribution.mean(axis=1).squeeze()  # (C*bands,)
 
+def channel_importance_from_attribution(attribution: np.ndarray) -> dict:
+    """
+    Agrega la atribución por plano (C*bands,) en importancia normalizada por canal.
+    """
     n_channels = len(CHANNELS)
     n_bands = 6
 
@@ -0,0 +1,45 @@
+import time
+import numpy as np
+from app.ml.model_loader import get_model, get_model_version
+from app.ml.backends import BACKEND_KERAS, fused_attribution_enabled, get_backend
+from app.audit.audit import log_tech
+
+
+def warm_up_model() -> dict:
+    """
+    Load the model and trace the graph process_eeg_record runs, with a dummy
+    (1, 204, 256, 1) input, so the first EEG after a restart does not pay for
+    it. On the fused path (fused_attribution_enabled) that is the Keras model
+    inside the attribution pass; otherwise every batch bucket of the inference
+    backend used by run_inference. Predictor buckets are not warmed in fused mode,
+    since nothing runs them.
+
+    Returns:
+        dict: Timings in ms ({"load_ms", "trace_ms"})
+    """
+    start = time.perf_counter()
+
+    if fused_attribution_enabled():
+        from app.ml.visualization import predict_with_attribution
+        get_model()
+        version = get_model_version()
+        loaded = time.perf_counter()
+
+        dummy = np.zeros((1, 204, 256, 1), dtype=np.float32)
+        predict_with_attribution(dummy, batch_size=1)
+    else:
+        backend = get_backend()
+        if backend.name == BACKEND_KERAS:
+            get_model()
+        version = backend.version
+        loaded = time.perf_counter()
+
+        backend.warm_up()
+    traced = time.perf_counter()
+
+    timings = {
+        "load_ms": round((loaded - start) * 1000, 1),
+        "trace_ms": round((traced - loaded) * 1000, 1),
+    }
+    log_tech.info(f"Modelo {version} precargado", timings)
+    return timings
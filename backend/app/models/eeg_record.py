@@ -36,6 +36,8 @@ class EegRecord(BaseModel):
     file_path = db.Column(db.String(500), nullable=True)  # Nullable: deleted after processing if SAVE_EEG_FILES=False
     file_type = db.Column(db.Enum(FILE_TYPE), nullable=False)
     file_size_bytes = db.Column(db.BigInteger, nullable=True)
+    # SHA-256 of the file as uploaded, computed while it is received
+    content_hash = db.Column(db.String(64), index=True, nullable=True)
 
     status = db.Column(db.Enum(EegStatus), default=EegStatus.PENDING, nullable=False)
 
@@ -23,6 +23,16 @@ class PredictionResult(BaseModel):
     raw_probability = db.Column(db.Numeric(5,4), nullable=True)
 
     model_version = db.Column(db.String(120), nullable=False)
+    # SHA-256 of the preprocessing parameters; with the record's content_hash
+    # and model_version it identifies results that can be reused
+    preprocessing_hash = db.Column(db.String(64), nullable=True)
+    # Prediction this one was copied from when an identical file was uploaded again
+    reused_from_id = db.Column(
+        UUID(as_uuid=True),
+        db.ForeignKey("prediction_results.id"),
+        index=True,
+        nullable=True
+    )
 
     eeg_record = db.relationship("EegRecord", back_populates="prediction_result")
     visualization = db.relationship("PredictionVisualization", back_populates="prediction", uselist=False, lazy="select", cascade="all, delete-orphan")
\ No newline at end of file
@@ -1,3 +1,4 @@
+import hashlib
 from app.extensions import db
 from app.models.base import AuditMixin
 import uuid
@@ -12,9 +13,16 @@ class Session(AuditMixin):
         nullable=False
     )
 
-    token = db.Column(db.String(500), unique=True, index=True, nullable=False)
+    # SHA-256 of the JWT, a fixed-size lookup key; the token itself is not stored
+    token_hash = db.Column(db.LargeBinary(32), unique=True, index=True, nullable=False)
+    # "jti" claim of the JWT
+    jti = db.Column(db.String(36), unique=True, index=True, nullable=False)
 
     start_date = db.Column(db.DateTime, nullable=False)
     expiration_date = db.Column(db.DateTime, nullable=False)
 
-    is_active = db.Column(db.Boolean, default=True, nullable=False)
\ No newline at end of file
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+
+    @staticmethod
+    def hash_token(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
@@ -26,9 +26,11 @@ def login():
 def logout():
     token = request.headers.get("Authorization", "").replace("Bearer ", "")
     user = get_current_user()
+    # Read before the service commits, which expires the loaded user
+    details = {"email": user.email if user else None}
+
     AuthService.logout(token)
     
-    details = {"email": user.email if user else None}
     return jsonify({"message": "Session closed successfully"}), 200, details
 
 
@@ -56,11 +58,10 @@ def refresh_session():
     
     token = request.headers.get("Authorization", "").replace("Bearer ", "")
     user = get_current_user()
+    details = {"email": user.email if user else None}
 
     AuthService.refresh_session(token)
 
-    details = {"email": user.email if user else None}
-
     return jsonify({"message": "Session refreshed"}), 200, details
 
 @auth_bp.route("/auth/validate", methods=["GET"])
@@ -90,11 +91,11 @@ def invalidate_user_session(user_id):
     if admin.role.value != "admin":
         raise PermissionError("Admin privileges required")
 
-    AuthService._invalidate_existing_session(user_id)
-
     details = {
         "admin_email": admin.email,
         "target_user_id": str(user_id)
     }
 
+    AuthService._invalidate_existing_session(user_id)
+
     return jsonify({"message": "User session invalidated"}), 200, details
\ No newline at end of file
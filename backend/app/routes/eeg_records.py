@@ -1,11 +1,15 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from flask_jwt_extended import jwt_required
 from app.services.eeg_record_service import EegRecordService
 from app.utils.security import get_current_user
-from app.tasks.eeg_tasks import process_eeg_record
+from app.utils.status_events import (
+    STREAM_BUSY_RETRY_AFTER_SECONDS, get_status_broker, stream_slots, stream_status_events
+)
+from app.tasks.eeg_tasks import convert_eeg_record, process_eeg_record
 from app.extensions import limiter
 from app.audit.decorators import audit
-from app.exceptions import ValidationError
+from app.exceptions import ServiceUnavailableError, ValidationError
+from app.config import Config
 
 eeg_records_bp = Blueprint("eeg_records", __name__)
 
@@ -27,8 +31,12 @@ def upload_eeg():
 
     record = EegRecordService.create_eeg_record(file, patient_id, current_user)
 
-    # Enqueue background task passing the record ID
-    process_eeg_record.delay(record["id"]) # type: ignore
+    # Enqueue background task passing the record ID; with async conversion the
+    # pipeline starts by converting the upload as received
+    if Config.EEG_ASYNC_CONVERSION:
+        convert_eeg_record.delay(record["id"]) # type: ignore
+    else:
+        process_eeg_record.delay(record["id"]) # type: ignore
 
     details = {
         "eeg_id": record["id"],
@@ -90,6 +98,59 @@ def get_eeg_status(eeg_id):
     return jsonify(result), 200, details
 
 
+@eeg_records_bp.route("/eeg-records/<uuid:eeg_id>/status/stream", methods=["GET"])
+@limiter.limit("30 per minute")
+@jwt_required()
+@audit(action="stream", resource="eeg_record")
+def stream_eeg_status(eeg_id):
+    """
+    Server-Sent Events with the status of an EEG record: the current status,
+    then each transition published by the pipeline, until the record fails or
+    its visualizations finish (or EEG_STATUS_STREAM_MAX_SECONDS pass).
+    Replaces polling /status; answers 503 with Retry-After when this worker
+    already has EEG_STATUS_STREAMS_PER_WORKER streams open.
+
+    Authenticated with the Authorization header like every other route, so
+    browsers read it with fetch (EventSource cannot send headers), as the
+    frontend's eegService.streamEEGStatus does.
+    """
+    current_user = get_current_user()
+
+    if not stream_slots.acquire(Config.EEG_STATUS_STREAMS_PER_WORKER):
+        raise ServiceUnavailableError(
+            "Too many open status streams, poll the status instead",
+            retry_after=STREAM_BUSY_RETRY_AFTER_SECONDS,
+        )
+
+    subscription = None
+    try:
+        # Subscribe before reading the status so no transition falls in between
+        subscription = get_status_broker().subscribe(eeg_id)
+        snapshot = EegRecordService.get_eeg_status_event(eeg_id, current_user)
+    except Exception:
+        if subscription is not None:
+            subscription.close()
+        stream_slots.release()
+        raise
+
+    stream = stream_status_events(
+        snapshot,
+        subscription,
+        heartbeat_seconds=Config.EEG_STATUS_STREAM_HEARTBEAT_SECONDS,
+        max_seconds=Config.EEG_STATUS_STREAM_MAX_SECONDS,
+    )
+    response = Response(stream, mimetype="text/event-stream")
+    # The server closes the response even if the stream never started
+    response.call_on_close(subscription.close)
+    response.call_on_close(stream_slots.release)
+    response.headers["Cache-Control"] = "no-cache"
+    # Keep nginx from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    details = {"eeg_id": str(eeg_id)}
+
+    return response, 200, details
+
+
 @eeg_records_bp.route("/eeg-records/<uuid:eeg_record_id>/visualizations", methods=["GET"])
 @limiter.limit("60 per minute")
 @jwt_required()
@@ -66,6 +66,20 @@ def list_all_predictions():
     return jsonify(predictions), 200, details
 
 
+@predictions_bp.route("/predictions/dedup-stats", methods=["GET"])
+@limiter.limit("100 per minute")
+@jwt_required()
+@audit(action="view", resource="prediction_dedup_stats")
+def get_dedup_stats():
+    """
+    ADMIN only: hit/miss counters of prediction reuse for identical uploads.
+    """
+    current_user = get_current_user()
+    stats = PredictionResultService.get_dedup_stats(current_user)
+
+    return jsonify(stats), 200, stats
+
+
 @predictions_bp.route("/predictions/<uuid:prediction_id>", methods=["GET"])
 @limiter.limit("100 per minute")
 @jwt_required()
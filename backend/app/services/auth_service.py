@@ -1,12 +1,14 @@
+import time
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
 from werkzeug.security import check_password_hash
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, get_jti
 from app.models.user import User
 from app.models.session import Session
 from app.extensions import db
 from app.exceptions import AuthenticationError
 from app.config import Config
+from app.utils.session_cache import CachedSession, refresh_buffer, session_cache
 
 SESSION_DURATION_MINUTES = Config.SESSION_DURATION_MINUTES
 
@@ -36,7 +38,8 @@ class AuthService:
 
         session = Session(
             user_id=user.id,
-            token=token,
+            token_hash=Session.hash_token(token),
+            jti=get_jti(token),
             start_date=now,
             expiration_date=expiration,
             is_active=True,
@@ -61,10 +64,125 @@ class AuthService:
 
     @staticmethod
     def logout(token: str) -> None:
-        session = Session.query.filter_by(token=token, is_active=True).first()
+        token_hash = Session.hash_token(token)
+        session = Session.query.filter_by(token_hash=token_hash, is_active=True).first()
         if session:
             session.is_active = False
             db.session.commit()
+        session_cache.invalidate(token_hash.hex())
+
+    @staticmethod
+    def check_session(token: str) -> bool:
+        """
+        validate_session followed by refresh_session, for the middleware.
+
+        While the token's session cache entry is fresh the answer comes from
+        memory and the extended expiration is buffered for the next bulk
+        flush. Otherwise the session is read from the database and the
+        expiration is written according to SESSION_REFRESH_MODE.
+        """
+        ttl = Config.SESSION_CACHE_TTL_SECONDS
+        now = datetime.now(timezone.utc)
+        token_hash = Session.hash_token(token)
+        key = token_hash.hex()
+        entry = session_cache.get(key) if ttl > 0 else None
+
+        if entry is not None and entry.is_fresh(ttl) and now <= entry.expiration:
+            entry.expiration = now + timedelta(minutes=SESSION_DURATION_MINUTES)
+            refresh_buffer.add(token_hash, entry.expiration)
+            AuthService.flush_session_refreshes()
+            return True
+
+        session = Session.query.filter_by(token_hash=token_hash, is_active=True).first()
+        if not session:
+            session_cache.discard(key)
+            return False
+
+        # Extensions made in memory since the last write also count
+        expiration = AuthService._current_expiration(session)
+        if entry is not None:
+            expiration = max(expiration, entry.expiration)
+
+        if now > expiration:
+            session.is_active = False
+            db.session.commit()
+            session_cache.discard(key)
+            return False
+
+        user_id = str(session.user_id)
+        expiration = AuthService._slide_expiration(session, now)
+
+        if ttl > 0:
+            session_cache.put(key, CachedSession(
+                user_id=user_id,
+                expiration=expiration,
+                loaded_at=time.monotonic(),
+            ))
+        AuthService.flush_session_refreshes()
+        return True
+
+    @staticmethod
+    def flush_session_refreshes(force: bool = False) -> int:
+        """
+        Write buffered session refreshes in a single UPDATE, at most once per
+        SESSION_REFRESH_FLUSH_SECONDS unless forced. Returns the number of
+        sessions whose expiration moved forward.
+        """
+        pending = refresh_buffer.drain(0.0 if force else Config.SESSION_REFRESH_FLUSH_SECONDS)
+        if not pending:
+            return 0
+
+        new_expiration = db.case(
+            {token_hash: expiration.replace(tzinfo=None) for token_hash, expiration in pending.items()},
+            value=Session.token_hash,
+        )
+        updated = (
+            Session.query
+            .filter(
+                Session.token_hash.in_(pending),
+                Session.is_active == True,
+                # Never move back an expiration written by another process
+                Session.expiration_date < new_expiration,
+            )
+            .update({"expiration_date": new_expiration}, synchronize_session=False)
+        )
+        db.session.commit()
+        return updated
+
+    @staticmethod
+    def _current_expiration(session: Session) -> datetime:
+        """
+        Expiration of a session loaded from the database, including a refresh
+        of this process still waiting in the buffer for the next flush.
+        """
+        expiration = session.expiration_date.replace(tzinfo=timezone.utc)
+        pending = refresh_buffer.get(session.token_hash)
+        if pending is not None:
+            expiration = max(expiration, pending)
+        return expiration
+
+    @staticmethod
+    def _slide_expiration(session: Session, now: datetime) -> datetime:
+        """
+        Extend a session loaded from the database by SESSION_DURATION_MINUTES.
+
+        In throttled mode the new expiration is only written here when the
+        stored one is within SESSION_REFRESH_THRESHOLD_SECONDS; otherwise it
+        waits in the refresh buffer.
+        """
+        expiration = now + timedelta(minutes=SESSION_DURATION_MINUTES)
+        remaining = session.expiration_date.replace(tzinfo=timezone.utc) - now
+
+        if (
+            Config.SESSION_REFRESH_MODE == "throttled"
+            and remaining.total_seconds() > Config.SESSION_REFRESH_THRESHOLD_SECONDS
+        ):
+            refresh_buffer.add(session.token_hash, expiration)
+        else:
+            refresh_buffer.discard(session.token_hash)
+            session.expiration_date = expiration
+            db.session.commit()
+        return expiration
 
     @staticmethod
     def validate_session(token: str) -> bool:
@@ -74,14 +192,16 @@ class AuthService:
         """
         now = datetime.now(timezone.utc)
 
-        session = Session.query.filter_by(token=token, is_active=True).first()
+        token_hash = Session.hash_token(token)
+        session = Session.query.filter_by(token_hash=token_hash, is_active=True).first()
 
         if not session:
             return False
 
-        if now > session.expiration_date.replace(tzinfo=timezone.utc):
+        if now > AuthService._current_expiration(session):
             session.is_active = False
             db.session.commit()
+            session_cache.discard(token_hash.hex())
             return False
 
         return True
@@ -93,7 +213,7 @@ class AuthService:
         implementing 30-minute inactivity behavior.
         """
         now = datetime.now(timezone.utc)
-        session = Session.query.filter_by(token=token, is_active=True).first()
+        session = Session.query.filter_by(token_hash=Session.hash_token(token), is_active=True).first()
         if session:
             session.expiration_date = now + timedelta(minutes=SESSION_DURATION_MINUTES)
             db.session.commit()
@@ -108,4 +228,5 @@ class AuthService:
             user_id=user_uuid,
             is_active=True
         ).update({"is_active": False})
-        db.session.commit()
\ No newline at end of file
+        db.session.commit()
+        session_cache.invalidate_user(str(user_uuid))
\ No newline at end of file
@@ -8,9 +8,18 @@ from app.models.user import User, UserRole
 from app.exceptions import NotFoundError, ValidationError, PermissionError
 from app.config import Config
 from app.domain.reader.eeg_reader_factory import EegReaderFactory
+from app.domain.storage.dense_eeg import (
+    DENSE_EXTENSION, dense_from_frame, header_path, write_dense, write_dense_from_chunks
+)
+from app.domain.storage.parquet_eeg import write_parquet
+from app.ml.eeg_config import CHANNELS, SAMPLING_RATE
+from app.utils.uploads import save_upload
 
 ALLOWED_EXTENSIONS = {'.parquet', '.csv', '.json', '.edf'} 
 
+# Uploads kept as received until the worker converts them
+UPLOAD_PREFIX = "upload_"
+
 class EegRecordService:
 
     @staticmethod
@@ -42,67 +51,42 @@ class EegRecordService:
                 f"File type '{ext}' not allowed. Supported formats: {supported}"
             )
 
-        # Validate file size (read a chunk to determine if it's empty or too large)
-        file.seek(0, 2)  # Go to end of file
-        file_size = file.tell()
-        file.seek(0)     # Go back to start
+        # Ensure upload directory exists
+        os.makedirs(Config.EEG_UPLOAD_FOLDER, exist_ok=True)
+
+        # Written in one pass that also enforces the size limit and hashes the
+        # content; streamed uploads are just moved into place
+        upload_path = os.path.join(Config.EEG_UPLOAD_FOLDER, f"{UPLOAD_PREFIX}{uuid.uuid4().hex}{ext}")
+        file_size, content_hash = save_upload(file, upload_path, Config.EEG_MAX_FILE_SIZE_BYTES)
 
         if file_size == 0:
+            EegRecordService._remove_quietly(upload_path)
             raise ValidationError("File is empty")
-        if file_size > Config.EEG_MAX_FILE_SIZE_BYTES:
-            raise ValidationError(
-                f"File exceeds maximum allowed size of "
-                f"{Config.EEG_MAX_FILE_SIZE_BYTES // (1024*1024)} MB"
-            )
 
-        # Save temporary file to process it
-        # Ensure upload directory exists
-        os.makedirs(Config.EEG_UPLOAD_FOLDER, exist_ok=True)
-        
-        temp_filename = f"temp_{uuid.uuid4().hex}{ext}"
-        temp_path = os.path.join(Config.EEG_UPLOAD_FOLDER, temp_filename)
-        
-        # Always save to temp file for processing
-        file.save(temp_path)
-        
-        try:
-            # Use factory to get appropriate reader
-            reader = EegReaderFactory.get_reader(temp_path)
-            
-            # Read and validate file - returns DataFrame with only required columns
-            df_processed = reader.read(temp_path)
-            
-            # Save processed file as parquet (optimized, columnar format)
-            unique_filename = f"{uuid.uuid4().hex}.parquet"
-            final_path = os.path.join(Config.EEG_UPLOAD_FOLDER, unique_filename)
-            df_processed.to_parquet(final_path, index=False)
-            
-            # Get the processed file size
-            final_file_size = os.path.getsize(final_path)
-            
-        except ValueError as e:
-            # Column validation error
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except Exception:
-                    pass
-            raise ValidationError(str(e))
-        except Exception as e:
-            # Any other error during file processing
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except Exception:
-                    pass
-            raise ValidationError(f"Error processing file: {str(e)}")
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except Exception:
-                    pass
+        if Config.EEG_ASYNC_CONVERSION:
+            # Keep the upload as received; the worker converts it (convert_eeg_record)
+            try:
+                # Only the header/schema is checked here, the full parse runs in the worker
+                EegReaderFactory.get_reader(upload_path).sniff(upload_path)
+            except ValueError as e:
+                EegRecordService._remove_quietly(upload_path)
+                raise ValidationError(str(e))
+            except Exception as e:
+                EegRecordService._remove_quietly(upload_path)
+                raise ValidationError(f"Error processing file: {str(e)}")
+            final_path, final_file_size = upload_path, file_size
+        else:
+            try:
+                final_path, final_file_size = EegRecordService._store(upload_path)
+            except ValueError as e:
+                # Column validation error
+                raise ValidationError(str(e))
+            except Exception as e:
+                # Any other error during file processing
+                raise ValidationError(f"Error processing file: {str(e)}")
+            finally:
+                # Clean up the upload, only the converted file is kept
+                EegRecordService._remove_quietly(upload_path)
 
         # All validations passed, create record
         # Determine file type from extension
@@ -115,12 +99,13 @@ class EegRecordService:
         file_type = ext_to_type.get(ext, FILE_TYPE.PARQUET)  # Default to PARQUET
         
         record = EegRecord(
-            patient_id=patient_id,
+            patient_id=patient_uuid,
             uploader_id=current_user.id,
             file_name=original_filename,   # original name to show to users
             file_path=final_path,          # internal route, never exposed to users
             file_type=file_type,           # Add file type
             file_size_bytes=final_file_size,  # Size of processed file
+            content_hash=content_hash,     # SHA-256 of the upload, cache key for later stages
             status=EegStatus.PENDING,
         )
 
@@ -129,6 +114,74 @@ class EegRecordService:
 
         return EegRecordService._to_dict(record)
 
+    @staticmethod
+    def is_pending_conversion(record: EegRecord) -> bool:
+        """Whether the record still points to the upload as received"""
+        return bool(record.file_path) and os.path.basename(record.file_path).startswith(UPLOAD_PREFIX)
+
+    @staticmethod
+    def convert_upload(record: EegRecord) -> None:
+        """
+        Parse an upload kept as received and store it in EEG_STORAGE_FORMAT.
+
+        First stage of the processing pipeline when EEG_ASYNC_CONVERSION is
+        on. The record is updated but not committed, and the upload is left
+        in place: the caller deletes it once the new path is committed.
+
+        Raises:
+            ValueError: If the file is not a valid EEG file
+        """
+        final_path, final_file_size = EegRecordService._store(record.file_path)
+        record.file_path = final_path
+        record.file_size_bytes = final_file_size
+
+    @staticmethod
+    def _store(source_path: str) -> tuple[str, int]:
+        """Read an uploaded file and write it in EEG_STORAGE_FORMAT; returns (path, size)"""
+        # Use factory to get appropriate reader
+        reader = EegReaderFactory.get_reader(source_path)
+
+        if Config.EEG_STORAGE_FORMAT == "dense":
+            # Dense (trials, channels, samples) array the worker memory-maps
+            unique_filename = f"{uuid.uuid4().hex}{DENSE_EXTENSION}"
+            final_path = os.path.join(Config.EEG_UPLOAD_FOLDER, unique_filename)
+            if reader.STREAMING:
+                # Written chunk by chunk, the file is never fully in memory
+                write_dense_from_chunks(
+                    lambda: reader.iter_chunks(source_path, Config.EEG_READ_CHUNK_ROWS),
+                    final_path,
+                    fs=SAMPLING_RATE,
+                )
+            else:
+                # Dense formats (EDF) are decoded for the model's channels only
+                dense = reader.read_dense(source_path, CHANNELS)
+                if dense is None:
+                    dense = dense_from_frame(reader.read(source_path), fs=SAMPLING_RATE)
+                elif dense.fs != SAMPLING_RATE:
+                    raise ValueError(
+                        f"Sampling rate is {dense.fs} Hz, expected {SAMPLING_RATE} Hz"
+                    )
+                write_dense(dense, final_path)
+            return final_path, os.path.getsize(final_path) + os.path.getsize(header_path(final_path))
+
+        # Read and validate file - returns DataFrame with only required columns
+        df_processed = reader.read(source_path)
+
+        # Save processed file as parquet (optimized, columnar format), sorted
+        # by (trial, channel, sample) so reads can skip row groups
+        unique_filename = f"{uuid.uuid4().hex}.parquet"
+        final_path = os.path.join(Config.EEG_UPLOAD_FOLDER, unique_filename)
+        write_parquet(df_processed, final_path, Config.EEG_PARQUET_ROW_GROUP_ROWS)
+        return final_path, os.path.getsize(final_path)
+
+    @staticmethod
+    def _remove_quietly(path: str) -> None:
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except Exception:
+                pass
+
     @staticmethod
     def list_eeg_records(filters: dict, current_user: User) -> list:
         query = EegRecord.query.filter_by(is_deleted=False)
@@ -202,6 +255,43 @@ class EegRecordService:
     
     @staticmethod
     def get_eeg_status(eeg_id: str, current_user: User) -> dict:
+        eeg = EegRecordService._get_status_record(eeg_id, current_user)
+
+        return {
+            "id": eeg.id,
+            "status": eeg.status.value,
+            "processing_time_ms": eeg.processing_time_ms,
+            "error_msg": eeg.error_msg if eeg.status == EegStatus.FAILED else None,
+        }
+
+    @staticmethod
+    def get_eeg_status_event(eeg_id: str, current_user: User) -> dict:
+        """Current status of a record as the first event of its status stream"""
+        eeg = EegRecordService._get_status_record(eeg_id, current_user)
+
+        visualization_status = None
+        if eeg.status == EegStatus.PROCESSED and eeg.prediction_result and eeg.prediction_result.visualization:
+            visualization_status = eeg.prediction_result.visualization.status
+
+        return EegRecordService.status_event(eeg, visualization_status)
+
+    @staticmethod
+    def status_event(eeg: EegRecord, visualization_status: str | None = None) -> dict:
+        """
+        Status of a record as published to its stream: the fields of
+        get_eeg_status plus the status of its visualizations (None until the
+        prediction exists).
+        """
+        return {
+            "id": str(eeg.id),
+            "status": eeg.status.value,
+            "processing_time_ms": eeg.processing_time_ms,
+            "error_msg": eeg.error_msg if eeg.status == EegStatus.FAILED else None,
+            "visualization_status": visualization_status,
+        }
+
+    @staticmethod
+    def _get_status_record(eeg_id: str, current_user: User) -> EegRecord:
         try:
             eeg_uuid = UUID(str(eeg_id))
         except Exception:
@@ -218,12 +308,7 @@ class EegRecordService:
         ):
             raise PermissionError("Not allowed to access this record")
 
-        return {
-            "id": eeg.id,
-            "status": eeg.status.value,
-            "processing_time_ms": eeg.processing_time_ms,
-            "error_msg": eeg.error_msg if eeg.status == EegStatus.FAILED else None,
-        }
+        return eeg
     
     @staticmethod
     def get_eeg_visualizations(eeg_record_id: str, types: str, channels: str | None, current_user: User) -> dict:
@@ -139,6 +139,37 @@ class PredictionResultService:
 
         return PredictionResultService._to_dict(prediction)
 
+    @staticmethod
+    def get_dedup_stats(current_user: User) -> dict:
+        """
+        ADMIN only: predictions reused from an identical upload (hits) versus
+        computed by running inference (misses), counted since reuse was enabled.
+        """
+        if current_user.role != UserRole.ADMIN:
+            raise PermissionError("Only ADMIN can view deduplication stats")
+
+        hits = (
+            db.session.query(db.func.count(PredictionResult.id))
+            .filter(PredictionResult.reused_from_id.isnot(None))
+            .scalar()
+        )
+        # Predictions made before preprocessing_hash existed could never be reused
+        misses = (
+            db.session.query(db.func.count(PredictionResult.id))
+            .filter(
+                PredictionResult.reused_from_id.is_(None),
+                PredictionResult.preprocessing_hash.isnot(None)
+            )
+            .scalar()
+        )
+        total = hits + misses
+
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
     @staticmethod
     def _to_dict(prediction: PredictionResult) -> dict:
         eeg: EegRecord = prediction.eeg_record
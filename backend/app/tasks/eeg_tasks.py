@@ -1,16 +1,223 @@
-import os
+import hashlib
+import json
 import time
 from app.extensions import db, celery
-from app.ml.inference import run_inference
+from app.ml.inference import run_inference, summarize_predictions
 from app.ml.model_loader import get_model_version
+from app.ml.backends import fused_attribution_enabled, get_backend
 from app.models.eeg_record import EegRecord, EegStatus
 from app.models.prediction_result import PredictionResult
-from app.ml.preprocessing import build_tensor_from_parquet
-from app.audit.audit import log_action
+from app.ml.preprocessing import FILTER_MODE_WINDOW, PREPROCESSING_VERSION
+from app.ml.tensor_cache import get_or_build_tensor, discard_cached_tensor
+from app.domain.storage.dense_eeg import remove_eeg_file
+from app.audit.audit import log_action, log_tech
 from app.models.user import User
 from app.models.prediction_visualization import PredictionVisualization
+from app.services.eeg_record_service import EegRecordService
+from app.utils.status_events import publish_status
 from app.config import Config
 
+
+def _preprocessing_params() -> dict:
+    """Parameters shared by inference and visualizations for the same record"""
+    return {
+        "win_size": 256,
+        "step_size": 256,
+        "use_bands": True,
+        "filter_mode": Config.EEG_FILTER_MODE,
+    }
+
+
+# Model versions already resolved by this worker, keyed by the settings they depend on
+_model_versions: dict[tuple, str] = {}
+
+
+def _prediction_model_version() -> str:
+    """
+    Model version plus any non-default preprocessing, so results stay traceable.
+    Resolved once per worker: looking up a reusable prediction must not load the model.
+    """
+    fused = fused_attribution_enabled()
+    key = (fused, Config.INFERENCE_BACKEND, Config.EEG_FILTER_MODE)
+    model_version = _model_versions.get(key)
+    if model_version is None:
+        # The fused path predicts with the Keras model, run_inference with the backend
+        model_version = get_model_version() if fused else get_backend().version
+        if Config.EEG_FILTER_MODE != FILTER_MODE_WINDOW:
+            model_version = f"{model_version}+filter={Config.EEG_FILTER_MODE}"
+        _model_versions[key] = model_version
+    return model_version
+
+
+def _preprocessing_hash() -> str:
+    """SHA-256 de la versión y los parámetros de preprocesamiento, se guarda con cada predicción"""
+    payload = json.dumps({"version": PREPROCESSING_VERSION, **_preprocessing_params()}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _publish_status(eeg_record: EegRecord, visualization_status: str | None = None) -> None:
+    """
+    Publica el estado ya guardado del registro para /status/stream.
+    Se llama después de cada commit; un fallo aquí nunca falla la tarea.
+    """
+    try:
+        publish_status(eeg_record.id, EegRecordService.status_event(eeg_record, visualization_status))
+    except Exception as e:
+        # El registro puede no recargarse (sesión rota): no se relee su id
+        log_tech.warning(f"Could not publish EEG record status: {e}")
+
+
+def _find_reusable_prediction(eeg_record: EegRecord) -> PredictionResult | None:
+    """
+    Predicción de otro registro con el mismo contenido, versión de modelo y
+    preprocesamiento, con sus visualizaciones ya completas.
+    El resultado depende solo del archivo, no del paciente ni de quién lo subió.
+    """
+    if not Config.EEG_DEDUP_PREDICTIONS or not eeg_record.content_hash:
+        return None
+
+    return (
+        PredictionResult.query
+        .join(PredictionResult.eeg_record)
+        .join(PredictionResult.visualization)
+        .filter(
+            EegRecord.content_hash == eeg_record.content_hash,
+            EegRecord.id != eeg_record.id,
+            # A deleted upload's results are never revived for someone else
+            EegRecord.is_deleted == False,
+            PredictionResult.is_deleted == False,
+            PredictionVisualization.is_deleted == False,
+            PredictionResult.model_version == _prediction_model_version(),
+            PredictionResult.preprocessing_hash == _preprocessing_hash(),
+            PredictionVisualization.status == "completed",
+        )
+        .order_by(PredictionResult.created_at.desc())
+        .first()
+    )
+
+
+def _reuse_prediction(eeg_record: EegRecord, start_time: float) -> bool:
+    """
+    Copia la predicción y las visualizaciones de una subida idéntica anterior
+    y deja el registro en PROCESSED sin correr inferencia.
+    Devuelve False si no hay nada que reutilizar (miss).
+    """
+    source = _find_reusable_prediction(eeg_record)
+    if source is None:
+        return False
+
+    prediction = PredictionResult(
+        eeg_record_id=eeg_record.id,
+        result=source.result,
+        confidence=source.confidence,
+        raw_probability=source.raw_probability,
+        model_version=source.model_version,
+        preprocessing_hash=source.preprocessing_hash,
+        # Siempre apunta a la predicción original, no a otra copia
+        reused_from_id=source.reused_from_id or source.id,
+    )
+    db.session.add(prediction)
+    db.session.flush()
+
+    source_viz = source.visualization
+    db.session.add(PredictionVisualization(
+        prediction_id=prediction.id,
+        status="completed",
+        waveforms_data=source_viz.waveforms_data,
+        topomap_data=source_viz.topomap_data,
+        channel_importance_data=source_viz.channel_importance_data,
+    ))
+
+    eeg_record.status = EegStatus.PROCESSED
+    eeg_record.processing_time_ms = int((time.time() - start_time) * 1000)
+    eeg_record.error_msg = None
+    db.session.commit()
+    _publish_status(eeg_record, "completed")
+
+    log_action(
+        action="infer",
+        resource="eeg_prediction",
+        details={
+            "eeg_record_id": str(eeg_record.id),
+            "patient_id": str(eeg_record.patient_id),
+            "uploader_id": str(eeg_record.uploader_id),
+            "model_version": prediction.model_version,
+            "result": prediction.result.value,
+            "confidence": float(prediction.confidence),
+            "reused_from": str(prediction.reused_from_id),
+            "processing_time_ms": eeg_record.processing_time_ms
+        },
+        status="success"
+    )
+
+    # Ninguna etapa posterior lee el archivo
+    if not Config.SAVE_EEG_FILES and eeg_record.file_path:
+        try:
+            remove_eeg_file(eeg_record.file_path)
+        except Exception as e:
+            log_tech.warning(f"Could not delete EEG file {eeg_record.file_path}: {e}")
+
+    return True
+
+
+@celery.task(bind=True, max_retries=3)
+def convert_eeg_record(self, eeg_record_id: int):
+    """
+    Primera etapa del pipeline: parsea la subida tal como llegó, la guarda en
+    EEG_STORAGE_FORMAT y encadena process_eeg_record.
+    Un archivo inválido deja el registro en FAILED sin reintentos.
+    Si el mismo archivo ya se procesó, se reutiliza su predicción sin convertirlo.
+    """
+    start_time = time.time()
+
+    eeg_record = db.session.get(EegRecord, eeg_record_id)
+    if not eeg_record:
+        return {"error": f"EegRecord {eeg_record_id} not found"}
+
+    if _reuse_prediction(eeg_record, start_time):
+        return {"eeg_record_id": eeg_record_id, "status": "reused"}
+
+    upload_path = eeg_record.file_path
+    try:
+        if EegRecordService.is_pending_conversion(eeg_record):
+            EegRecordService.convert_upload(eeg_record)
+            db.session.commit()
+            # La subida original solo se borra cuando la nueva ruta ya está guardada
+            remove_eeg_file(upload_path)
+
+    except Exception as e:
+        db.session.rollback()
+
+        eeg_record.status = EegStatus.FAILED
+        eeg_record.error_msg = str(e)[:500]
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+        _publish_status(eeg_record)
+
+        log_action(
+            action="convert",
+            resource="eeg_record",
+            details={
+                "eeg_record_id": eeg_record_id,
+                "patient_id": str(eeg_record.patient_id),
+                "uploader_id": str(eeg_record.uploader_id),
+                "error": str(e)[:200]
+            },
+            status="failed"
+        )
+
+        if isinstance(e, ValueError):
+            # Contenido inválido: reintentar no lo arregla
+            remove_eeg_file(upload_path)
+            return {"eeg_record_id": eeg_record_id, "status": "failed"}
+        raise self.retry(exc=e, countdown=30)
+
+    process_eeg_record.delay(eeg_record_id)
+    return {"eeg_record_id": eeg_record_id, "status": "converted"}
+
+
 @celery.task(bind=True, max_retries=3)
 def process_eeg_record(self, eeg_record_id: int):
     start_time = time.time()
@@ -23,38 +230,59 @@ def process_eeg_record(self, eeg_record_id: int):
     # Get the uploader (user context)
     uploader = db.session.get(User, eeg_record.uploader_id)
 
+    # Subida idéntica a una ya procesada (modo síncrono o reintento)
+    if _reuse_prediction(eeg_record, start_time):
+        return {"eeg_record_id": eeg_record_id, "status": "reused"}
+
     try:
         eeg_record.status = EegStatus.PROCESSING
         db.session.commit()
+        _publish_status(eeg_record)
 
-        X = build_tensor_from_parquet(
-            parquet_path=eeg_record.file_path,
-            win_size=256,
-            step_size=256,
-            use_bands=True
+        X = get_or_build_tensor(
+            eeg_record.file_path, content_hash=eeg_record.content_hash, **_preprocessing_params()
         )
 
         if X.size == 0:
             raise ValueError("No valid EEG samples generated from the provided file")
 
         # Run inference
-        label, raw_prob, confidence = run_inference(X)
+        importance = topomap = None
+        if fused_attribution_enabled():
+            from app.ml.visualization import (
+                predict_with_attribution,
+                channel_importance_from_attribution,
+                generate_topomap
+            )
+
+            # Predicción e importancia por canal en un solo paso del modelo
+            preds, attribution = predict_with_attribution(
+                X, batch_size=Config.EEG_ATTRIBUTION_BATCH_SIZE
+            )
+            label, raw_prob, confidence = summarize_predictions(preds)
+            importance = channel_importance_from_attribution(attribution)
+            topomap = generate_topomap(importance)
+        else:
+            label, raw_prob, confidence = run_inference(X)
 
         prediction = PredictionResult(
             eeg_record_id=eeg_record.id,
             result=label,
             confidence=confidence,
             raw_probability=raw_prob,       
-            model_version=get_model_version()
+            model_version=_prediction_model_version(),
+            preprocessing_hash=_preprocessing_hash()
         )
 
         db.session.add(prediction)
         db.session.flush()
         
-        # Crear registro en estado pending
+        # Crear registro en estado pending (waveforms quedan para la tarea de visualización)
         viz = PredictionVisualization(
             prediction_id=prediction.id,
-            status="pending"
+            status="pending",
+            channel_importance_data=importance,
+            topomap_data=topomap
         )
 
         db.session.add(viz)
@@ -64,6 +292,7 @@ def process_eeg_record(self, eeg_record_id: int):
         eeg_record.error_msg = None  # limpiar errores de intentos previos
 
         db.session.commit()
+        _publish_status(eeg_record, "pending")
 
         # Encadenar tarea de visualizaciones 
         generate_eeg_visualizations.delay(eeg_record_id, prediction.id)
@@ -76,7 +305,7 @@ def process_eeg_record(self, eeg_record_id: int):
                 "eeg_record_id": eeg_record_id,
                 "patient_id": str(eeg_record.patient_id),
                 "uploader_id": str(uploader.id),
-                "model_version": get_model_version(),
+                "model_version": _prediction_model_version(),
                 "result": label,
                 "confidence": float(confidence),
                 "processing_time_ms": eeg_record.processing_time_ms
@@ -96,6 +325,7 @@ def process_eeg_record(self, eeg_record_id: int):
             db.session.commit()
         except Exception:
             db.session.rollback()
+        _publish_status(eeg_record)
 
         # Log failed inference
         log_action(
@@ -105,7 +335,7 @@ def process_eeg_record(self, eeg_record_id: int):
                 "eeg_record_id": eeg_record_id,
                 "patient_id": str(eeg_record.patient_id),
                 "uploader_id": str(uploader.id),
-                "model_version": get_model_version(),
+                "model_version": _prediction_model_version(),
                 "error": str(e)[:200]
             },
             status="failed"
@@ -124,7 +354,6 @@ def generate_eeg_visualizations(self, eeg_record_id: int, prediction_id):
         generate_channel_importance,
         generate_topomap
     )
-    from app.ml.preprocessing import build_tensor_from_parquet
 
     eeg_record = db.session.get(EegRecord, eeg_record_id)
     if not eeg_record:
@@ -152,39 +381,42 @@ def generate_eeg_visualizations(self, eeg_record_id: int, prediction_id):
         viz.status = "processing"
 
     db.session.commit()
+    _publish_status(eeg_record, "processing")
 
     try:
-        # Waveforms — lee directo del parquet, sin re-tensorizar
+        # Waveforms — lee directo del archivo (memmap si es denso), sin re-tensorizar
         waveforms = generate_waveforms(
             parquet_path=eeg_record.file_path,
             trial_index=0,
             win_size=256
         )
 
-        # Re-tensorizar para calcular importancia
-        # (liviano: solo necesitamos los datos, no el modelo)
-        X = build_tensor_from_parquet(
-            parquet_path=eeg_record.file_path,
-            win_size=256,
-            step_size=256,
-            use_bands=True
-        )
+        # Con atribución fusionada la importancia ya se guardó junto a la predicción
+        if Config.EEG_CHANNEL_ATTRIBUTION and not viz.channel_importance_data:
+            # Tensor de process_eeg_record desde la caché (memmap), sin re-tensorizar
+            X = get_or_build_tensor(
+                eeg_record.file_path, content_hash=eeg_record.content_hash, **_preprocessing_params()
+            )
 
-        importance = generate_channel_importance(X)
-        topomap = generate_topomap(importance)
+            importance = generate_channel_importance(
+                X, batch_size=Config.EEG_ATTRIBUTION_BATCH_SIZE
+            )
+            viz.channel_importance_data = importance
+            viz.topomap_data = generate_topomap(importance)
 
         viz.waveforms_data = waveforms
-        viz.channel_importance_data = importance
-        viz.topomap_data = topomap
         viz.status = "completed"
         db.session.commit()
+        _publish_status(eeg_record, "completed")
 
         # Clean up EEG file if not configured to save (production behavior)
         # Only keep files in testing/development for validation purposes
         if not Config.SAVE_EEG_FILES and eeg_record.file_path:
             try:
-                if os.path.exists(eeg_record.file_path):
-                    os.remove(eeg_record.file_path)
+                discard_cached_tensor(
+                    eeg_record.file_path, content_hash=eeg_record.content_hash, **_preprocessing_params()
+                )
+                remove_eeg_file(eeg_record.file_path)
             except Exception as e:
                 # Log error but don't fail the task - data has already been processed
                 print(f"Warning: Could not delete EEG file {eeg_record.file_path}: {str(e)}")
@@ -195,4 +427,5 @@ def generate_eeg_visualizations(self, eeg_record_id: int, prediction_id):
         viz.status = "failed"
         viz.error_msg = str(exc)
         db.session.commit()
+        _publish_status(eeg_record, "failed")
         raise self.retry(exc=exc, countdown=30)
\ No newline at end of file
@@ -1,6 +1,8 @@
-from flask import request
+from uuid import UUID
+from flask import g, request
 from flask_jwt_extended import get_jwt, get_current_user as jwt_get_current_user
-from app.extensions import jwt
+from app.extensions import db, jwt
+from app.models.user import User
 from app.services.auth_service import AuthService
 
 
@@ -8,8 +10,38 @@ def get_current_user():
     return jwt_get_current_user()
 
 
+def load_request_user(identity) -> User | None:
+    """
+    User of a JWT identity, loaded at most once per request.
+
+    The JWT user loader (and so get_current_user()) goes through here, and
+    the id and email are copied to g for audit logging, which can then read
+    them without touching the ORM instance after a commit expired it.
+    """
+    identity = str(identity)
+    cached = g.get("_request_user")
+    if cached is not None and cached[0] == identity:
+        return cached[1]
+
+    try:
+        user_id = UUID(identity)
+    except ValueError:
+        user_id = identity
+    user = db.session.get(User, user_id)
+
+    g._request_user = (identity, user)
+    g.user_id = identity
+    if user:
+        g.user_email = user.email
+    return user
+
+
 def register_jwt_callbacks(app):
 
+    @jwt.user_lookup_loader
+    def user_lookup_callback(_jwt_header, jwt_data):
+        return load_request_user(jwt_data["sub"])
+
     @jwt.token_in_blocklist_loader
     def check_token_in_blocklist(jwt_header, jwt_data):
         """
@@ -20,13 +52,9 @@ def register_jwt_callbacks(app):
         if not token:
             return True
 
-        is_valid = AuthService.validate_session(token)
-
-        if is_valid:
-            # Refresh expiration on each active request (sliding window)
-            AuthService.refresh_session(token)
-
-        return not is_valid
+        # Validates and refreshes the expiration (sliding window), usually
+        # from the session cache without touching the database
+        return not AuthService.check_session(token)
 
     @jwt.revoked_token_loader
     def revoked_token_callback(jwt_header, jwt_data):
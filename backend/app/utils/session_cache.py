@@ -0,0 +1,175 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Redis pub/sub channel on which API processes announce dropped sessions
+INVALIDATION_CHANNEL = "neuroscreen:session-invalidations"
+
+
+@dataclass
+class CachedSession:
+    user_id: str
+    # Sliding expiration; ahead of the database until the entry is reloaded
+    expiration: datetime
+    # time.monotonic() of the database read the entry came from
+    loaded_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.monotonic() - self.loaded_at < ttl
+
+
+class SessionCache:
+    """
+    Process-wide cache of active sessions, keyed by the hex of
+    Session.hash_token, so raw tokens are never published.
+
+    Entries are trusted for Config.SESSION_CACHE_TTL_SECONDS after they are
+    read from the database. Dropping a session (logout, login elsewhere,
+    admin invalidation) removes it here and, when Config.REDIS_URL is set,
+    publishes the key so every other API process removes it too. Without
+    Redis, other processes may accept a dropped token until their entry
+    goes stale.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, CachedSession] = {}
+        self._lock = threading.Lock()
+        self._publisher = None
+        self._listener = None
+        # The listener thread does not survive a fork: started once per process
+        self._listener_pid = None
+
+    def get(self, key: str) -> CachedSession | None:
+        self._ensure_listener()
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, entry: CachedSession) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.user_id == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, key: str) -> None:
+        """Drop a session in this process and announce it to the others"""
+        self.discard(key)
+        self._publish(f"token:{key}")
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every session of a user in this process and announce it to the others"""
+        self.discard_user(user_id)
+        self._publish(f"user:{user_id}")
+
+    def _publish(self, message: str) -> None:
+        if not Config.REDIS_URL:
+            return
+        try:
+            if self._publisher is None:
+                import redis
+                self._publisher = redis.Redis.from_url(Config.REDIS_URL)
+            self._publisher.publish(INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            logger.warning(f"Could not publish session invalidation: {e}")
+
+    def _ensure_listener(self) -> None:
+        if not Config.REDIS_URL or self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            # Entries copied from the parent process may have missed invalidations
+            self._entries.clear()
+        try:
+            import redis
+            pubsub = redis.Redis.from_url(Config.REDIS_URL).pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_message})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=self._on_listener_error
+            )
+        except Exception as e:
+            logger.warning(f"Session invalidation listener not started, relying on the TTL: {e}")
+
+    def _on_message(self, message: dict) -> None:
+        data = message.get("data")
+        if isinstance(data, bytes):
+            data = data.decode()
+        kind, _, value = str(data).partition(":")
+        if kind == "token":
+            self.discard(value)
+        elif kind == "user":
+            self.discard_user(value)
+
+    def _on_listener_error(self, exc, pubsub, thread) -> None:
+        # Invalidations may have been missed while disconnected
+        logger.warning(f"Session invalidation listener error, clearing the cache: {exc}")
+        self.clear()
+        time.sleep(1.0)
+
+
+class RefreshBuffer:
+    """
+    Sliding expirations not yet written to the database, by Session.token_hash.
+
+    AuthService.flush_session_refreshes drains it into one bulk UPDATE every
+    Config.SESSION_REFRESH_FLUSH_SECONDS. Pending refreshes of a process that
+    exits are lost, which is why sessions close to expiring are written
+    right away instead of buffered.
+    """
+
+    def __init__(self):
+        self._pending: dict[bytes, datetime] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, token_hash: bytes, expiration: datetime) -> None:
+        with self._lock:
+            self._pending[token_hash] = expiration
+
+    def get(self, token_hash: bytes) -> datetime | None:
+        """Buffered expiration of a session, None if nothing is pending for it"""
+        with self._lock:
+            return self._pending.get(token_hash)
+
+    def discard(self, token_hash: bytes) -> None:
+        with self._lock:
+            self._pending.pop(token_hash, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+
+    def drain(self, interval: float = 0.0) -> dict[bytes, datetime]:
+        """Take every pending refresh if the last drain was at least `interval` seconds ago"""
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending or now - self._last_flush < interval:
+                return {}
+            pending, self._pending = self._pending, {}
+            self._last_flush = now
+            return pending
+
+
+session_cache = SessionCache()
+refresh_buffer = RefreshBuffer()
@@ -0,0 +1,213 @@
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Iterator
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Redis pub/sub channel of an EEG record, followed by its id
+STATUS_CHANNEL_PREFIX = "neuroscreen:eeg-status:"
+
+# Retry delay (ms) suggested to EventSource-style clients after a disconnect
+STREAM_RETRY_MS = 3000
+
+# Retry-After (s) of a stream refused because the worker is full
+STREAM_BUSY_RETRY_AFTER_SECONDS = 5
+
+
+def status_channel(eeg_record_id) -> str:
+    return f"{STATUS_CHANNEL_PREFIX}{eeg_record_id}"
+
+
+def is_final_event(event: dict) -> bool:
+    """Whether nothing follows this event: the record failed, or its visualizations finished"""
+    if event.get("status") == "failed":
+        return True
+    return event.get("status") == "processed" and event.get("visualization_status") in ("completed", "failed")
+
+
+def format_sse(event: dict) -> str:
+    """One Server-Sent Events message of type "status" with the event as JSON data"""
+    return f"event: status\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class MemorySubscription:
+    def __init__(self, broker: "MemoryStatusBroker", key: str):
+        self._broker = broker
+        self._key = key
+        self.queue: queue.Queue = queue.Queue()
+
+    def get(self, timeout: float) -> dict | None:
+        """Next event, or None if none arrives within `timeout` seconds"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self._key, self)
+
+
+class MemoryStatusBroker:
+    """
+    In-process stand-in for the Redis broker.
+
+    Events only reach subscribers of the same process, so it covers tests and
+    eager Celery (CELERY_TASK_ALWAYS_EAGER), not a separate worker.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[MemorySubscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, eeg_record_id, event: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscribers.get(str(eeg_record_id), ()))
+        for subscription in subscriptions:
+            subscription.queue.put(event)
+
+    def subscribe(self, eeg_record_id) -> MemorySubscription:
+        key = str(eeg_record_id)
+        subscription = MemorySubscription(self, key)
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def subscriber_count(self, eeg_record_id) -> int:
+        with self._lock:
+            return len(self._subscribers.get(str(eeg_record_id), ()))
+
+    def _unsubscribe(self, key: str, subscription: MemorySubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscribers.get(key)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[key]
+
+
+class RedisSubscription:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def get(self, timeout: float) -> dict | None:
+        """Next event, or None if none arrives within `timeout` seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            # Returns None early for the subscribe confirmation
+            message = self._pubsub.get_message(timeout=remaining)
+            if message is not None and message["type"] == "message":
+                return json.loads(message["data"])
+
+    def close(self) -> None:
+        try:
+            self._pubsub.close()
+        except Exception as e:
+            logger.warning(f"Could not close EEG status subscription: {e}")
+
+
+class RedisStatusBroker:
+    """
+    Status events over Redis pub/sub, one channel per EEG record.
+
+    Celery workers publish; each open stream holds one subscription
+    (a Redis connection) for as long as it lasts.
+    """
+
+    def __init__(self, url: str):
+        import redis
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, eeg_record_id, event: dict) -> None:
+        self._client.publish(status_channel(eeg_record_id), json.dumps(event, default=str))
+
+    def subscribe(self, eeg_record_id) -> RedisSubscription:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(status_channel(eeg_record_id))
+        return RedisSubscription(pubsub)
+
+
+class StreamSlots:
+    """Status streams open in this process, each holding a server thread"""
+
+    def __init__(self):
+        self._open = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._open
+
+    def acquire(self, limit: int) -> bool:
+        """Take a slot if fewer than `limit` are open"""
+        with self._lock:
+            if self._open >= limit:
+                return False
+            self._open += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._open = max(0, self._open - 1)
+
+
+stream_slots = StreamSlots()
+
+
+_broker = None
+_broker_url = None
+_broker_lock = threading.Lock()
+
+
+def get_status_broker():
+    """Redis broker when Config.REDIS_URL is set, the in-process one otherwise"""
+    global _broker, _broker_url
+    with _broker_lock:
+        if _broker is None or _broker_url != Config.REDIS_URL:
+            _broker = RedisStatusBroker(Config.REDIS_URL) if Config.REDIS_URL else MemoryStatusBroker()
+            _broker_url = Config.REDIS_URL
+        return _broker
+
+
+def publish_status(eeg_record_id, event: dict) -> None:
+    """Publish a status event; a broker failure never fails the caller (clients can still poll)"""
+    try:
+        get_status_broker().publish(eeg_record_id, event)
+    except Exception as e:
+        logger.warning(f"Could not publish EEG status of {eeg_record_id}: {e}")
+
+
+def stream_status_events(snapshot: dict, subscription, heartbeat_seconds: float, max_seconds: float) -> Iterator[str]:
+    """
+    Server-Sent Events of one EEG record: `snapshot` first, then every event of
+    `subscription` until a final one or `max_seconds`, with a comment every
+    `heartbeat_seconds` so proxies keep the connection open.
+
+    Takes the subscription opened before the snapshot was read, so no
+    transition in between is lost (at worst one is sent twice), and closes it
+    when done. A generator that never starts (client gone before the first
+    chunk) never reaches its `finally`, so callers must also close the
+    subscription when the response closes. Touches neither the database nor
+    the request context.
+    """
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n" + format_sse(snapshot)
+        if is_final_event(snapshot):
+            return
+
+        deadline = time.monotonic() + max_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            event = subscription.get(timeout=min(heartbeat_seconds, remaining))
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+            if is_final_event(event):
+                return
+    finally:
+        subscription.close()
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import uuid
+from typing import IO
+from flask import Request
+from werkzeug.datastructures import FileStorage
+from app.config import Config
+from app.exceptions import ValidationError
+
+# Bytes per read when an upload has to be copied instead of streamed
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Uploads being received, before they are claimed by the service
+PART_SUFFIX = ".part"
+
+
+def _too_large(max_bytes: int) -> ValidationError:
+    return ValidationError(f"File exceeds maximum allowed size of {max_bytes // (1024*1024)} MB")
+
+
+class HashingUpload:
+    """
+    Writable file an uploaded file is streamed into.
+
+    The multipart parser writes the body to it chunk by chunk: each chunk goes
+    to disk under EEG_UPLOAD_FOLDER, is counted against max_bytes and fed to a
+    SHA-256 digest, so size and content hash are known without a second pass.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.claimed = False
+        self._digest = hashlib.sha256()
+        self._file = open(path, "w+b")
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise _too_large(self.max_bytes)
+        self._digest.update(data)
+        return self._file.write(data)
+
+    @property
+    def content_hash(self) -> str:
+        return self._digest.hexdigest()
+
+    def claim(self, dest_path: str) -> None:
+        """Move the received file to dest_path; it is no longer removed with the request"""
+        self._file.close()
+        os.replace(self.path, dest_path)
+        self.path = dest_path
+        self.claimed = True
+
+    def discard(self) -> None:
+        self._file.close()
+        if not self.claimed:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __getattr__(self, name):
+        # read, readline, seek, tell, flush, close... of the underlying file
+        return getattr(self._file, name)
+
+
+class StreamingUploadRequest(Request):
+    """
+    Request whose uploaded files are streamed to disk as HashingUpload.
+
+    Replaces werkzeug's spooled temporary files, so an upload is written once,
+    straight into EEG_UPLOAD_FOLDER. Files the handler did not claim are
+    deleted when the request is closed.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None) -> IO[bytes]:
+        if content_length is not None and content_length > Config.EEG_MAX_FILE_SIZE_BYTES:
+            raise _too_large(Config.EEG_MAX_FILE_SIZE_BYTES)
+        os.makedirs(Config.EEG_UPLOAD_FOLDER, exist_ok=True)
+        path = os.path.join(Config.EEG_UPLOAD_FOLDER, f"{uuid.uuid4().hex}{PART_SUFFIX}")
+        upload = HashingUpload(path, Config.EEG_MAX_FILE_SIZE_BYTES)
+        self.__dict__.setdefault("_hashing_uploads", []).append(upload)
+        return upload
+
+    def close(self) -> None:
+        super().close()
+        for upload in self.__dict__.get("_hashing_uploads", []):
+            upload.discard()
+
+
+def save_upload(file: FileStorage, dest_path: str, max_bytes: int) -> tuple[int, str]:
+    """
+    Store an uploaded file at dest_path and return its (size, SHA-256).
+
+    Files streamed by StreamingUploadRequest are just moved; any other file
+    (e.g. a FileStorage built outside a request) is copied in chunks of
+    UPLOAD_CHUNK_BYTES, hashing and enforcing max_bytes in the same pass.
+
+    Raises:
+        ValidationError: If the file is larger than max_bytes
+    """
+    if isinstance(file.stream, HashingUpload):
+        file.stream.claim(dest_path)
+        return file.stream.size, file.stream.content_hash
+
+    digest = hashlib.sha256()
+    size = 0
+    file.stream.seek(0)
+    try:
+        with open(dest_path, "wb") as out:
+            for chunk in iter(lambda: file.stream.read(UPLOAD_CHUNK_BYTES), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+    except Exception:
+        os.remove(dest_path)
+        raise
+    return size, digest.hexdigest()
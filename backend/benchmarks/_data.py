@@ -0,0 +1,134 @@
+"""
+Datos sintéticos compartidos por benchmarks y tests: registros EEG en formato
+largo, archivos EDF+ mínimos y el constructor de tensores original como
+referencia.
+"""
+import numpy as np
+import pandas as pd
+from scipy.signal import butter, filtfilt
+
+from app.ml.eeg_config import CHANNELS
+from app.ml.preprocessing import normalize_signal
+
+
+def make_eeg_frame(n_trials=3, n_samples=700, seed=0, dtype=np.float32):
+    """Long-format EEG frame (one row per trial×channel×sample), shuffled."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for trial in range(n_trials):
+        # trials of different lengths so windows per trial differ
+        length = n_samples + 90 * trial
+        frames.append(pd.DataFrame({
+            "trial": np.full(len(CHANNELS) * length, trial * 10),
+            "channel": np.repeat(CHANNELS, length),
+            "sample": np.tile(np.arange(length), len(CHANNELS)),
+            "value": rng.standard_normal(len(CHANNELS) * length).astype(dtype),
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def write_edf(path, signals, fs=256, record_seconds=1, n_records=None, annotations=True):
+    """
+    Minimal EDF+ writer: signals is {label: physical samples}; each signal gets
+    its own physical range so scaling differs per channel.
+    """
+    labels = list(signals)
+    per_record = [int(fs * record_seconds)] * len(labels)
+    digital, ranges = [], []
+    for label in labels:
+        values = np.asarray(signals[label], dtype=np.float64)
+        # Ranges as written in the 8-character header fields
+        lo, hi = round(values.min() - 1, 2), round(values.max() + 1, 2)
+        ranges.append((lo, hi))
+        digital.append(np.round((values - lo) / (hi - lo) * 65535 - 32768).astype("<i2"))
+    if annotations:
+        labels.append("EDF Annotations")
+        per_record.append(30)
+        ranges.append((-1, 1))
+        digital.append(None)
+
+    n_data = len(next(iter(signals.values()))) // per_record[0]
+    ns = len(labels)
+
+    def field(value, width):
+        return str(value).ljust(width)[:width].encode("ascii")
+
+    header = b"".join([
+        field("0", 8), field("X X X X", 80), field("Startdate X X X X", 80),
+        field("01.01.26", 8), field("00.00.00", 8), field(256 * (ns + 1), 8),
+        field("EDF+C", 44), field(n_records if n_records is not None else n_data, 8),
+        field(record_seconds, 8), field(ns, 4),
+    ])
+    columns = [
+        [field(label, 16) for label in labels],
+        [field("AgAgCl electrode", 80)] * ns,
+        [field("uV", 8)] * ns,
+        [field(lo, 8) for lo, _ in ranges],
+        [field(hi, 8) for _, hi in ranges],
+        [field(-32768, 8)] * ns,
+        [field(32767, 8)] * ns,
+        [field("HP:0.1Hz", 80)] * ns,
+        [field(n, 8) for n in per_record],
+        [field("", 32)] * ns,
+    ]
+    header += b"".join(b"".join(column) for column in columns)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        for r in range(n_data):
+            for d, n in zip(digital, per_record):
+                block = np.zeros(n, "<i2") if d is None else d[r * n:(r + 1) * n]
+                f.write(block.tobytes())
+
+    # Physical values exactly as stored (after quantization)
+    return {
+        label: (digital[i].astype(np.float64) + 32768) * (hi - lo) / 65535 + lo
+        for i, (label, (lo, hi)) in enumerate(zip(labels, ranges))
+        if digital[i] is not None
+    }
+
+
+def legacy_process_channel(signal, use_bands, channel_idx, sample):
+    """Per-channel (b, a) filtfilt + normalization of the original pipeline."""
+    if not use_bands:
+        sample[channel_idx, :, 0] = normalize_signal(signal)
+        return channel_idx + 1
+
+    sample[channel_idx, :, 0] = normalize_signal(signal)
+    for low, high in [(0.5, 4), (4, 8), (8, 13), (13, 30), (30, 50)]:
+        channel_idx += 1
+        b, a = butter(4, [max(low / 128, 0.01), min(high / 128, 0.99)], btype="band")
+        sample[channel_idx, :, 0] = normalize_signal(filtfilt(b, a, signal))
+    return channel_idx + 1
+
+
+def legacy_build_tensor(df, win_size=256, step_size=256, use_bands=True):
+    """Per-window DataFrame filtering builder, kept as the reference output."""
+    X_data = []
+    for trial_id in df["trial"].unique():
+        trial_data = df[df["trial"] == trial_id]
+        channel_lengths = {
+            ch: len(trial_data[trial_data["channel"] == ch])
+            for ch in CHANNELS
+            if not trial_data[trial_data["channel"] == ch].empty
+        }
+        if not channel_lengths:
+            continue
+        min_length = min(channel_lengths.values())
+        if min_length < win_size:
+            continue
+        n_windows = max(1, (min_length - win_size) // step_size + 1)
+        for w in range(n_windows):
+            start_idx = w * step_size
+            sample = np.zeros((len(CHANNELS) * 6, win_size, 1), dtype=np.float32)
+            channel_idx = 0
+            for ch in CHANNELS:
+                ch_data = trial_data[trial_data["channel"] == ch].sort_values("sample")
+                if ch_data.empty:
+                    channel_idx += 6 if use_bands else 1
+                    continue
+                signal = ch_data["value"].iloc[start_idx:start_idx + win_size].values
+                channel_idx = legacy_process_channel(signal, use_bands, channel_idx, sample)
+            X_data.append(sample)
+    return np.array(X_data, dtype=np.float32)
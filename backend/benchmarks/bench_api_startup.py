@@ -0,0 +1,72 @@
+"""
+Benchmark: tiempo de arranque y memoria de create_app() en el proceso de la API.
+
+Cada medición corre en un proceso nuevo: "api" es create_app() tal cual;
+"api+tf" importa TensorFlow/Keras antes, como ocurría cuando
+app.routes -> app.tasks.eeg_tasks -> model_loader lo importaba al cargar.
+Reporta el tiempo de import + create_app(), VmRSS al terminar y si
+tensorflow quedó en sys.modules.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_api_startup --repeat 3
+"""
+import argparse
+import multiprocessing
+import statistics
+
+
+def _vm_rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _measure(eager_tf: bool, queue) -> None:
+    import sys
+    import time
+
+    start = time.perf_counter()
+    if eager_tf:
+        import tensorflow  # noqa: F401
+        from tensorflow import keras  # noqa: F401
+
+    from app import create_app
+    from app.config import TestingConfig
+
+    class StartupConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+    create_app(StartupConfig)
+    elapsed = time.perf_counter() - start
+
+    queue.put((elapsed, _vm_rss_kb() / 1024, "tensorflow" in sys.modules))
+
+
+def run(eager_tf: bool):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(eager_tf, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'mode':>8} {'startup (s)':>12} {'VmRSS (MB)':>11} {'tensorflow':>11}")
+    for label, eager_tf in (("api", False), ("api+tf", True)):
+        runs = [run(eager_tf) for _ in range(args.repeat)]
+        elapsed = statistics.median(r[0] for r in runs)
+        rss_mb = statistics.median(r[1] for r in runs)
+        loaded = "loaded" if runs[0][2] else "not loaded"
+        print(f"{label:>8} {elapsed:>12.2f} {rss_mb:>11.1f} {loaded:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: pico de memoria de generate_channel_importance según la duración del registro.
+
+Compara el tape de todo el tensor de una vez (batch_size = N) con el streaming
+por mini-batches. Cada medición corre en un proceso nuevo y muestrea RssAnon
+(memoria anónima: tensores de TF y arrays de numpy; el input es un memmap).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_attribution_memory --windows 40 --factor 10
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+
+def _rss_anon_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _measure(x_path: str, batch_size: int, queue) -> None:
+    from benchmarks.models import use_benchmark_model
+    from app.ml.model_loader import get_model
+    from app.ml.visualization import generate_channel_importance
+
+    use_benchmark_model()
+    get_model()
+    X = np.load(x_path, mmap_mode="r")
+
+    # Calentar con un batch para no medir la carga del modelo
+    generate_channel_importance(X[:1], batch_size=1)
+    baseline = _rss_anon_kb()
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, _rss_anon_kb())
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    start = time.perf_counter()
+    generate_channel_importance(X, batch_size=batch_size or len(X))
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+
+    queue.put(((peak - baseline) / 1024, elapsed))
+
+
+def run(x_path: str, batch_size: int):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(x_path, batch_size, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--windows", type=int, default=40)
+    parser.add_argument("--factor", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'windows':>8} {'mode':>12} {'peak RssAnon (MB)':>18} {'time (s)':>9}")
+        for n in (args.windows, args.windows * args.factor):
+            x_path = os.path.join(tmp, f"X_{n}.npy")
+            X = np.lib.format.open_memmap(x_path, mode="w+", dtype=np.float32, shape=(n, 204, 256, 1))
+            for start in range(0, n, 64):
+                X[start:start + 64] = rng.standard_normal(X[start:start + 64].shape)
+            X.flush()
+            del X
+
+            for label, batch_size in (("whole", 0), ("streaming", args.batch_size)):
+                peak_mb, elapsed = run(x_path, batch_size)
+                print(f"{n:>8} {label:>12} {peak_mb:>18.1f} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
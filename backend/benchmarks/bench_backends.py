@@ -0,0 +1,68 @@
+"""
+Benchmark: paridad y latencia del backend TFLite frente al backend Keras.
+
+Exporta el modelo (real o el sustituto de benchmarks/models.py) a un .tflite
+temporal y, para cada tamaño de registro, compara las probabilidades de ambos
+backends y el tiempo por llamada después de calentarlos.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_backends --repeat 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.models import use_benchmark_model
+from app.ml.backends import KerasBackend, TFLiteBackend
+from app.ml.export_model import export_tflite
+from app.ml.model_loader import get_model
+
+
+def _per_call_ms(fn, X, repeat):
+    fn(X)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(X)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 3, 8, 17, 40, 100])
+    args = parser.parse_args()
+
+    use_benchmark_model()
+    model = get_model()
+    path = os.path.join(tempfile.gettempdir(), "neuroscreen_bench_eegnet.tflite")
+    with open(path, "wb") as f:
+        f.write(export_tflite(model))
+
+    keras_backend = KerasBackend()
+    start = time.perf_counter()
+    keras_backend.warm_up()
+    keras_warm_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    tflite_backend = TFLiteBackend(path)
+    tflite_backend.warm_up()
+    tflite_warm_ms = (time.perf_counter() - start) * 1000
+
+    print(f"warm-up: keras {keras_warm_ms:.0f} ms, tflite {tflite_warm_ms:.0f} ms (load + buckets)")
+
+    rng = np.random.default_rng(0)
+    print(f"{'windows':>8} {'keras ms':>9} {'tflite ms':>10} {'speedup':>8} {'max |diff|':>11}")
+    for n in args.sizes:
+        X = rng.standard_normal((n, 204, 256, 1)).astype(np.float32)
+        max_diff = np.max(np.abs(keras_backend.predict(X) - tflite_backend.predict(X)))
+        keras_ms = _per_call_ms(keras_backend.predict, X, args.repeat)
+        tflite_ms = _per_call_ms(tflite_backend.predict, X, args.repeat)
+        print(f"{n:>8} {keras_ms:>9.2f} {tflite_ms:>10.2f} "
+              f"{keras_ms / tflite_ms:>7.1f}x {max_diff:>11.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: pico de memoria al convertir un CSV subido al formato de almacenamiento.
+
+"eager" es el camino anterior: pd.read_csv de todas las columnas con dtypes por
+defecto, filtrar columnas y guardar en parquet. "streaming" lee solo las
+columnas requeridas con dtypes compactos en chunks y escribe el .npy denso de
+forma incremental. Cada modo corre en un proceso nuevo y reporta el pico de
+RSS (VmHWM) por encima del RSS previo a la conversión.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_csv_upload --trials 60 --samples 1024
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def _status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    return 0
+
+
+def write_csv(path: str, n_trials: int, n_samples: int, seed: int = 0) -> None:
+    """CSV con columnas extra, como los datasets de EEG originales."""
+    import pandas as pd
+    from app.ml.eeg_config import CHANNELS
+
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as f:
+        for trial in range(n_trials):
+            n = len(CHANNELS) * n_samples
+            df = pd.DataFrame({
+                "trial": trial,
+                "channel": np.repeat(CHANNELS, n_samples),
+                "sample": np.tile(np.arange(n_samples), len(CHANNELS)),
+                "value": rng.standard_normal(n).round(3),
+                "subject": "co2a0000364",
+                "matching condition": "S1 obj",
+                "name": "a",
+                "time": np.tile(np.arange(n_samples) / 256, len(CHANNELS)).round(5),
+            })
+            df.to_csv(f, index=False, header=trial == 0)
+
+
+def _measure(mode: str, csv_path: str, out_dir: str, chunk_rows: int, queue) -> None:
+    import pandas as pd
+    from app.domain.reader.csv_reader import CsvEegReader
+    from app.domain.storage.dense_eeg import write_dense_from_chunks
+
+    reader = CsvEegReader()
+    baseline = _status_kb("VmRSS")
+    start = time.perf_counter()
+
+    if mode == "eager":
+        df = pd.read_csv(csv_path)
+        df = reader._validate_and_filter_columns(df)
+        df.to_parquet(os.path.join(out_dir, "eager.parquet"), index=False)
+    else:
+        write_dense_from_chunks(
+            lambda: reader.iter_chunks(csv_path, chunk_rows),
+            os.path.join(out_dir, "streaming.npy"),
+            fs=256,
+        )
+
+    elapsed = time.perf_counter() - start
+    queue.put(((_status_kb("VmHWM") - baseline) / 1024, elapsed))
+
+
+def run(mode: str, csv_path: str, out_dir: str, chunk_rows: int):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(mode, csv_path, out_dir, chunk_rows, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=60)
+    parser.add_argument("--samples", type=int, default=1024)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "upload.csv")
+        write_csv(csv_path, args.trials, args.samples)
+        print(f"CSV: {os.path.getsize(csv_path) / 2**20:.0f} MB")
+
+        print(f"{'mode':>10} {'peak RSS over baseline (MB)':>28} {'time (s)':>9}")
+        for mode in ("eager", "streaming"):
+            peak_mb, elapsed = run(mode, csv_path, tmp, args.chunk_rows)
+            print(f"{mode:>10} {peak_mb:>28.1f} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: throughput de lectura de EDF.
+
+Genera un EDF de --minutes minutos con los 34 canales del modelo más
+--extra canales que no se usan, y compara:
+  full:     decodificar todas las señales del archivo (np.fromfile + escalado)
+  dense:    EdfEegReader.read_dense de los canales requeridos (memmap por bloques)
+  long:     EdfEegReader.read (formato largo, el camino genérico de los readers)
+  window:   EdfFile.read_signal de una ventana de 256 muestras por canal
+
+Uso (desde backend/):
+    python -m benchmarks.bench_edf_reader --minutes 30 --extra 30
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.domain.reader.edf_reader import EdfEegReader, EdfFile
+from app.ml.eeg_config import CHANNELS
+from benchmarks._data import write_edf
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _full_decode(path):
+    edf = EdfFile(path)
+    raw = np.fromfile(path, dtype="<i2", offset=edf.records.offset).reshape(edf.records.shape)
+    for signal in edf.signals:
+        digital = raw[:, signal.offset:signal.offset + signal.samples_per_record].reshape(-1)
+        digital * signal.gain + signal.physical_offset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=int, default=30)
+    parser.add_argument("--extra", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    n = args.minutes * 60 * 256
+    rng = np.random.default_rng(0)
+    signals = {f"EEG {ch}-REF": rng.standard_normal(n) * 50 for ch in CHANNELS}
+    signals.update({f"AUX{i}": rng.standard_normal(n) for i in range(args.extra)})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rec.edf")
+        write_edf(path, signals)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"EDF: {size_mb:.0f} MB, {len(signals)} signals, {args.minutes} min at 256 Hz")
+
+        reader = EdfEegReader()
+        edf = EdfFile(path)
+        indices = [edf.channels[ch] for ch in CHANNELS]
+        start = n // 2
+
+        timings = {
+            "full": _best_of(lambda: _full_decode(path), args.repeat),
+            "dense": _best_of(lambda: reader.read_dense(path, CHANNELS), args.repeat),
+            "long": _best_of(lambda: reader.read(path), 1),
+            "window": _best_of(
+                lambda: [edf.read_signal(i, start, start + 256) for i in indices], args.repeat
+            ),
+        }
+
+        print(f"{'mode':>8} {'time (ms)':>10} {'file MB/s':>10}")
+        for mode, seconds in timings.items():
+            print(f"{mode:>8} {seconds * 1000:>10.1f} {size_mb / seconds:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: throughput y latencia de inferencia por registro, con y sin micro-batching.
+
+Simula una ráfaga de uploads: --clients hilos (como un worker con
+--pool threads) envían --records registros cada uno, de 4 a 40 ventanas.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_inference_batching --clients 8 --records 6
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.models import use_benchmark_model
+from app.ml.batching import InferenceBatcher
+from app.ml.inference import summarize_predictions
+from app.ml.model_loader import get_model
+
+
+def _burst(infer, records_per_client):
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(records_per_client) + 1)
+
+    def client(records):
+        barrier.wait()
+        for X in records:
+            start = time.perf_counter()
+            infer(X)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(r,)) for r in records_per_client]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--records", type=int, default=6)
+    parser.add_argument("--max-batch", type=int, default=256)
+    args = parser.parse_args()
+
+    use_benchmark_model()
+    model = get_model()
+    model.predict(np.zeros((1, 204, 256, 1), dtype=np.float32), verbose=0)
+
+    rng = np.random.default_rng(0)
+    records = [
+        [rng.standard_normal((rng.integers(4, 41), 204, 256, 1)).astype(np.float32)
+         for _ in range(args.records)]
+        for _ in range(args.clients)
+    ]
+
+    def direct(X):
+        return summarize_predictions(model.predict(X, verbose=0))
+
+    print(f"{'mode':>22} {'records/s':>10} {'p50 ms':>9} {'p95 ms':>9}")
+    rps, p50, p95 = _burst(direct, records)
+    print(f"{'predict per record':>22} {rps:>10.2f} {p50:>9.1f} {p95:>9.1f}")
+
+    for wait_ms in (0, 5, 20, 50):
+        batcher = InferenceBatcher(
+            lambda X: model.predict(X, verbose=0),
+            max_batch_size=args.max_batch,
+            max_wait_ms=wait_ms,
+        )
+        rps, p50, p95 = _burst(batcher.infer, records)
+        print(f"{f'batched wait={wait_ms}ms':>22} {rps:>10.2f} {p50:>9.1f} {p95:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
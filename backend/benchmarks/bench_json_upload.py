@@ -0,0 +1,103 @@
+"""
+Benchmark: pico de memoria al convertir un JSON subido al formato de almacenamiento.
+
+"eager" es el camino anterior: json.load de todo el documento, pd.DataFrame y
+guardar en parquet. "streaming" decodifica los registros uno a uno en batches
+de --chunk-rows y escribe el .npy denso de forma incremental. Cada modo corre
+en un proceso nuevo y reporta el pico de RSS (VmHWM) por encima del RSS
+previo a la conversión.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_json_upload --trials 50 --samples 1024
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def _status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    return 0
+
+
+def write_json(path: str, n_trials: int, n_samples: int, seed: int = 0) -> None:
+    """Documento {"data": [...]} con un objeto por muestra, escrito por trial."""
+    from app.ml.eeg_config import CHANNELS
+
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as f:
+        f.write('{"subject": "co2a0000364", "data": [')
+        for trial in range(n_trials):
+            values = rng.standard_normal((len(CHANNELS), n_samples)).round(4)
+            for c, channel in enumerate(CHANNELS):
+                f.write(("," if trial or c else "") + ",".join(
+                    json.dumps({"trial": trial, "channel": channel, "sample": s,
+                                "value": float(values[c, s]), "name": "a"})
+                    for s in range(n_samples)
+                ))
+        f.write("]}")
+
+
+def _measure(mode: str, json_path: str, out_dir: str, chunk_rows: int, queue) -> None:
+    import pandas as pd
+    from app.domain.reader.json_reader import JsonEegReader
+    from app.domain.storage.dense_eeg import write_dense_from_chunks
+
+    reader = JsonEegReader()
+    baseline = _status_kb("VmRSS")
+    start = time.perf_counter()
+
+    if mode == "eager":
+        with open(json_path) as f:
+            data = json.load(f)["data"]
+        df = reader._validate_and_filter_columns(pd.DataFrame(data))
+        df.to_parquet(os.path.join(out_dir, "eager.parquet"), index=False)
+    else:
+        write_dense_from_chunks(
+            lambda: reader.iter_chunks(json_path, chunk_rows),
+            os.path.join(out_dir, "streaming.npy"),
+            fs=256,
+        )
+
+    elapsed = time.perf_counter() - start
+    queue.put(((_status_kb("VmHWM") - baseline) / 1024, elapsed))
+
+
+def run(mode: str, json_path: str, out_dir: str, chunk_rows: int):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(mode, json_path, out_dir, chunk_rows, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=1024)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "upload.json")
+        write_json(json_path, args.trials, args.samples)
+        print(f"JSON: {os.path.getsize(json_path) / 2**20:.0f} MB")
+
+        print(f"{'mode':>10} {'peak RSS over baseline (MB)':>28} {'time (s)':>9}")
+        for mode in ("eager", "streaming"):
+            peak_mb, elapsed = run(mode, json_path, tmp, args.chunk_rows)
+            print(f"{mode:>10} {peak_mb:>28.1f} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
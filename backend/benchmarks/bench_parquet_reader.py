@@ -0,0 +1,84 @@
+"""
+Benchmark: lectura de la ventana de waveforms desde el parquet almacenado.
+
+"full" es el camino anterior: pd.read_parquet del archivo completo y filtrar
+el trial y los canales en pandas. "pushdown" lista los trials leyendo solo
+esa columna y usa read_subset con proyección de columnas y filtros de
+trial/canal/muestras sobre el parquet escrito con write_parquet (ordenado por
+trial, canal, muestra, row groups acotados).
+También se reporta "pushdown-unsorted": los mismos filtros sobre el parquet
+sin ordenar, donde las estadísticas de los row groups no descartan nada.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_parquet_reader --trials 60 --samples 4096
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from app.domain.reader.parquet_reader import ParquetEegReader
+from app.domain.storage.parquet_eeg import write_parquet
+from app.ml.eeg_config import CHANNELS
+from benchmarks._data import make_eeg_frame
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _full(path, trial, win_size):
+    df = pd.read_parquet(path)
+    df = df[(df["trial"] == trial) & df["channel"].isin(CHANNELS)]
+    return df[df["sample"] < win_size]
+
+
+def _pushdown(path, trial, win_size):
+    reader = ParquetEegReader()
+    reader.trial_ids(path)
+    return reader.read_subset(
+        path, columns=["channel", "sample", "value"], trials=[trial],
+        channels=CHANNELS, samples=(0, win_size),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=60)
+    parser.add_argument("--samples", type=int, default=4096)
+    parser.add_argument("--win-size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = make_eeg_frame(n_trials=args.trials, n_samples=args.samples)
+    trial = int(df["trial"].min())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        unsorted_path = os.path.join(tmp, "unsorted.parquet")
+        sorted_path = os.path.join(tmp, "sorted.parquet")
+        df.to_parquet(unsorted_path, index=False)
+        write_parquet(df, sorted_path)
+        print(f"{len(df):,} rows, parquet {os.path.getsize(sorted_path) / 2**20:.0f} MB")
+
+        expected = len(_full(unsorted_path, trial, args.win_size))
+        assert len(_pushdown(sorted_path, trial, args.win_size)) == expected
+
+        runs = {
+            "full": lambda: _full(unsorted_path, trial, args.win_size),
+            "pushdown-unsorted": lambda: _pushdown(unsorted_path, trial, args.win_size),
+            "pushdown": lambda: _pushdown(sorted_path, trial, args.win_size),
+        }
+        print(f"{'mode':>18} {'time (ms)':>10}")
+        for mode, fn in runs.items():
+            print(f"{mode:>18} {_best_of(fn, args.repeat) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
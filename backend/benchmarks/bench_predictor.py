@@ -0,0 +1,51 @@
+"""
+Microbenchmark: model.predict(X, verbose=0) vs BucketedPredictor.predict(X).
+
+Mide el tiempo por llamada para distintos tamaños de batch (número de
+ventanas de un registro) después de calentar ambos caminos.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_predictor --repeat 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.models import use_benchmark_model
+from app.ml.inference import BucketedPredictor
+from app.ml.model_loader import get_model
+
+
+def _per_call_ms(fn, X, repeat):
+    fn(X)  # warm-up / tracing for this shape
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(X)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 3, 8, 17, 40, 100])
+    args = parser.parse_args()
+
+    use_benchmark_model()
+    model = get_model()
+    predictor = BucketedPredictor(model)
+    predictor.warm_up()
+
+    rng = np.random.default_rng(0)
+    print(f"{'windows':>8} {'model.predict ms':>17} {'predictor ms':>13} {'speedup':>8}")
+    for n in args.sizes:
+        X = rng.standard_normal((n, 204, 256, 1)).astype(np.float32)
+        keras_ms = _per_call_ms(lambda x: model.predict(x, verbose=0), X, args.repeat)
+        graph_ms = _per_call_ms(predictor.predict, X, args.repeat)
+        print(f"{n:>8} {keras_ms:>17.2f} {graph_ms:>13.2f} {keras_ms / graph_ms:>7.1f}x")
+
+    print(f"predictor traces: {predictor.tracing_count}")
+
+
+if __name__ == "__main__":
+    main()
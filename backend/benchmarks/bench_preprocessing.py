@@ -0,0 +1,78 @@
+"""
+Benchmark: tensor builder vs the per-window DataFrame filtering builder
+(per-channel, per-window filtfilt), and CPU time of the "window" and "trial"
+filter modes with and without overlapping windows.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_preprocessing --trials 10 --samples 2048
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.ml.preprocessing import FILTER_MODES, build_tensor_from_parquet
+from benchmarks._data import legacy_build_tensor, make_eeg_frame
+
+
+def _timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _cpu_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--samples", type=int, default=2048)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_eeg_frame(n_trials=args.trials, n_samples=args.samples)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.parquet")
+        df.to_parquet(path, index=False)
+
+        legacy_s, expected = _timed(lambda: legacy_build_tensor(df), 1)
+        pivot_s, result = _timed(lambda: build_tensor_from_parquet(path), args.repeat)
+
+        cpu = {
+            (mode, step): _cpu_time(
+                lambda: build_tensor_from_parquet(path, step_size=step, filter_mode=mode),
+                args.repeat,
+            )
+            for mode in FILTER_MODES
+            for step in (256, 128, 64)
+        }
+
+    print(f"rows={len(df)} channels=34 trials={args.trials} windows={len(result)}")
+    print(f"legacy (per-window filtering): {legacy_s * 1000:9.1f} ms")
+    print(f"pivot + batched filter bank:   {pivot_s * 1000:9.1f} ms")
+    print(f"speedup: {legacy_s / pivot_s:.1f}x  "
+          f"max_abs_diff={np.max(np.abs(result - expected)):.2e}")
+
+    print("\nCPU time by filter mode (win_size=256)")
+    for step in (256, 128, 64):
+        window_s, trial_s = cpu[("window", step)], cpu[("trial", step)]
+        print(f"step_size={step:3d}: window={window_s * 1000:8.1f} ms  "
+              f"trial={trial_s * 1000:8.1f} ms  ({window_s / trial_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
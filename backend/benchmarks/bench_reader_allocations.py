@@ -0,0 +1,96 @@
+"""
+Benchmark: memoria y tiempo de leer y pivotear un archivo largo a (trials, canales, muestras).
+
+"pandas" es el camino anterior de build_tensor_from_parquet: read_subset ->
+DataFrame -> pivot_trials. "arrow" es read_table -> pa.Table (canal
+dictionary-encoded) -> pivot_table_trials, sin DataFrame intermedio. Cada
+medición corre en un proceso nuevo y reporta el pico de RSS (VmHWM) sobre el
+RSS previo, el pico del pool de memoria de Arrow y el tiempo.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_reader_allocations --trials 40 --samples 2048
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+
+def _status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    return 0
+
+
+def write_files(out_dir: str, n_trials: int, n_samples: int) -> dict:
+    from benchmarks._data import make_eeg_frame
+
+    df = make_eeg_frame(n_trials=n_trials, n_samples=n_samples)
+    df["value"] = df["value"].round(4)
+    paths = {fmt: os.path.join(out_dir, f"eeg.{fmt}") for fmt in ("parquet", "csv", "json")}
+    df.to_parquet(paths["parquet"], index=False)
+    df.to_csv(paths["csv"], index=False)
+    with open(paths["json"], "w") as f:
+        json.dump(df.to_dict(orient="records"), f)
+    return paths
+
+
+def _measure(mode: str, path: str, queue) -> None:
+    import pyarrow as pa
+    from app.domain.reader.eeg_reader_factory import EegReaderFactory
+    from app.domain.storage.dense_eeg import pivot_table_trials, pivot_trials
+    from app.ml.eeg_config import CHANNELS
+
+    reader = EegReaderFactory.get_reader(path)
+    baseline = _status_kb("VmRSS")
+    start = time.perf_counter()
+
+    if mode == "pandas":
+        data, _ = pivot_trials(reader.read_subset(path, channels=CHANNELS), CHANNELS)
+    else:
+        data, _ = pivot_table_trials(reader.read_table(path, channels=CHANNELS), CHANNELS)
+
+    elapsed = time.perf_counter() - start
+    queue.put((
+        (_status_kb("VmHWM") - baseline) / 1024,
+        pa.default_memory_pool().max_memory() / 2**20,
+        elapsed,
+        data.nbytes / 2**20,
+    ))
+
+
+def run(mode: str, path: str):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(mode, path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=40)
+    parser.add_argument("--samples", type=int, default=2048)
+    parser.add_argument("--formats", nargs="+", default=["parquet", "csv", "json"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_files(tmp, args.trials, args.samples)
+
+        print(f"{'format':>8} {'mode':>7} {'peak RSS (MB)':>14} {'arrow pool (MB)':>16} "
+              f"{'time (s)':>9} {'output (MB)':>12}")
+        for fmt in args.formats:
+            for mode in ("pandas", "arrow"):
+                peak_mb, pool_mb, elapsed, out_mb = run(mode, paths[fmt])
+                print(f"{fmt:>8} {mode:>7} {peak_mb:>14.1f} {pool_mb:>16.1f} "
+                      f"{elapsed:>9.2f} {out_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
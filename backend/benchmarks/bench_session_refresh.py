@@ -0,0 +1,143 @@
+"""
+Benchmark: escrituras sobre la tabla sessions mientras varios clientes hacen
+polling de GET /api/eeg-records/<id>/status.
+
+"every-request" es el comportamiento anterior: cada request autenticada lee la
+sesión y escribe la nueva expiración (UPDATE + commit). "throttled" solo
+escribe cuando a la expiración guardada le quedan menos de
+SESSION_REFRESH_THRESHOLD_SECONDS; el resto se acumula y se escribe en un solo
+UPDATE por flush. "cached+throttled" además responde desde la caché de
+sesiones mientras la entrada es fresca.
+
+TTL y flush se acortan (--ttl, --flush) para ver varios ciclos en una corrida
+corta. Usa SQLite en un archivo temporal; no necesita Postgres ni Redis.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_session_refresh --clients 20 --duration 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+MODES = {
+    # modo: (SESSION_CACHE_TTL_SECONDS, SESSION_REFRESH_MODE)
+    "every-request": (0, "always"),
+    "throttled": (0, "throttled"),
+    "cached+throttled": (None, "throttled"),
+}
+
+
+def _setup(tmp: str, n_clients: int):
+    from werkzeug.security import generate_password_hash
+    from app import create_app
+    from app.config import Config, TestingConfig
+    from app.extensions import db
+    from app.models.eeg_record import EegRecord, EegStatus, FILE_TYPE
+    from app.models.patient import Patient
+    from app.models.user import User, UserRole
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+
+    Config.REDIS_URL = None
+    app = create_app(BenchConfig)
+    client = app.test_client()
+
+    pollers = []
+    with app.app_context():
+        db.create_all()
+        for i in range(n_clients):
+            user = User(
+                email=f"bench{i}@neuroscreen.com",
+                password_hash=generate_password_hash("Bench123", method="pbkdf2:sha256:1000"),
+                first_name="Bench",
+                last_name="User",
+                role=UserRole.USER,
+            )
+            db.session.add(user)
+            db.session.flush()
+            patient = Patient(identification_number=str(i), first_name="P", last_name="Q", created_by=user.id)
+            db.session.add(patient)
+            db.session.flush()
+            record = EegRecord(
+                patient_id=patient.id, uploader_id=user.id, file_name="rec.parquet",
+                file_type=FILE_TYPE.PARQUET, status=EegStatus.PROCESSING,
+            )
+            db.session.add(record)
+            db.session.commit()
+            pollers.append([f"bench{i}@neuroscreen.com", str(record.id)])
+        engine = db.engine
+
+    return app, client, engine, pollers
+
+
+def _login(client, pollers):
+    headers = []
+    for email, record_id in pollers:
+        token = client.post(
+            "/api/auth/login", json={"email": email, "password": "Bench123"}
+        ).get_json()["access_token"]
+        headers.append(({"Authorization": f"Bearer {token}"}, record_id))
+    return headers
+
+
+def run(mode: str, app, client, engine, pollers, duration: float, ttl: float, flush: float):
+    from sqlalchemy import event
+    from app.config import Config
+    from app.utils.session_cache import refresh_buffer, session_cache
+
+    mode_ttl, refresh_mode = MODES[mode]
+    Config.SESSION_CACHE_TTL_SECONDS = ttl if mode_ttl is None else mode_ttl
+    Config.SESSION_REFRESH_MODE = refresh_mode
+    Config.SESSION_REFRESH_FLUSH_SECONDS = flush
+    session_cache.clear()
+    refresh_buffer.clear()
+
+    # Sesiones nuevas: el login no cuenta como escritura del polling
+    clients = _login(client, pollers)
+    counts = {"SELECT": 0, "UPDATE": 0}
+
+    def on_execute(conn, cursor, statement, *args):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in counts and "sessions" in statement:
+            counts[verb] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    requests = 0
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() - start < duration:
+            for headers, record_id in clients:
+                response = client.get(f"/api/eeg-records/{record_id}/status", headers=headers)
+                assert response.status_code == 200, response.get_json()
+                requests += 1
+    finally:
+        elapsed = time.perf_counter() - start
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    return requests / elapsed, counts["UPDATE"] / elapsed, counts["SELECT"] / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--ttl", type=float, default=2, help="SESSION_CACHE_TTL_SECONDS de cached+throttled")
+    parser.add_argument("--flush", type=float, default=5, help="SESSION_REFRESH_FLUSH_SECONDS")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, client, engine, pollers = _setup(tmp, args.clients)
+        with app.app_context():
+            print(f"{'mode':>17} {'req/s':>8} {'UPDATE sessions/s':>18} {'SELECT sessions/s':>18}")
+            for mode in MODES:
+                rps, updates, selects = run(
+                    mode, app, client, engine, pollers, args.duration, args.ttl, args.flush
+                )
+                print(f"{mode:>17} {rps:>8.0f} {updates:>18.2f} {selects:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark: carga de N clientes esperando a que su EEG termine de procesarse.
+
+"polling" es el comportamiento del frontend: GET /api/eeg-records/<id>/status
+cada --interval segundos hasta ver processed o failed; cada cliente empieza
+desfasado dentro del intervalo, como subidas en distintos momentos. "sse"
+abre una sola request a /api/eeg-records/<id>/status/stream y recibe las
+transiciones que publica el pipeline, hasta que terminan las visualizaciones.
+
+Un hilo simula el pipeline sobre todos los registros a la vez: processing al
+segundo, processed a los --processing segundos y las visualizaciones 1 y 3 s
+después; guarda cada estado y lo publica igual que las tareas de Celery. Se
+miden requests, sentencias SQL de las requests (sin las del pipeline) y la
+demora entre el commit de processed y que cada cliente lo ve.
+
+Usa SQLite en un archivo temporal y el broker en memoria; no necesita
+Postgres ni Redis.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_status_stream --clients 50 --interval 5 --processing 20
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+
+from benchmarks.bench_session_refresh import _login, _setup
+
+
+def _pipeline(app, record_ids, processing: float, marks: dict, local):
+    """Transiciones de todos los registros; marks["processed"] = instante del commit"""
+    from app.extensions import db
+    from app.models.eeg_record import EegRecord, EegStatus
+    from app.services.eeg_record_service import EegRecordService
+    from app.utils.status_events import publish_status
+
+    local.pipeline = True
+    steps = [
+        (1.0, EegStatus.PROCESSING, None),
+        (processing, EegStatus.PROCESSED, "pending"),
+        (processing + 1.0, EegStatus.PROCESSED, "processing"),
+        (processing + 3.0, EegStatus.PROCESSED, "completed"),
+    ]
+    start = time.perf_counter()
+    with app.app_context():
+        for at, status, visualization_status in steps:
+            time.sleep(max(0.0, start + at - time.perf_counter()))
+            records = EegRecord.query.filter(EegRecord.id.in_(record_ids)).all()
+            for record in records:
+                record.status = status
+            db.session.commit()
+            if status == EegStatus.PROCESSED and visualization_status == "pending":
+                marks["processed"] = time.perf_counter()
+            for record in records:
+                publish_status(record.id, EegRecordService.status_event(record, visualization_status))
+        db.session.remove()
+
+
+def _poll(client, headers, record_id, interval: float, offset: float, result: dict):
+    """Como waitForProcessing del frontend, empezando `offset` segundos después"""
+    time.sleep(offset)
+    while True:
+        response = client.get(f"/api/eeg-records/{record_id}/status", headers=headers)
+        result["requests"] += 1
+        if response.get_json()["status"] in ("processed", "failed"):
+            result["seen"] = time.perf_counter()
+            return
+        time.sleep(interval)
+
+
+def _stream(client, headers, record_id, result: dict):
+    """Lee el stream completo; anota cuándo llega processed"""
+    response = client.get(f"/api/eeg-records/{record_id}/status/stream", headers=headers, buffered=False)
+    result["requests"] += 1
+    try:
+        for chunk in response.response:
+            for line in chunk.decode().splitlines():
+                if line.startswith("data: ") and result["seen"] is None:
+                    if json.loads(line[len("data: "):])["status"] == "processed":
+                        result["seen"] = time.perf_counter()
+    finally:
+        response.close()
+
+
+def run(mode: str, app, engine, clients, interval: float, processing: float):
+    from sqlalchemy import event
+    from app.extensions import db
+    from app.models.eeg_record import EegRecord, EegStatus
+
+    record_ids = [uuid.UUID(record_id) for _, record_id in clients]
+    with app.app_context():
+        EegRecord.query.update({EegRecord.status: EegStatus.PENDING})
+        db.session.commit()
+
+    local = threading.local()
+    statements = [0]
+    lock = threading.Lock()
+
+    def on_execute(conn, cursor, statement, *args):
+        if not getattr(local, "pipeline", False):
+            with lock:
+                statements[0] += 1
+
+    marks = {}
+    results = [{"requests": 0, "seen": None} for _ in clients]
+    event.listen(engine, "before_cursor_execute", on_execute)
+    pipeline = threading.Thread(target=_pipeline, args=(app, record_ids, processing, marks, local))
+    threads = []
+    for i, ((headers, record_id), result) in enumerate(zip(clients, results)):
+        client = app.test_client()
+        if mode == "polling":
+            # Clientes desfasados dentro del intervalo, como subidas en distintos momentos
+            offset = interval * i / len(clients)
+            target, args = _poll, (client, headers, record_id, interval, offset, result)
+        else:
+            target, args = _stream, (client, headers, record_id, result)
+        threads.append(threading.Thread(target=target, args=args))
+
+    try:
+        for t in threads:
+            t.start()
+        pipeline.start()
+        for t in threads + [pipeline]:
+            t.join()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    requests = sum(r["requests"] for r in results)
+    delays = [(r["seen"] - marks["processed"]) * 1000 for r in results if r["seen"] is not None]
+    return requests, statements[0], delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=5, help="segundos entre polls (frontend: 5)")
+    parser.add_argument("--processing", type=float, default=20, help="segundos hasta processed")
+    args = parser.parse_args()
+
+    from app.config import Config
+
+    # Un solo proceso atiende a todos los clientes: sin tope de streams por worker
+    Config.EEG_STATUS_STREAMS_PER_WORKER = args.clients
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, client, engine, pollers = _setup(tmp, args.clients)
+        with app.app_context():
+            clients = _login(client, pollers)
+
+        print(f"{'mode':>8} {'requests':>9} {'SQL':>6} {'SQL/client':>11} "
+              f"{'delay median (ms)':>18} {'delay max (ms)':>15}")
+        for mode in ("polling", "sse"):
+            requests, statements, delays = run(mode, app, engine, clients, args.interval, args.processing)
+            print(f"{mode:>8} {requests:>9} {statements:>6} {statements / args.clients:>11.1f} "
+                  f"{statistics.median(delays):>18.0f} {max(delays):>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
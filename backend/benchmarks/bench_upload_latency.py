@@ -0,0 +1,103 @@
+"""
+Benchmark: latencia de POST /api/eeg-records/upload.
+
+"sync" es el camino anterior: la request parsea el archivo completo y lo
+convierte al formato de almacenamiento antes de responder. "async" guarda la
+subida tal como llega, valida solo la cabecera y responde 202; la conversión
+queda encolada para el worker (convert_eeg_record). Celery usa un broker en
+memoria sin ejecutar las tareas, así que solo se mide la request.
+
+Usa SQLite en un archivo temporal; no necesita Postgres ni Redis.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_upload_latency --trials 20 --repeat 5
+"""
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_csv_upload import write_csv
+
+
+def _make_client(tmp: str):
+    from werkzeug.security import generate_password_hash
+    from app import create_app
+    from app.config import Config, TestingConfig
+    from app.extensions import db
+    from app.models.patient import Patient
+    from app.models.user import User, UserRole
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        CELERY_TASK_ALWAYS_EAGER = False
+
+    Config.EEG_UPLOAD_FOLDER = os.path.join(tmp, "uploads")
+    Config.EEG_MAX_FILE_SIZE_BYTES = 2**31
+    app = create_app(BenchConfig)
+
+    with app.app_context():
+        db.create_all()
+        user = User(
+            email="bench@neuroscreen.com",
+            password_hash=generate_password_hash("Bench123"),
+            first_name="Bench",
+            last_name="User",
+            role=UserRole.USER,
+        )
+        db.session.add(user)
+        db.session.commit()
+        patient = Patient(identification_number="1", first_name="P", last_name="Q", created_by=user.id)
+        db.session.add(patient)
+        db.session.commit()
+        patient_id = str(patient.id)
+
+    client = app.test_client()
+    token = client.post(
+        "/api/auth/login", json={"email": "bench@neuroscreen.com", "password": "Bench123"}
+    ).get_json()["access_token"]
+    return app, client, {"Authorization": f"Bearer {token}"}, patient_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.config import Config
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "upload.csv")
+        write_csv(csv_path, args.trials, args.samples)
+        with open(csv_path, "rb") as f:
+            payload = f.read()
+        print(f"CSV: {len(payload) / 2**20:.0f} MB")
+
+        app, client, headers, patient_id = _make_client(tmp)
+        # Sin ejecutar tareas: solo se publica el mensaje
+        app.celery.conf.task_always_eager = False
+        app.celery.conf.broker_url = "memory://"
+
+        print(f"{'mode':>6} {'median (ms)':>12} {'min (ms)':>9} {'status':>7}")
+        for mode, async_conversion in (("sync", False), ("async", True)):
+            Config.EEG_ASYNC_CONVERSION = async_conversion
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                response = client.post(
+                    "/api/eeg-records/upload",
+                    data={"patient_id": patient_id, "file": (io.BytesIO(payload), "upload.csv")},
+                    headers=headers,
+                    content_type="multipart/form-data",
+                )
+                timings.append(time.perf_counter() - start)
+            print(f"{mode:>6} {statistics.median(timings) * 1000:>12.0f} "
+                  f"{min(timings) * 1000:>9.0f} {response.status_code:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Modelo para benchmarks: usa el modelo real de dl_models/ si existe y, si no,
+un EEGNet de igual forma de entrada (N, 204, 256, 1) con pesos aleatorios.
+"""
+import os
+import tempfile
+
+from app.ml import model_loader
+
+
+def eegnet_like_model():
+    from tensorflow import keras
+
+    keras.utils.set_random_seed(42)
+    return keras.Sequential([
+        keras.Input(shape=(204, 256, 1)),
+        keras.layers.Conv2D(8, (1, 64), padding="same", use_bias=False),
+        keras.layers.BatchNormalization(),
+        keras.layers.DepthwiseConv2D((204, 1), depth_multiplier=2, use_bias=False),
+        keras.layers.BatchNormalization(),
+        keras.layers.Activation("elu"),
+        keras.layers.AveragePooling2D((1, 4)),
+        keras.layers.SeparableConv2D(16, (1, 16), padding="same", use_bias=False),
+        keras.layers.BatchNormalization(),
+        keras.layers.Activation("elu"),
+        keras.layers.AveragePooling2D((1, 8)),
+        keras.layers.Flatten(),
+        keras.layers.Dense(1, activation="sigmoid"),
+    ])
+
+
+def use_benchmark_model() -> str:
+    """Point model_loader at a usable model and return its path."""
+    if os.path.exists(model_loader.MODEL_PATH):
+        return model_loader.MODEL_PATH
+
+    path = os.path.join(tempfile.gettempdir(), "neuroscreen_bench_eegnet.keras")
+    if not os.path.exists(path):
+        eegnet_like_model().save(path)
+    model_loader.MODEL_PATH = path
+    return path
@@ -0,0 +1,127 @@
+"""Key sessions by SHA-256 of the token and jti instead of the token
+
+Revision ID: d4b9a7e31c52
+Revises: c81f4d09e2a6
+Create Date: 2026-10-18 14:21:37.902114
+
+"""
+import base64
+import hashlib
+import json
+import uuid
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b9a7e31c52'
+down_revision = 'c81f4d09e2a6'
+branch_labels = None
+depends_on = None
+
+sessions = sa.table(
+    'sessions',
+    sa.column('id', sa.UUID()),
+    sa.column('token', sa.String(length=500)),
+    sa.column('token_hash', sa.LargeBinary(length=32)),
+    sa.column('jti', sa.String(length=36)),
+    sa.column('is_active', sa.Boolean()),
+)
+
+
+# Rows read and written per round trip during the backfill
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _jti(token: str) -> str | None:
+    """jti claim of a JWT, read without verifying it; None if the token is malformed"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        jti = json.loads(base64.urlsafe_b64decode(payload))['jti']
+    except Exception:
+        return None
+    return jti if isinstance(jti, str) and 0 < len(jti) <= 36 else None
+
+
+def _backfill(bind) -> None:
+    """
+    token_hash and jti of every session, in Python on every dialect so a
+    malformed token closes its session instead of aborting the upgrade.
+    Tokens without a jti cannot be told apart by it: their sessions are closed.
+    """
+    update = (
+        sessions.update()
+        .where(sessions.c.id == sa.bindparam('b_id'))
+        .values(
+            token_hash=sa.bindparam('b_token_hash'),
+            jti=sa.bindparam('b_jti'),
+            is_active=sa.bindparam('b_is_active'),
+        )
+    )
+    last_id = None
+    while True:
+        # Keyset pages by id: no cursor stays open while the page is written
+        query = sa.select(sessions.c.id, sessions.c.token, sessions.c.is_active).order_by(sessions.c.id)
+        if last_id is not None:
+            query = query.where(sessions.c.id > last_id)
+        rows = bind.execute(query.limit(BACKFILL_BATCH_SIZE)).all()
+        if not rows:
+            return
+
+        batch = []
+        for session_id, token, is_active in rows:
+            jti = _jti(token)
+            batch.append({
+                'b_id': session_id,
+                'b_token_hash': hashlib.sha256(token.encode()).digest(),
+                'b_jti': jti or str(uuid.uuid4()),
+                'b_is_active': is_active if jti else False,
+            })
+        bind.execute(update, batch)
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+        batch_op.add_column(sa.Column('jti', sa.String(length=36), nullable=True))
+
+    _backfill(op.get_bind())
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.alter_column('token_hash', existing_type=sa.LargeBinary(length=32), nullable=False)
+        batch_op.alter_column('jti', existing_type=sa.String(length=36), nullable=False)
+        batch_op.create_index(batch_op.f('ix_sessions_token_hash'), ['token_hash'], unique=True)
+        batch_op.create_index(batch_op.f('ix_sessions_jti'), ['jti'], unique=True)
+        batch_op.drop_index(batch_op.f('ix_sessions_token'))
+        batch_op.drop_column('token')
+
+
+def downgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token', sa.String(length=500), nullable=True))
+
+    # Tokens cannot be recovered from their hash: keep the rows, closed, with
+    # a placeholder that satisfies the unique constraint
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("UPDATE sessions SET token = encode(token_hash, 'hex'), is_active = false")
+        rows = []
+    else:
+        rows = bind.execute(sa.select(sessions.c.id, sessions.c.token_hash)).all()
+
+    for session_id, token_hash in rows:
+        bind.execute(
+            sessions.update()
+            .where(sessions.c.id == session_id)
+            .values(token=token_hash.hex(), is_active=False)
+        )
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.alter_column('token', existing_type=sa.String(length=500), nullable=False)
+        batch_op.create_index(batch_op.f('ix_sessions_token'), ['token'], unique=True)
+        batch_op.drop_index(batch_op.f('ix_sessions_jti'))
+        batch_op.drop_index(batch_op.f('ix_sessions_token_hash'))
+        batch_op.drop_column('jti')
+        batch_op.drop_column('token_hash')
@@ -14,6 +14,7 @@ from app.config import TestingConfig
 from app.extensions import db as _db
 from app.models.user import User, UserRole
 from app.models.patient import Patient
+from app.utils.session_cache import refresh_buffer, session_cache
 
 # integration with testcontainers for PostgreSQL
 from testcontainers.postgres import PostgresContainer
@@ -55,6 +56,9 @@ def db(app):
         yield _db
         _db.session.remove()
         _db.drop_all()
+        # Sessions cached in this process belong to the dropped tables
+        session_cache.clear()
+        refresh_buffer.clear()
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from app.domain.reader.csv_reader import CsvEegReader
+from app.domain.reader.json_reader import JsonEegReader
+from app.domain.reader.parquet_reader import ParquetEegReader
+from app.domain.storage.dense_eeg import pivot_table_trials, pivot_trials
+from app.ml.eeg_config import CHANNELS
+from app.ml.preprocessing import build_tensor_from_parquet
+from benchmarks._data import make_eeg_frame
+
+COLUMNS = ["channel", "sample", "trial", "value"]
+
+
+@pytest.fixture
+def frame():
+    df = make_eeg_frame(n_samples=300)
+    return df.assign(extra="x")[["trial", "extra", "channel", "sample", "value"]]
+
+
+@pytest.fixture
+def paths(tmp_path, frame):
+    paths = {
+        "parquet": str(tmp_path / "eeg.parquet"),
+        "csv": str(tmp_path / "eeg.csv"),
+        "json": str(tmp_path / "eeg.json"),
+    }
+    frame.to_parquet(paths["parquet"], index=False)
+    frame.to_csv(paths["csv"], index=False)
+    with open(paths["json"], "w") as f:
+        json.dump({"data": frame.to_dict(orient="records")}, f)
+    return paths
+
+
+READERS = {"parquet": ParquetEegReader, "csv": CsvEegReader, "json": JsonEegReader}
+
+
+class TestReadTable:
+
+    @pytest.mark.parametrize("fmt", READERS)
+    def test_matches_read(self, paths, fmt):
+        reader = READERS[fmt]()
+        table = reader.read_table(paths[fmt])
+
+        assert table.column_names == COLUMNS
+        assert pa.types.is_dictionary(table.schema.field("channel").type)
+        pd.testing.assert_frame_equal(
+            table.to_pandas().astype({"channel": str}),
+            reader.read(paths[fmt]).astype({"channel": str}),
+            check_dtype=False,
+        )
+
+    @pytest.mark.parametrize("fmt", READERS)
+    def test_channels_filter(self, paths, fmt):
+        table = READERS[fmt]().read_table(paths[fmt], channels=["F1", "O2"])
+
+        assert set(table.column("channel").to_pylist()) == {"F1", "O2"}
+        assert table.num_rows == 2 * 3 * 300 + 2 * 90 * 3
+
+    def test_missing_column_raises(self, tmp_path, frame):
+        path = str(tmp_path / "eeg.csv")
+        frame.drop(columns="sample").to_csv(path, index=False)
+
+        with pytest.raises(ValueError, match="Missing required columns: sample"):
+            CsvEegReader().read_table(path)
+
+
+class TestPivotTable:
+
+    @pytest.mark.parametrize("encoded", [True, False])
+    def test_matches_pivot_trials(self, frame, encoded):
+        channels = ["F1", "XX", *CHANNELS[5:10]]
+        # Several chunks; dictionary-encoded ones each have their own dictionary
+        bounds = np.linspace(0, len(frame), 4).astype(int)
+        parts = [frame[COLUMNS].iloc[start:stop] for start, stop in zip(bounds, bounds[1:])]
+        if encoded:
+            parts = [part.astype({"channel": "category"}) for part in parts]
+        table = pa.concat_tables(
+            [pa.Table.from_pandas(part, preserve_index=False) for part in parts],
+            promote_options="permissive",
+        )
+        assert len(table.column("channel").chunks) == 3
+
+        data, lengths = pivot_table_trials(table, channels)
+        expected_data, expected_lengths = pivot_trials(frame, channels)
+
+        np.testing.assert_array_equal(lengths, expected_lengths)
+        np.testing.assert_array_equal(data, expected_data)
+
+    @pytest.mark.parametrize("fmt", ["csv", "json"])
+    def test_tensor_matches_parquet(self, paths, fmt):
+        np.testing.assert_array_equal(
+            build_tensor_from_parquet(paths[fmt]), build_tensor_from_parquet(paths["parquet"])
+        )
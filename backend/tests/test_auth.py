@@ -1,4 +1,11 @@
 import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.config import Config
+from app.extensions import db as _db
+from app.models.session import Session
+from app.services.auth_service import AuthService
+from app.utils.session_cache import refresh_buffer
 
 
 class TestLogin:
@@ -61,6 +68,22 @@ class TestLogin:
         )
         assert response.status_code == 401
 
+    def test_session_stores_token_hash_and_jti(self, client, admin_user):
+        """La sesión se guarda por SHA-256 del token y jti, no con el token completo."""
+        from flask_jwt_extended import decode_token
+
+        r = client.post("/api/auth/login", json={
+            "email": "admin@neuroscreen.com",
+            "password": "Admin123"
+        })
+        token = r.get_json()["access_token"]
+
+        session = Session.query.filter_by(token_hash=Session.hash_token(token)).first()
+        assert session is not None
+        assert len(session.token_hash) == 32
+        assert session.jti == decode_token(token)["jti"]
+        assert not hasattr(session, "token")
+
 
 class TestLogout:
 
@@ -106,3 +129,160 @@ class TestMe:
             headers={"Authorization": "Bearer token_inventado"}
         )
         assert response.status_code == 401
+
+
+class TestSessionCache:
+
+    def _count_session_queries(self, client, headers, n_requests):
+        from sqlalchemy import event
+        statements = []
+
+        def on_execute(conn, cursor, statement, *args):
+            if "sessions" in statement:
+                statements.append(statement)
+
+        engine = _db.engine
+        event.listen(engine, "before_cursor_execute", on_execute)
+        try:
+            for _ in range(n_requests):
+                assert client.get("/api/auth/me", headers=headers).status_code == 200
+        finally:
+            event.remove(engine, "before_cursor_execute", on_execute)
+        return statements
+
+    def test_cached_session_skips_database(self, client, admin_headers):
+        # La primera request carga la sesión y la deja en caché
+        client.get("/api/auth/me", headers=admin_headers)
+
+        assert self._count_session_queries(client, admin_headers, 5) == []
+
+    def test_stale_entry_writes_expiration_back(self, client, admin_headers, monkeypatch):
+        monkeypatch.setattr(Config, "SESSION_CACHE_TTL_SECONDS", 1e-9)
+        monkeypatch.setattr(Config, "SESSION_REFRESH_MODE", "always")
+
+        statements = self._count_session_queries(client, admin_headers, 2)
+
+        assert sum(s.lstrip().upper().startswith("SELECT") for s in statements) == 2
+        assert sum(s.lstrip().upper().startswith("UPDATE") for s in statements) == 2
+
+    def test_throttled_refresh_skips_write_far_from_expiry(self, client, admin_headers, monkeypatch):
+        monkeypatch.setattr(Config, "SESSION_CACHE_TTL_SECONDS", 1e-9)
+        monkeypatch.setattr(Config, "SESSION_REFRESH_MODE", "throttled")
+
+        statements = self._count_session_queries(client, admin_headers, 3)
+
+        assert not any(s.lstrip().upper().startswith("UPDATE") for s in statements)
+        assert len(refresh_buffer) == 1
+
+    def test_throttled_refresh_writes_close_to_expiry(self, client, admin_headers, monkeypatch):
+        monkeypatch.setattr(Config, "SESSION_CACHE_TTL_SECONDS", 1e-9)
+        monkeypatch.setattr(Config, "SESSION_REFRESH_MODE", "throttled")
+        # Toda sesión recién creada ya está "cerca" de expirar
+        monkeypatch.setattr(Config, "SESSION_REFRESH_THRESHOLD_SECONDS", 24 * 3600)
+
+        statements = self._count_session_queries(client, admin_headers, 2)
+
+        assert sum(s.lstrip().upper().startswith("UPDATE") for s in statements) == 2
+        assert len(refresh_buffer) == 0
+
+    def test_flush_writes_buffered_refreshes_in_one_update(
+        self, client, admin_headers, user_headers, monkeypatch
+    ):
+        monkeypatch.setattr(Config, "SESSION_REFRESH_FLUSH_SECONDS", 3600)
+        for headers in (admin_headers, user_headers):
+            client.get("/api/auth/me", headers=headers)
+        before = {s.id: s.expiration_date for s in Session.query.all()}
+        assert len(refresh_buffer) == 2
+
+        from sqlalchemy import event
+        updates = []
+        listener = lambda conn, cur, statement, *args: updates.append(statement) \
+            if statement.lstrip().upper().startswith("UPDATE") else None
+        event.listen(_db.engine, "before_cursor_execute", listener)
+        try:
+            assert AuthService.flush_session_refreshes(force=True) == 2
+        finally:
+            event.remove(_db.engine, "before_cursor_execute", listener)
+
+        assert len(updates) == 1
+        _db.session.expire_all()
+        for session in Session.query.all():
+            assert session.expiration_date > before[session.id]
+
+    def test_buffered_refresh_keeps_session_valid(self, client, admin_headers, monkeypatch):
+        monkeypatch.setattr(Config, "SESSION_CACHE_TTL_SECONDS", 1e-9)
+        monkeypatch.setattr(Config, "SESSION_REFRESH_MODE", "throttled")
+        monkeypatch.setattr(Config, "SESSION_REFRESH_FLUSH_SECONDS", 3600)
+        assert client.get("/api/auth/me", headers=admin_headers).status_code == 200
+        assert len(refresh_buffer) == 1
+
+        # La expiración guardada ya pasó; la extendida sigue esperando el flush
+        session = Session.query.one()
+        session.expiration_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=1)
+        _db.session.commit()
+        token = admin_headers["Authorization"].removeprefix("Bearer ")
+
+        assert AuthService.validate_session(token)
+        assert client.get("/api/auth/me", headers=admin_headers).status_code == 200
+        _db.session.expire_all()
+        assert Session.query.one().is_active
+
+    def test_cached_token_rejected_after_logout(self, client, admin_user):
+        r = client.post("/api/auth/login", json={
+            "email": "admin@neuroscreen.com",
+            "password": "Admin123"
+        })
+        headers = {"Authorization": f"Bearer {r.get_json()['access_token']}"}
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+        client.post("/api/auth/logout", headers=headers)
+
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    def test_cached_token_rejected_after_admin_invalidation(
+        self, client, admin_headers, regular_user, user_headers
+    ):
+        assert client.get("/api/auth/me", headers=user_headers).status_code == 200
+
+        client.post(
+            f"/api/auth/users/{regular_user.id}/invalidate-session",
+            headers=admin_headers
+        )
+
+        assert client.get("/api/auth/me", headers=user_headers).status_code == 401
+
+
+class TestRequestIdentity:
+
+    def _user_selects(self, client, method, url, headers):
+        from sqlalchemy import event
+        selects = []
+
+        def on_execute(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+                selects.append(statement)
+
+        # Los fixtures dejan al usuario en el identity map de la sesión del test
+        _db.session.expunge_all()
+        event.listen(_db.engine, "before_cursor_execute", on_execute)
+        try:
+            response = getattr(client, method)(url, headers=headers)
+        finally:
+            event.remove(_db.engine, "before_cursor_execute", on_execute)
+        assert response.status_code == 200
+        return selects
+
+    @pytest.mark.parametrize("method, url", [
+        ("get", "/api/auth/me"),
+        ("get", "/api/patients"),
+        ("post", "/api/auth/refresh"),
+        ("post", "/api/auth/logout"),
+    ])
+    def test_one_user_select_per_request(self, client, user_headers, method, url):
+        assert len(self._user_selects(client, method, url, user_headers)) == 1
+
+    def test_audit_log_gets_email_of_request_user(self, client, user_headers, regular_user, caplog):
+        with caplog.at_level("INFO", logger="audit"):
+            client.get("/api/auth/me", headers=user_headers)
+
+        assert regular_user.email in caplog.text
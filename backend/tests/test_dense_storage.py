@@ -0,0 +1,294 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.reader import json_reader
+from app.domain.reader.csv_reader import CsvEegReader
+from app.domain.reader.json_reader import JsonEegReader
+from app.domain.reader.eeg_reader_factory import EegReaderFactory
+from app.domain.storage.dense_eeg import (
+    dense_from_frame,
+    header_path,
+    read_dense,
+    remove_eeg_file,
+    write_dense,
+    write_dense_from_chunks,
+)
+from app.ml.preprocessing import FILTER_MODE_TRIAL, build_tensor_from_parquet
+from benchmarks._data import make_eeg_frame
+
+
+@pytest.fixture
+def stored(tmp_path):
+    """The same upload stored as long-format parquet and as dense .npy + header."""
+    df = make_eeg_frame()
+    df = df[~((df["trial"] == 10) & (df["channel"] == "O1"))]
+
+    parquet_path = tmp_path / "eeg.parquet"
+    df.to_parquet(parquet_path, index=False)
+    dense_path = str(tmp_path / "eeg.npy")
+    write_dense(dense_from_frame(df, fs=256), dense_path)
+    return str(parquet_path), dense_path, df
+
+
+class TestDenseFormat:
+
+    def test_round_trip_is_memory_mapped(self, stored):
+        _, dense_path, df = stored
+        dense = read_dense(dense_path)
+
+        assert isinstance(dense.data, np.memmap)
+        assert dense.data.dtype == np.float32
+        assert dense.trials == df["trial"].unique().tolist()
+        assert dense.fs == 256
+
+        t, c = dense.trials.index(10), dense.channels.index("O1")
+        assert dense.lengths[t, c] == 0
+
+        c = dense.channels.index("F1")
+        expected = df[(df["trial"] == 20) & (df["channel"] == "F1")].sort_values("sample")
+        t = dense.trials.index(20)
+        n = dense.lengths[t, c]
+        np.testing.assert_array_equal(dense.data[t, c, :n], expected["value"].to_numpy())
+
+    def test_reader_returns_the_long_format(self, stored):
+        _, dense_path, df = stored
+        result = EegReaderFactory.get_reader(dense_path).read(dense_path)
+
+        key = ["trial", "channel", "sample"]
+        expected = df.sort_values(key).reset_index(drop=True)
+        result = result.sort_values(key).reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected[result.columns], check_dtype=False)
+
+    def test_remove_deletes_array_and_header(self, stored):
+        _, dense_path, _ = stored
+        remove_eeg_file(dense_path)
+
+        assert not os.path.exists(dense_path)
+        assert not os.path.exists(header_path(dense_path))
+
+
+class TestBuildTensorFromDense:
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"step_size": 128, "filter_mode": FILTER_MODE_TRIAL},
+        {"use_bands": False},
+    ])
+    def test_matches_parquet(self, stored, params):
+        parquet_path, dense_path, _ = stored
+        np.testing.assert_array_equal(
+            build_tensor_from_parquet(dense_path, **params),
+            build_tensor_from_parquet(parquet_path, **params),
+        )
+
+    def test_missing_channel_raises(self, tmp_path):
+        df = make_eeg_frame(n_trials=1)
+        path = str(tmp_path / "eeg.npy")
+        write_dense(dense_from_frame(df[df["channel"] != "T8"], fs=256), path)
+
+        with pytest.raises(ValueError, match="T8"):
+            build_tensor_from_parquet(path)
+
+
+class TestStreamingCsv:
+
+    @pytest.fixture
+    def csv_upload(self, tmp_path):
+        df = make_eeg_frame(n_trials=2, n_samples=300)
+        df["extra"] = "ignored"
+        path = tmp_path / "eeg.csv"
+        df.to_csv(path, index=False)
+        return str(path), df
+
+    @staticmethod
+    def assert_same_dense(result, expected):
+        assert result.channels == expected.channels
+        assert result.trials == expected.trials
+        np.testing.assert_array_equal(result.lengths, expected.lengths)
+        np.testing.assert_array_equal(result.data, expected.data)
+
+    def test_chunks_use_required_columns_and_compact_dtypes(self, csv_upload):
+        path, df = csv_upload
+        chunks = list(CsvEegReader().iter_chunks(path, chunk_rows=5000))
+
+        assert sum(map(len, chunks)) == len(df)
+        assert dict(chunks[0].dtypes.astype(str)) == {
+            "channel": "category", "sample": "int32", "trial": "int32", "value": "float32",
+        }
+
+    def test_chunked_write_matches_in_memory_pivot(self, csv_upload, tmp_path):
+        path, df = csv_upload
+        reader = CsvEegReader()
+        dense_path = str(tmp_path / "streamed.npy")
+
+        # Small chunks so (trial, channel) groups are split across chunks
+        write_dense_from_chunks(lambda: reader.iter_chunks(path, chunk_rows=997), dense_path, fs=256)
+
+        self.assert_same_dense(read_dense(dense_path), dense_from_frame(reader.read(path), fs=256))
+
+    def test_samples_with_gaps_fall_back_to_pivot(self, tmp_path):
+        df = make_eeg_frame(n_trials=1, n_samples=300)
+        df = df[df["sample"] % 7 != 3]
+        dense_path = str(tmp_path / "gaps.npy")
+
+        write_dense_from_chunks(lambda: [df.iloc[:4000], df.iloc[4000:]], dense_path, fs=256)
+
+        self.assert_same_dense(read_dense(dense_path), dense_from_frame(df, fs=256))
+
+    def test_repeated_samples_hiding_a_gap_fall_back_to_pivot(self, tmp_path):
+        df = make_eeg_frame(n_trials=1, n_samples=300)
+        # Cada sample 5 se reemplaza por un 4 repetido: mismo rango y cantidad, con un hueco
+        df.loc[df["sample"] == 5, "sample"] = 4
+        dense_path = str(tmp_path / "repeated.npy")
+
+        write_dense_from_chunks(lambda: [df.iloc[:4000], df.iloc[4000:]], dense_path, fs=256)
+
+        self.assert_same_dense(read_dense(dense_path), dense_from_frame(df, fs=256))
+
+    def test_sample_repeated_across_chunks_falls_back_to_pivot(self, tmp_path):
+        df = make_eeg_frame(n_trials=1, n_samples=300)
+        first = df[df["sample"] < 150]
+        # El último sample del primer chunk se repite en el segundo, y falta el 150
+        second = df[df["sample"] >= 150].copy()
+        second.loc[second["sample"] == 150, "sample"] = 149
+        dense_path = str(tmp_path / "across.npy")
+
+        write_dense_from_chunks(lambda: [first, second], dense_path, fs=256)
+
+        self.assert_same_dense(read_dense(dense_path), dense_from_frame(pd.concat([first, second]), fs=256))
+
+    def test_string_trial_ids_are_kept(self, tmp_path):
+        df = make_eeg_frame(n_trials=2, n_samples=300)
+        df["trial"] = df["trial"].map({0: "s1-a", 10: "s1-b"})
+        path = tmp_path / "eeg.csv"
+        df.to_csv(path, index=False)
+        reader = CsvEegReader()
+        dense_path = str(tmp_path / "streamed.npy")
+
+        write_dense_from_chunks(lambda: reader.iter_chunks(str(path), chunk_rows=997), dense_path, fs=256)
+
+        assert sorted(read_dense(dense_path).trials) == ["s1-a", "s1-b"]
+        assert set(reader.read(str(path))["trial"]) == {"s1-a", "s1-b"}
+
+    def test_non_integer_trial_ids_are_not_truncated(self, tmp_path):
+        df = make_eeg_frame(n_trials=2, n_samples=10)
+        df["trial"] = df["trial"] + 0.5
+        path = tmp_path / "eeg.csv"
+        df.to_csv(path, index=False)
+
+        assert set(CsvEegReader().read(str(path))["trial"]) == {0.5, 10.5}
+
+    def test_non_numeric_value_raises_validation_error(self, tmp_path):
+        df = make_eeg_frame(n_trials=1, n_samples=10).astype({"value": object})
+        df.loc[3, "value"] = "abc"
+        path = tmp_path / "eeg.csv"
+        df.to_csv(path, index=False)
+
+        with pytest.raises(ValueError, match="'sample' and 'value' must be numeric"):
+            next(CsvEegReader().iter_chunks(str(path), chunk_rows=100))
+
+    def test_missing_column_raises(self, tmp_path):
+        path = tmp_path / "eeg.csv"
+        make_eeg_frame(n_trials=1).drop(columns="sample").to_csv(path, index=False)
+
+        with pytest.raises(ValueError, match="sample"):
+            next(CsvEegReader().iter_chunks(str(path), chunk_rows=100))
+
+    def test_failed_write_leaves_no_temp_file(self, tmp_path):
+        # Ordenado por sample: rangos disjuntos entre chunks, sin recurrir al pivot
+        df = make_eeg_frame(n_trials=1, n_samples=300).sort_values("sample", kind="stable")
+        passes = []
+
+        def chunks():
+            passes.append(1)
+            yield df.iloc[:4000]
+            # La segunda pasada (escritura en el memmap) falla a mitad
+            if len(passes) == 2:
+                raise OSError("disco lleno")
+            yield df.iloc[4000:]
+
+        dense_path = tmp_path / "failed.npy"
+        with pytest.raises(OSError, match="disco lleno"):
+            write_dense_from_chunks(chunks, str(dense_path), fs=256)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_empty_file_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="no EEG samples"):
+            write_dense_from_chunks(lambda: [], str(tmp_path / "empty.npy"), fs=256)
+
+
+class TestStreamingJson:
+
+    @pytest.fixture(autouse=True)
+    def small_blocks(self, monkeypatch):
+        # Records and numbers get split across buffer refills
+        monkeypatch.setattr(json_reader, "READ_BLOCK_CHARS", 61)
+
+    @pytest.fixture
+    def records(self):
+        df = make_eeg_frame(n_trials=1, n_samples=40)
+        df["extra"] = [{"nested": [i, "]"]} for i in range(len(df))]
+        return df.to_dict(orient="records")
+
+    def write(self, tmp_path, document):
+        path = tmp_path / "eeg.json"
+        path.write_text(json.dumps(document, indent=1))
+        return str(path)
+
+    def assert_matches_records(self, chunks, records):
+        expected = pd.DataFrame(records)[sorted(JsonEegReader.REQUIRED_COLUMNS)]
+        result = pd.concat(chunks, ignore_index=True)
+        assert result["value"].dtype == np.float32
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+    def test_top_level_array_in_batches(self, tmp_path, records):
+        # Flat records: decoded a buffer at a time
+        records = [{k: v for k, v in r.items() if k != "extra"} for r in records]
+        path = self.write(tmp_path, records)
+        chunks = list(JsonEegReader().iter_chunks(path, chunk_rows=500))
+
+        assert [len(c) for c in chunks] == [500, 500, 360]
+        self.assert_matches_records(chunks, records)
+
+    def test_wrapped_array(self, tmp_path, records):
+        # Nested objects: decoded one record at a time
+        document = {"meta": {"fs": 256}, "empty": [], "ids": [1, 2], "data": records, "tail": 1}
+        path = self.write(tmp_path, document)
+
+        self.assert_matches_records(list(JsonEegReader().iter_chunks(path, chunk_rows=500)), records)
+
+    def test_object_of_columns_is_read_whole(self, tmp_path, records):
+        columns = pd.DataFrame(records).drop(columns="extra").to_dict(orient="list")
+        path = self.write(tmp_path, columns)
+
+        self.assert_matches_records(list(JsonEegReader().iter_chunks(path, chunk_rows=500)), records)
+
+    def test_string_trial_ids_are_kept(self, tmp_path, records):
+        records = [{**r, "trial": f"t{r['trial']}"} for r in records]
+        path = self.write(tmp_path, records)
+
+        frame = JsonEegReader().read(path)
+
+        assert frame["trial"].unique().tolist() == ["t0"]
+        assert frame["sample"].dtype == np.int32
+
+    def test_missing_key_raises(self, tmp_path, records):
+        del records[700]["value"]
+        path = self.write(tmp_path, records)
+
+        with pytest.raises(ValueError, match="value"):
+            list(JsonEegReader().iter_chunks(path, chunk_rows=500))
+
+
+def test_waveforms_match_parquet(stored):
+    pytest.importorskip("tensorflow")
+    from app.ml.visualization import generate_waveforms
+
+    parquet_path, dense_path, _ = stored
+    for trial_index in (0, 1):
+        assert generate_waveforms(dense_path, trial_index) == generate_waveforms(parquet_path, trial_index)
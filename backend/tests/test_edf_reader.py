@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from app.domain.reader.edf_reader import EdfEegReader, EdfFile
+from app.domain.reader.eeg_reader_factory import EegReaderFactory
+from app.ml.eeg_config import CHANNELS
+from app.ml.preprocessing import build_tensor_from_parquet
+from benchmarks._data import write_edf
+
+
+@pytest.fixture
+def edf_path(tmp_path):
+    rng = np.random.default_rng(0)
+    signals = {f"EEG {ch}-REF": rng.standard_normal(256 * 4) * 50 for ch in CHANNELS}
+    signals["EOG"] = rng.standard_normal(256 * 4)
+    path = tmp_path / "rec.edf"
+    stored = write_edf(path, signals)
+    return str(path), stored
+
+
+class TestEdfFile:
+
+    def test_header_and_channels(self, edf_path):
+        path, _ = edf_path
+        edf = EdfFile(path)
+
+        assert edf.n_records == 4
+        assert list(edf.channels) == [*CHANNELS, "EOG"]
+        assert edf.sampling_rate(0) == 256
+
+    def test_window_read_matches_full_signal(self, edf_path):
+        path, stored = edf_path
+        edf = EdfFile(path)
+        index = edf.channels["FC3"]
+
+        full = edf.read_signal(index)
+        np.testing.assert_allclose(full, stored["EEG FC3-REF"], rtol=1e-6, atol=1e-5)
+        np.testing.assert_array_equal(edf.read_signal(index, 300, 700), full[300:700])
+        assert len(edf.read_signal(index, 1000, 5000)) == 24
+
+    def test_truncated_file_raises(self, edf_path, tmp_path):
+        path, _ = edf_path
+        data = open(path, "rb").read()
+        truncated = tmp_path / "truncated.edf"
+        truncated.write_bytes(data[:-100])
+
+        with pytest.raises(ValueError, match="truncated"):
+            EdfFile(str(truncated))
+
+
+class TestEdfEegReader:
+
+    def test_read_dense_selects_requested_channels(self, edf_path):
+        path, stored = edf_path
+        dense = EdfEegReader().read_dense(path, ["O2", "F1", "XX"])
+
+        assert dense.channels == ["O2", "F1"]
+        assert dense.data.shape == (1, 2, 1024)
+        assert dense.fs == 256
+        np.testing.assert_allclose(dense.data[0, 1], stored["EEG F1-REF"], rtol=1e-6, atol=1e-5)
+
+    def test_no_requested_channel_raises_missing_channels(self, tmp_path):
+        path = tmp_path / "rec.edf"
+        write_edf(path, {"EOG": np.zeros(256), "ECG": np.zeros(256)})
+
+        with pytest.raises(ValueError, match="Missing required channels"):
+            EdfEegReader().read_dense(str(path), ["F1", "O2"])
+
+    def test_read_returns_long_format(self, edf_path):
+        path, _ = edf_path
+        df = EegReaderFactory.get_reader(path).read(path)
+
+        assert len(df) == 1024 * (len(CHANNELS) + 1)
+        assert set(df["trial"]) == {0}
+
+    def test_tensor_matches_long_format_input(self, edf_path, tmp_path):
+        path, _ = edf_path
+        parquet_path = tmp_path / "rec.parquet"
+        EdfEegReader().read(path).to_parquet(parquet_path, index=False)
+
+        np.testing.assert_array_equal(
+            build_tensor_from_parquet(path), build_tensor_from_parquet(str(parquet_path))
+        )
+
+    def test_other_sampling_rate_raises(self, tmp_path):
+        rng = np.random.default_rng(1)
+        path = tmp_path / "rec.edf"
+        write_edf(path, {ch: rng.standard_normal(512) for ch in CHANNELS}, fs=128)
+
+        with pytest.raises(ValueError, match="128"):
+            build_tensor_from_parquet(str(path))
+
+    def test_waveform_window_reads_only_the_window(self, edf_path, monkeypatch):
+        from app.ml.visualization import _first_window_signals
+
+        path, _ = edf_path
+        dense = EdfEegReader().read_dense(path, CHANNELS)
+        # La ventana no debe decodificar los canales completos
+        monkeypatch.setattr(EdfEegReader, "read_dense", lambda *args: pytest.fail("read_dense"))
+
+        window = dict(_first_window_signals(path, trial_index=3, win_size=256))
+
+        assert list(window) == CHANNELS
+        for c, ch in enumerate(dense.channels):
+            np.testing.assert_array_equal(window[ch], dense.data[0, c, :256])
@@ -1,6 +1,13 @@
 import pytest
 import io
+import json
 import uuid
+import numpy as np
+from app.config import Config
+from app.ml import visualization
+from app.models.prediction_result import AlcoholismRisk
+from app.tasks import eeg_tasks
+from app.utils.status_events import get_status_broker, stream_slots
 
 
 def upload_eeg(client, headers, patient_id, parquet_file):
@@ -73,6 +80,31 @@ class TestUploadEeg:
         )
         assert response.status_code == 400
 
+    def test_upload_invalid_content_fails_in_conversion(self, client, user_headers, sample_patient):
+        """
+        La cabecera es válida, así que el upload se acepta (202); el error del
+        contenido aparece al convertir en el worker y deja el registro en failed.
+        """
+        bad_json = io.BytesIO(
+            b'[{"channel": "F1", "trial": 0, "sample": 0, "value": 1.0},'
+            b' {"channel": "F1", "trial": 0, "sample": 1}]'
+        )
+        r = client.post(
+            "/api/eeg-records/upload",
+            data={
+                "patient_id": str(sample_patient.id),
+                "file": (bad_json, "datos.json", "application/json")
+            },
+            headers=user_headers,
+            content_type="multipart/form-data"
+        )
+        assert r.status_code == 202
+
+        status_r = client.get(f"/api/eeg-records/{r.get_json()['id']}/status", headers=user_headers)
+        data = status_r.get_json()
+        assert data["status"] == "failed"
+        assert "value" in data["error_msg"]
+
     def test_upload_empty_file(self, client, user_headers, sample_patient):
         empty = io.BytesIO(b"")
         response = client.post(
@@ -204,6 +236,157 @@ class TestEegStatus:
         assert response.status_code == 403
 
 
+def stream_events(response):
+    """Datos de los mensajes "status" de una respuesta SSE"""
+    return [
+        json.loads(line[len("data: "):])
+        for line in response.get_data(as_text=True).splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+class TestEegStatusStream:
+
+    @pytest.fixture(autouse=True)
+    def memory_broker(self, monkeypatch):
+        # Sin Redis los eventos van por el broker en memoria (tareas eager, mismo proceso)
+        monkeypatch.setattr(Config, "REDIS_URL", None)
+        return get_status_broker()
+
+    def test_stream_of_finished_record_sends_snapshot_and_closes(
+        self, client, user_headers, sample_patient, parquet_file, memory_broker
+    ):
+        r = upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+        eeg_id = r.get_json()["id"]
+
+        response = client.get(f"/api/eeg-records/{eeg_id}/status/stream", headers=user_headers)
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        assert response.headers["Cache-Control"] == "no-cache"
+        events = stream_events(response)
+        response.close()
+        assert len(events) == 1
+        assert events[0]["id"] == eeg_id
+        assert events[0]["status"] in ("processed", "failed")
+        assert memory_broker.subscriber_count(eeg_id) == 0
+        assert len(stream_slots) == 0
+
+    @pytest.fixture
+    def fake_model(self, monkeypatch):
+        """
+        Pipeline sin modelo ni preprocesamiento real (no hay dl_models en los
+        tests y el parquet sintético no trae todos los canales): cada etapa
+        termina y publica su estado.
+        """
+        monkeypatch.setattr(Config, "INFERENCE_BACKEND", "keras")
+        monkeypatch.setattr(Config, "EEG_FUSED_ATTRIBUTION", True)
+        monkeypatch.setattr(Config, "EEG_CHANNEL_ATTRIBUTION", True)
+        monkeypatch.setattr(eeg_tasks, "_prediction_model_version", lambda: "test-model")
+        monkeypatch.setattr(
+            eeg_tasks, "get_or_build_tensor",
+            lambda *args, **kwargs: np.zeros((2, 204, 256, 1), dtype=np.float32),
+        )
+        monkeypatch.setattr(
+            visualization, "predict_with_attribution",
+            lambda X, batch_size=None: (np.full((len(X), 1), 0.8), None),
+        )
+        monkeypatch.setattr(visualization, "channel_importance_from_attribution", lambda attribution: {"F1": 1.0})
+        monkeypatch.setattr(visualization, "generate_topomap", lambda importance: {"F1": [0.0, 0.0, 1.0]})
+        monkeypatch.setattr(visualization, "generate_waveforms", lambda **kwargs: {"channels": {}})
+
+    def test_pipeline_publishes_each_transition(
+        self, client, user_headers, sample_patient, parquet_file, memory_broker, fake_model, monkeypatch
+    ):
+        # El id solo se conoce tras el upload: se capturan todos los eventos publicados
+        published = []
+        monkeypatch.setattr(memory_broker, "publish", lambda eeg_record_id, event: published.append(event))
+
+        upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+
+        transitions = [(e["status"], e["visualization_status"]) for e in published]
+        assert transitions == [
+            ("processing", None),
+            ("processed", "pending"),
+            ("processed", "processing"),
+            ("processed", "completed"),
+        ]
+
+    def test_reused_prediction_publishes_final_status(
+        self, client, user_headers, sample_patient, parquet_file, memory_broker, fake_model, monkeypatch
+    ):
+        monkeypatch.setattr(Config, "EEG_DEDUP_PREDICTIONS", True)
+        file_data, filename = parquet_file
+        content = file_data.getvalue()
+        first = upload_eeg(client, user_headers, sample_patient.id, (io.BytesIO(content), filename))
+        first_status = client.get(f"/api/eeg-records/{first.get_json()['id']}/status", headers=user_headers)
+        assert first_status.get_json()["status"] == "processed"
+
+        published = []
+        monkeypatch.setattr(memory_broker, "publish", lambda eeg_record_id, event: published.append(event))
+        upload_eeg(client, user_headers, sample_patient.id, (io.BytesIO(content), filename))
+
+        assert [(e["status"], e["visualization_status"]) for e in published] == [("processed", "completed")]
+
+    def test_stream_user_isolation(
+        self, client, user_headers, another_user_headers, sample_patient, parquet_file, memory_broker
+    ):
+        r = upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+        eeg_id = r.get_json()["id"]
+
+        response = client.get(f"/api/eeg-records/{eeg_id}/status/stream", headers=another_user_headers)
+
+        assert response.status_code == 403
+        # La suscripción abierta antes del chequeo de permisos se cierra
+        assert memory_broker.subscriber_count(eeg_id) == 0
+
+    def test_stream_nonexistent_record(self, client, user_headers):
+        response = client.get(f"/api/eeg-records/{uuid.uuid4()}/status/stream", headers=user_headers)
+        assert response.status_code == 404
+        assert len(stream_slots) == 0
+
+    def test_stream_closed_before_reading_releases_subscription_and_slot(
+        self, client, user_headers, sample_patient, parquet_file, memory_broker
+    ):
+        r = upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+        eeg_id = r.get_json()["id"]
+
+        # El cliente se desconecta antes del primer chunk: el generador nunca arranca
+        response = client.get(
+            f"/api/eeg-records/{eeg_id}/status/stream", headers=user_headers, buffered=False
+        )
+        assert memory_broker.subscriber_count(eeg_id) == 1
+        assert len(stream_slots) == 1
+        response.close()
+
+        assert memory_broker.subscriber_count(eeg_id) == 0
+        assert len(stream_slots) == 0
+
+    def test_streams_beyond_the_worker_limit_get_503(
+        self, client, user_headers, sample_patient, parquet_file, memory_broker, monkeypatch
+    ):
+        monkeypatch.setattr(Config, "EEG_STATUS_STREAMS_PER_WORKER", 1)
+        r = upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+        eeg_id = r.get_json()["id"]
+
+        first = client.get(f"/api/eeg-records/{eeg_id}/status/stream", headers=user_headers, buffered=False)
+        second = client.get(f"/api/eeg-records/{eeg_id}/status/stream", headers=user_headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 503
+        assert int(second.headers["Retry-After"]) > 0
+        assert memory_broker.subscriber_count(eeg_id) == 1
+
+        first.close()
+        third = client.get(f"/api/eeg-records/{eeg_id}/status/stream", headers=user_headers)
+        assert third.status_code == 200
+        third.close()
+
+    def test_stream_requires_auth(self, client):
+        response = client.get(f"/api/eeg-records/{uuid.uuid4()}/status/stream")
+        assert response.status_code == 401
+
+
 class TestEegVisualizations:
     """Verifies the new visualization endpoint and related permissions/cascades."""
 
@@ -242,6 +425,39 @@ class TestEegVisualizations:
             assert "channels" in wf
             assert set(wf["channels"].keys()) <= {"F1"}
 
+    def test_tflite_without_attribution_stores_waveforms_only(
+        self, client, user_headers, sample_patient, parquet_file, monkeypatch
+    ):
+        # Con los valores por defecto de EEG_FUSED_ATTRIBUTION la predicción sale de run_inference
+        monkeypatch.setattr(Config, "INFERENCE_BACKEND", "tflite")
+        monkeypatch.setattr(Config, "EEG_FUSED_ATTRIBUTION", True)
+        monkeypatch.setattr(Config, "EEG_CHANNEL_ATTRIBUTION", False)
+        monkeypatch.setattr(eeg_tasks, "_prediction_model_version", lambda: "test-model+tflite")
+        monkeypatch.setattr(
+            eeg_tasks, "get_or_build_tensor",
+            lambda *args, **kwargs: np.zeros((2, 204, 256, 1), dtype=np.float32),
+        )
+        monkeypatch.setattr(eeg_tasks, "run_inference", lambda X: (AlcoholismRisk.NON_ALCOHOLIC, 0.2, 0.8))
+        monkeypatch.setattr(visualization, "generate_waveforms", lambda **kwargs: {"channels": {}})
+
+        def no_attribution(*args, **kwargs):
+            raise AssertionError("la atribución no debe ejecutarse")
+
+        monkeypatch.setattr(visualization, "predict_with_attribution", no_attribution)
+        monkeypatch.setattr(visualization, "generate_channel_importance", no_attribution)
+
+        r = upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+        eeg_id = r.get_json()["id"]
+
+        status = client.get(f"/api/eeg-records/{eeg_id}/status", headers=user_headers).get_json()
+        assert status["status"] == "processed"
+
+        data = client.get(f"/api/eeg-records/{eeg_id}/visualizations", headers=user_headers).get_json()
+        assert data["status"] == "completed"
+        assert "waveforms" in data
+        assert "channel_importance" not in data
+        assert "topomap" not in data
+
     def test_visualization_access_control(
         self, client, user_headers, another_user_headers, sample_patient, parquet_file
     ):
@@ -0,0 +1,268 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+import threading
+
+from app.celery_app import celery_settings
+from app.config import Config
+from app.ml import inference, model_loader
+from app.ml.backends import (
+    TFLiteBackend,
+    bucket_plan,
+    fused_attribution_enabled,
+    get_backend,
+    validate_backend_config,
+)
+from app.ml.export_model import check_parity, export_tflite
+from app.ml.batching import InferenceBatcher
+from app.ml.warmup import warm_up_model
+from app.ml.inference import BucketedPredictor, run_inference, summarize_predictions
+from app.ml.visualization import (
+    channel_importance_from_attribution,
+    generate_channel_importance,
+    predict_with_attribution,
+)
+
+
+@pytest.fixture
+def tiny_model(tmp_path, monkeypatch):
+    """Small EEGNet-shaped model saved to disk and served by get_model()."""
+    keras = tf.keras
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input(shape=(204, 256, 1)),
+        keras.layers.Conv2D(4, (1, 16), activation="elu"),
+        keras.layers.AveragePooling2D((1, 8)),
+        keras.layers.Flatten(),
+        keras.layers.Dense(1, activation="sigmoid"),
+    ])
+    path = tmp_path / "tiny.keras"
+    model.save(path)
+
+    monkeypatch.setattr(model_loader, "MODEL_PATH", str(path))
+    monkeypatch.setattr(model_loader, "_model", None)
+    return model_loader.get_model()
+
+
+@pytest.fixture
+def X():
+    return np.random.default_rng(0).standard_normal((10, 204, 256, 1)).astype(np.float32)
+
+
+class TestFusedAttribution:
+
+    def test_predictions_match_model_predict(self, tiny_model, X):
+        preds, _ = predict_with_attribution(X, batch_size=4)
+
+        np.testing.assert_allclose(preds, tiny_model.predict(X, verbose=0), atol=1e-5)
+        assert summarize_predictions(preds)[0] == run_inference(X)[0]
+
+    def test_importance_matches_single_pass_attribution(self, tiny_model, X):
+        _, attribution = predict_with_attribution(X, batch_size=3)
+        fused = channel_importance_from_attribution(attribution)
+        expected = generate_channel_importance(X)
+
+        assert fused["channels"] == expected["channels"]
+        np.testing.assert_allclose(fused["importance"], expected["importance"], atol=1e-4)
+
+
+class TestStreamingAttribution:
+
+    def test_running_mean_matches_whole_tensor_tape(self, tiny_model, X):
+        X_tf = tf.convert_to_tensor(X)
+        with tf.GradientTape() as tape:
+            tape.watch(X_tf)
+            loss = tiny_model(X_tf, training=False)[:, 0]
+        expected = (tape.gradient(loss, X_tf) * X_tf).numpy().mean(axis=(0, 2, 3))
+
+        for batch_size in (1, 3, 32):
+            _, attribution = predict_with_attribution(X, batch_size=batch_size)
+            np.testing.assert_allclose(attribution, expected, rtol=1e-4, atol=1e-8)
+
+    def test_importance_is_independent_of_batch_size(self, tiny_model, X):
+        np.testing.assert_allclose(
+            generate_channel_importance(X, batch_size=2)["importance"],
+            generate_channel_importance(X, batch_size=len(X))["importance"],
+            atol=1e-5,
+        )
+
+
+class TestBucketedPredictor:
+
+    def test_matches_model_predict_without_retracing(self, tiny_model):
+        predictor = BucketedPredictor(tiny_model, buckets=(4, 16))
+        rng = np.random.default_rng(2)
+
+        for n in (1, 4, 7, 16, 37):
+            X = rng.standard_normal((n, 204, 256, 1)).astype(np.float32)
+            preds = predictor.predict(X)
+            assert preds.shape == (n, 1)
+            np.testing.assert_allclose(preds, tiny_model.predict(X, verbose=0), atol=1e-5)
+
+        assert predictor.tracing_count == 1
+
+
+class TestTFLiteBackend:
+
+    @pytest.fixture
+    def tflite_path(self, tiny_model, tmp_path):
+        path = tmp_path / "tiny.tflite"
+        path.write_bytes(export_tflite(tiny_model))
+        return str(path)
+
+    def test_matches_keras_predictions(self, tiny_model, tflite_path):
+        backend = TFLiteBackend(tflite_path, buckets=(4, 16))
+        rng = np.random.default_rng(3)
+
+        for n in (1, 4, 7, 37):
+            X = rng.standard_normal((n, 204, 256, 1)).astype(np.float32)
+            preds = backend.predict(X)
+            assert preds.shape == (n, 1)
+            np.testing.assert_allclose(preds, tiny_model.predict(X, verbose=0), atol=1e-5)
+
+    def test_run_inference_uses_configured_backend(self, tiny_model, tflite_path, X, monkeypatch):
+        expected = run_inference(X)
+        monkeypatch.setattr(Config, "INFERENCE_BACKEND", "tflite")
+        monkeypatch.setattr(Config, "TFLITE_MODEL_PATH", tflite_path)
+
+        assert get_backend().version == "tiny+tflite"
+        label, prob, _ = run_inference(X)
+        assert label == expected[0]
+        assert prob == pytest.approx(expected[1], abs=1e-5)
+
+    def test_export_parity_check(self, tiny_model):
+        assert check_parity(tiny_model, export_tflite(tiny_model)) < 1e-5
+
+    def test_bucket_plan_pads_only_the_tail(self):
+        assert bucket_plan(45, (8, 32)) == [32, 8, 8]
+        assert bucket_plan(3, (8, 32)) == [8]
+        assert bucket_plan(0, (8, 32)) == []
+
+
+class TestWarmUp:
+
+    def test_warm_up_loads_model_and_reports_timings(self, tiny_model, monkeypatch):
+        monkeypatch.setattr(model_loader, "_model", None)
+        timings = warm_up_model()
+
+        assert model_loader._model is not None
+        assert timings["load_ms"] >= 0
+        assert timings["trace_ms"] >= 0
+
+    def test_fused_warm_up_skips_predictor_buckets(self, tiny_model, monkeypatch):
+        monkeypatch.setattr(Config, "EEG_FUSED_ATTRIBUTION", True)
+        monkeypatch.setattr(inference, "_predictor", None)
+
+        warm_up_model()
+
+        # process_eeg_record no llama a run_inference en este modo
+        assert inference._predictor is None
+
+    def test_unfused_warm_up_traces_predictor_buckets(self, tiny_model, monkeypatch):
+        monkeypatch.setattr(Config, "EEG_FUSED_ATTRIBUTION", False)
+        monkeypatch.setattr(Config, "INFERENCE_BACKEND", "keras")
+        monkeypatch.setattr(inference, "_predictor", None)
+
+        warm_up_model()
+
+        assert inference._predictor is not None
+        assert inference._predictor.tracing_count > 0
+
+    def test_worker_start_timeout_covers_warm_up(self):
+        config = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+        config["WARM_UP_MODEL_ON_WORKER_START"] = True
+
+        settings = celery_settings(config)
+
+        # Con el valor de Celery (4 s) el proceso se mata y recrea mientras precarga
+        assert settings["worker_proc_alive_timeout"] >= 60
+
+
+class TestBackendConfig:
+
+    def test_tflite_with_default_attribution_settings_is_accepted(self, monkeypatch):
+        monkeypatch.setattr(Config, "INFERENCE_BACKEND", "tflite")
+        monkeypatch.setattr(Config, "EEG_FUSED_ATTRIBUTION", True)
+        monkeypatch.setattr(Config, "EEG_CHANNEL_ATTRIBUTION", True)
+
+        validate_backend_config()
+
+        # La predicción sale de run_inference (TFLite), no del paso de atribución
+        assert not fused_attribution_enabled()
+
+    def test_fused_attribution_needs_keras_and_attribution(self, monkeypatch):
+        monkeypatch.setattr(Config, "INFERENCE_BACKEND", "keras")
+        monkeypatch.setattr(Config, "EEG_FUSED_ATTRIBUTION", True)
+        monkeypatch.setattr(Config, "EEG_CHANNEL_ATTRIBUTION", True)
+        assert fused_attribution_enabled()
+
+        monkeypatch.setattr(Config, "EEG_CHANNEL_ATTRIBUTION", False)
+        assert not fused_attribution_enabled()
+
+    def test_unknown_backend_is_rejected(self, monkeypatch):
+        monkeypatch.setattr(Config, "INFERENCE_BACKEND", "onnx")
+
+        with pytest.raises(ValueError, match="Unknown INFERENCE_BACKEND"):
+            validate_backend_config()
+
+
+class TestInferenceBatcher:
+
+    @staticmethod
+    def records():
+        rng = np.random.default_rng(1)
+        # One window per record: its probability is its first value
+        return [rng.uniform(0, 1, size=(n, 1)) for n in (3, 5, 2, 4)]
+
+    def test_concurrent_records_share_one_predict_call(self):
+        calls = []
+
+        def predict(X):
+            calls.append(len(X))
+            return X[:, :1]
+
+        batcher = InferenceBatcher(predict, max_batch_size=64, max_wait_ms=200)
+        records = self.records()
+        barrier = threading.Barrier(len(records))
+        results = [None] * len(records)
+
+        def worker(i):
+            barrier.wait()
+            results[i] = batcher.infer(records[i])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(records))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == [14]
+        for record, result in zip(records, results):
+            assert result == summarize_predictions(record)
+
+    def test_batch_is_capped_at_max_batch_size(self):
+        calls = []
+
+        def predict(X):
+            calls.append(len(X))
+            return X[:, :1]
+
+        batcher = InferenceBatcher(predict, max_batch_size=8, max_wait_ms=200)
+        futures = [batcher.submit(X) for X in self.records()]
+        [f.result() for f in futures]
+
+        assert sum(calls) == 14
+        assert max(calls) <= 8
+
+    def test_predict_error_fails_every_record_in_batch(self):
+        def predict(X):
+            raise RuntimeError("model failure")
+
+        batcher = InferenceBatcher(predict, max_wait_ms=50)
+        futures = [batcher.submit(X) for X in self.records()]
+
+        for future in futures:
+            with pytest.raises(RuntimeError, match="model failure"):
+                future.result()
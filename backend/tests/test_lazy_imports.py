@@ -0,0 +1,35 @@
+import subprocess
+import sys
+import textwrap
+
+
+def test_api_does_not_import_tensorflow():
+    """The API imports the task modules; TensorFlow must only load on the worker."""
+    # Fresh interpreter: the test session itself may already have imported TF
+    code = textwrap.dedent("""
+        import sys
+        import app.routes
+        from app import create_app
+        from app.config import TestingConfig
+
+        class Config(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+        create_app(Config)
+        loaded = [m for m in ("tensorflow", "keras", "app.ml.visualization") if m in sys.modules]
+        assert not loaded, loaded
+    """)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_waveforms_do_not_import_tensorflow():
+    """With EEG_CHANNEL_ATTRIBUTION=false the visualization task only needs the waveforms."""
+    code = textwrap.dedent("""
+        import sys
+        from app.ml.visualization import generate_waveforms
+        loaded = [m for m in ("tensorflow", "keras") if m in sys.modules]
+        assert not loaded, loaded
+    """)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,117 @@
+import base64
+import hashlib
+import importlib.util
+import json
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+VERSIONS_DIR = Path(__file__).resolve().parent.parent / "migrations" / "versions"
+
+
+def load_revision(filename):
+    """Módulo de una revisión de alembic (los nombres empiezan por dígitos)"""
+    spec = importlib.util.spec_from_file_location(filename, VERSIONS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Tabla sessions como la deja la revisión anterior a d4b9a7e31c52
+OLD_SESSIONS = sa.Table(
+    "sessions", sa.MetaData(),
+    sa.Column("user_id", sa.UUID(), nullable=False),
+    sa.Column("token", sa.String(length=500), nullable=False),
+    sa.Column("start_date", sa.DateTime(), nullable=False),
+    sa.Column("expiration_date", sa.DateTime(), nullable=False),
+    sa.Column("is_active", sa.Boolean(), nullable=False),
+    sa.Column("id", sa.UUID(), primary_key=True),
+    sa.Column("created_at", sa.DateTime(), nullable=False),
+    sa.Column("updated_at", sa.DateTime(), nullable=False),
+    sa.Index("ix_sessions_token", "token", unique=True),
+)
+
+
+def make_jwt(payload: dict) -> str:
+    body = base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJIUzI1NiJ9.{body}.signature"
+
+
+def run_upgrade(engine, revision):
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            revision.upgrade()
+
+
+class TestKeySessionsByTokenHash:
+
+    @pytest.fixture
+    def revision(self):
+        return load_revision("d4b9a7e31c52_key_sessions_by_token_hash.py")
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = sa.create_engine(f"sqlite:///{tmp_path / 'sessions.db'}")
+        OLD_SESSIONS.metadata.create_all(engine)
+        yield engine
+        engine.dispose()
+
+    def insert_sessions(self, engine, tokens):
+        now = datetime.now()
+        with engine.begin() as conn:
+            conn.execute(OLD_SESSIONS.insert(), [
+                {
+                    "user_id": uuid.uuid4(), "token": token, "start_date": now,
+                    "expiration_date": now, "is_active": True, "id": uuid.uuid4(),
+                    "created_at": now, "updated_at": now,
+                }
+                for token in tokens
+            ])
+
+    def read_sessions(self, engine):
+        with engine.connect() as conn:
+            rows = conn.execute(sa.text("SELECT token_hash, jti, is_active FROM sessions"))
+            return {row.token_hash: row for row in rows}
+
+    def test_backfill_skips_malformed_tokens(self, engine, revision):
+        jti = str(uuid.uuid4())
+        valid = make_jwt({"sub": "u1", "jti": jti})
+        malformed = [
+            "not-a-jwt",
+            "a.%%%.c",                                   # payload que no es base64
+            "a.bm90LWpzb24.c",                           # base64 sin padding, no es JSON
+            make_jwt({"sub": "u2"}),                     # sin jti
+            make_jwt({"sub": "u3", "jti": "x" * 40}),    # jti que no cabe en la columna
+        ]
+        self.insert_sessions(engine, [valid, *malformed])
+
+        run_upgrade(engine, revision)
+
+        rows = self.read_sessions(engine)
+        assert len(rows) == 6
+        assert "token" not in {c["name"] for c in sa.inspect(engine).get_columns("sessions")}
+
+        row = rows[hashlib.sha256(valid.encode()).digest()]
+        assert row.jti == jti
+        assert row.is_active
+
+        for token in malformed:
+            row = rows[hashlib.sha256(token.encode()).digest()]
+            assert uuid.UUID(row.jti)
+            assert not row.is_active
+
+    def test_backfill_in_batches(self, engine, revision, monkeypatch):
+        monkeypatch.setattr(revision, "BACKFILL_BATCH_SIZE", 2)
+        tokens = [make_jwt({"jti": str(uuid.uuid4())}) for _ in range(5)]
+        self.insert_sessions(engine, tokens)
+
+        run_upgrade(engine, revision)
+
+        rows = self.read_sessions(engine)
+        assert set(rows) == {hashlib.sha256(t.encode()).digest() for t in tokens}
+        assert all(row.is_active for row in rows.values())
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from app.domain.reader.csv_reader import CsvEegReader
+from app.domain.reader.parquet_reader import ParquetEegReader
+from app.domain.storage.parquet_eeg import write_parquet
+from app.ml.preprocessing import build_tensor_from_parquet
+from benchmarks._data import make_eeg_frame
+
+
+@pytest.fixture
+def frame():
+    df = make_eeg_frame()
+    df["extra"] = "x"
+    return df
+
+
+@pytest.fixture
+def sorted_path(tmp_path, frame):
+    path = str(tmp_path / "sorted.parquet")
+    write_parquet(frame[["channel", "sample", "trial", "value"]], path, row_group_rows=700)
+    return path
+
+
+def expected_subset(df, columns, trials=None, channels=None, samples=None):
+    mask = np.ones(len(df), dtype=bool)
+    if trials is not None:
+        mask &= df["trial"].isin(trials)
+    if channels is not None:
+        mask &= df["channel"].isin(channels)
+    if samples is not None:
+        mask &= (df["sample"] >= samples[0]) & (df["sample"] < samples[1])
+    return df.loc[mask, sorted(columns)]
+
+
+def assert_same_rows(result, expected):
+    key = [c for c in ("trial", "channel", "sample") if c in result.columns] or list(result.columns)
+    result = result.sort_values(key).reset_index(drop=True)
+    expected = expected.sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+SELECTIONS = [
+    dict(),
+    dict(trials=[10]),
+    dict(channels=["F1", "O2"], samples=(100, 356)),
+    dict(trials=[0, 20], channels=["CPZ"], samples=(0, 256)),
+]
+
+
+class TestReadSubset:
+
+    @pytest.mark.parametrize("selection", SELECTIONS)
+    def test_pushdown_matches_pandas_filter(self, tmp_path, frame, selection):
+        path = str(tmp_path / "eeg.parquet")
+        frame.to_parquet(path, index=False)
+        columns = ["channel", "sample", "trial", "value"]
+
+        result = ParquetEegReader().read_subset(path, **selection)
+
+        assert list(result.columns) == columns
+        assert_same_rows(result, expected_subset(frame, columns, **selection))
+
+    def test_projection_and_default_reader_agree(self, tmp_path, sorted_path, frame):
+        csv_path = str(tmp_path / "eeg.csv")
+        frame.to_csv(csv_path, index=False)
+        selection = dict(columns=["value", "sample"], trials=[10], channels=["FC3"], samples=(5, 50))
+
+        parquet = ParquetEegReader().read_subset(sorted_path, **selection)
+        csv = CsvEegReader().read_subset(csv_path, **selection)
+
+        assert list(parquet.columns) == ["sample", "value"]
+        assert len(parquet) == 45
+        assert_same_rows(parquet, csv)
+
+    def test_trial_ids_in_order_of_appearance(self, tmp_path, frame):
+        path = str(tmp_path / "eeg.parquet")
+        frame.to_parquet(path, index=False)
+
+        assert ParquetEegReader().trial_ids(path) == frame["trial"].unique().tolist()
+
+    def test_missing_and_unknown_columns_raise(self, tmp_path, frame):
+        path = str(tmp_path / "eeg.parquet")
+        frame.drop(columns="value").to_parquet(path, index=False)
+
+        with pytest.raises(ValueError, match="Missing required columns: value"):
+            ParquetEegReader().read(path)
+        with pytest.raises(ValueError, match="Unknown columns: extra"):
+            ParquetEegReader().read_subset(path, columns=["extra"])
+
+
+class TestSortedWrite:
+
+    def test_row_groups_are_ordered_by_trial(self, sorted_path):
+        metadata = pq.ParquetFile(sorted_path).metadata
+        names = [metadata.schema.column(i).name for i in range(metadata.num_columns)]
+        stats = [metadata.row_group(i).column(names.index("trial")).statistics
+                 for i in range(metadata.num_row_groups)]
+
+        assert len(stats) > 1
+        for previous, current in zip(stats, stats[1:]):
+            assert previous.max <= current.min
+
+    def test_trial_filter_skips_row_groups(self, sorted_path):
+        fragment, = ds.dataset(sorted_path).get_fragments()
+        total = pq.ParquetFile(sorted_path).metadata.num_row_groups
+
+        assert 0 < len(fragment.split_by_row_group(ds.field("trial") == 10)) < total / 2
+
+    def test_trial_ids_keep_upload_order(self, sorted_path, frame):
+        # Las filas quedan ordenadas por trial, pero el trial 0 sigue siendo el primero subido
+        order = frame["trial"].unique().tolist()
+        assert order != sorted(order)
+
+        assert ParquetEegReader().trial_ids(sorted_path) == order
+
+    def test_tensor_is_unchanged(self, tmp_path, sorted_path, frame):
+        # Trials come out in sorted order; the rows inside a trial in any order
+        unsorted_path = str(tmp_path / "unsorted.parquet")
+        frame.sort_values("trial", kind="stable").to_parquet(unsorted_path, index=False)
+
+        np.testing.assert_array_equal(
+            build_tensor_from_parquet(sorted_path), build_tensor_from_parquet(unsorted_path)
+        )
+
+
+class TestWaveformSlice:
+
+    @pytest.fixture
+    def visualization(self):
+        from app.ml import visualization
+        return visualization
+
+    def test_matches_full_read(self, visualization, sorted_path, frame):
+        for trial_index in (0, 2):
+            trial = frame[frame["trial"] == frame["trial"].unique()[trial_index]]
+            signals = dict(visualization._first_window_signals(sorted_path, trial_index, 256))
+
+            expected = trial[trial["channel"] == "P7"].sort_values("sample")["value"].to_numpy()[:256]
+            np.testing.assert_array_equal(signals["P7"], expected)
+
+    def test_samples_not_starting_at_zero(self, visualization, tmp_path, frame):
+        frame = frame.assign(sample=frame["sample"] + 1000)
+        path = str(tmp_path / "offset.parquet")
+        write_parquet(frame[["channel", "sample", "trial", "value"]], path)
+
+        signals = dict(visualization._first_window_signals(path, 0, 256))
+
+        trial = frame[(frame["trial"] == frame["trial"].iloc[0]) & (frame["channel"] == "O1")]
+        assert len(signals) == 34
+        np.testing.assert_array_equal(signals["O1"], trial.sort_values("sample")["value"].to_numpy()[:256])
@@ -1,6 +1,14 @@
+import hashlib
+import io
 import pytest
 import uuid
 
+from app.config import Config
+from app.models.eeg_record import FILE_TYPE, EegRecord, EegStatus
+from app.models.prediction_result import AlcoholismRisk, PredictionResult
+from app.models.prediction_visualization import PredictionVisualization
+from app.tasks import eeg_tasks
+
 
 def upload_and_get_prediction_id(client, headers, patient_id, parquet_file):
     """Helper: sube un EEG y devuelve el eeg_record_id."""
@@ -33,6 +41,11 @@ def upload_and_wait_for_prediction(client, headers, patient_id, parquet_file):
     return eeg_id, None
 
 
+def stored_prediction(prediction_id):
+    """Helper: la predicción guardada, con los campos que la API no expone."""
+    return PredictionResult.query.filter_by(id=uuid.UUID(prediction_id)).one()
+
+
 class TestGetPrediction:
 
     def test_prediction_available_after_processing(
@@ -402,3 +415,105 @@ class TestDeletePrediction:
         """Eliminar predicción sin autenticación retorna 401"""
         response = client.delete(f"/api/predictions/{uuid.uuid4()}")
         assert response.status_code == 401
+
+
+# ============================================================================
+# TEST: Reutilizar predicciones de subidas idénticas
+# ============================================================================
+
+class TestPredictionReuse:
+
+    @pytest.fixture
+    def seeded_prediction(self, db, regular_user, sample_patient, parquet_file, monkeypatch):
+        """
+        Registro ya procesado con el mismo contenido que parquet_file, con su
+        predicción y visualizaciones completas (sin modelo en los tests).
+        """
+        monkeypatch.setattr(Config, "EEG_DEDUP_PREDICTIONS", True)
+        monkeypatch.setattr(eeg_tasks, "_prediction_model_version", lambda: "test-model")
+
+        file_data, filename = parquet_file
+        record = EegRecord(
+            patient_id=sample_patient.id,
+            uploader_id=regular_user.id,
+            file_name=filename,
+            file_type=FILE_TYPE.PARQUET,
+            content_hash=hashlib.sha256(file_data.getvalue()).hexdigest(),
+            status=EegStatus.PROCESSED,
+        )
+        db.session.add(record)
+        db.session.flush()
+
+        prediction = PredictionResult(
+            eeg_record_id=record.id,
+            result=AlcoholismRisk.ALCOHOLIC,
+            confidence=0.9,
+            raw_probability=0.9,
+            model_version="test-model",
+            preprocessing_hash=eeg_tasks._preprocessing_hash(),
+        )
+        db.session.add(prediction)
+        db.session.flush()
+
+        db.session.add(PredictionVisualization(
+            prediction_id=prediction.id,
+            status="completed",
+            waveforms_data={"channels": {}},
+            topomap_data={"electrodes": []},
+            channel_importance_data={"channels": [], "importance": []},
+        ))
+        db.session.commit()
+        return prediction
+
+    def test_identical_upload_reuses_prediction(
+        self, client, user_headers, admin_headers, sample_patient, parquet_file, seeded_prediction
+    ):
+        """La segunda subida del mismo archivo copia la predicción sin inferencia"""
+        _, second = upload_and_wait_for_prediction(client, user_headers, sample_patient.id, parquet_file)
+
+        assert second is not None
+        copy = stored_prediction(second["id"])
+        assert copy.reused_from_id == seeded_prediction.id
+        # El id de la predicción de otro registro no sale por la API
+        assert "reused_from_id" not in second
+        assert second["id"] != str(seeded_prediction.id)
+        assert second["result"] == "alcoholic"
+        assert float(second["confidence"]) == pytest.approx(0.9)
+
+        stats = client.get("/api/predictions/dedup-stats", headers=admin_headers).get_json()
+        assert stats["hits"] >= 1
+
+    def test_reused_prediction_has_visualizations(
+        self, client, user_headers, sample_patient, parquet_file, seeded_prediction
+    ):
+        eeg_id, prediction = upload_and_wait_for_prediction(
+            client, user_headers, sample_patient.id, parquet_file
+        )
+
+        assert prediction is not None
+        response = client.get(f"/api/eeg-records/{eeg_id}/visualizations", headers=user_headers)
+        data = response.get_json()
+        assert data["status"] == "completed"
+        assert data["waveforms"] == {"channels": {}}
+        assert data["topomap"] == {"electrodes": []}
+
+    def test_deleted_upload_is_not_reused(
+        self, client, user_headers, sample_patient, parquet_file, seeded_prediction
+    ):
+        """Borrar la subida original impide reutilizar su predicción"""
+        response = client.delete(
+            f"/api/eeg-records/{seeded_prediction.eeg_record_id}", headers=user_headers
+        )
+        assert response.status_code == 200
+
+        upload_and_wait_for_prediction(client, user_headers, sample_patient.id, parquet_file)
+
+        assert PredictionResult.query.filter_by(reused_from_id=seeded_prediction.id).count() == 0
+
+    def test_dedup_stats_admin_only(self, client, user_headers, admin_headers):
+        response = client.get("/api/predictions/dedup-stats", headers=admin_headers)
+        assert response.status_code == 200
+        assert set(response.get_json()) == {"hits", "misses", "hit_rate"}
+
+        response = client.get("/api/predictions/dedup-stats", headers=user_headers)
+        assert response.status_code == 403
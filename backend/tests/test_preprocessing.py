@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.storage.dense_eeg import pivot_trials
+from app.ml import preprocessing
+from app.ml.preprocessing import (
+    BAND_NAMES,
+    FILTER_MODE_TRIAL,
+    build_tensor_from_parquet,
+    extract_frequency_bands_batch,
+    normalize_planes,
+    normalize_signal,
+)
+from benchmarks._data import legacy_build_tensor, legacy_process_channel, make_eeg_frame
+
+# Batched SOS filtering differs from per-window (b, a) filtfilt only by
+# rounding, largest in the delta band where the (b, a) form is ill-conditioned
+TOLERANCE = dict(rtol=0, atol=1e-3)
+
+
+@pytest.fixture
+def eeg_parquet(tmp_path):
+    df = make_eeg_frame()
+    # One channel missing in the second trial and a trial too short for a window
+    df = df[~((df["trial"] == 10) & (df["channel"] == "O1"))]
+    short = make_eeg_frame(n_trials=1, n_samples=100, seed=1).assign(trial=99)
+    df = pd.concat([df, short], ignore_index=True)
+
+    path = tmp_path / "eeg.parquet"
+    df.to_parquet(path, index=False)
+    return str(path), df
+
+
+class TestPivotTrials:
+
+    def test_pivot_orders_by_sample_and_pads(self):
+        df = pd.DataFrame({
+            "trial": [1, 1, 1, 0, 0],
+            "channel": ["B", "A", "A", "A", "B"],
+            "sample": [0, 1, 0, 0, 0],
+            "value": [5.0, 2.0, 1.0, 3.0, 4.0],
+        })
+        data, lengths = pivot_trials(df, ["A", "B"])
+
+        assert data.shape == (2, 2, 2)
+        # trials keep order of appearance: trial 1 first
+        np.testing.assert_array_equal(data[0], [[1.0, 2.0], [5.0, 0.0]])
+        np.testing.assert_array_equal(data[1], [[3.0, 0.0], [4.0, 0.0]])
+        np.testing.assert_array_equal(lengths, [[2, 1], [1, 1]])
+
+    def test_pivot_with_sample_gaps_places_by_rank(self):
+        df = pd.DataFrame({
+            "trial": [0, 0, 0, 0],
+            "channel": ["A", "A", "A", "B"],
+            "sample": [7, 2, 4, 10],
+            "value": [3.0, 1.0, 2.0, 4.0],
+        })
+        data, lengths = pivot_trials(df, ["A", "B"])
+
+        np.testing.assert_array_equal(data[0], [[1.0, 2.0, 3.0], [4.0, 0.0, 0.0]])
+        np.testing.assert_array_equal(lengths, [[3, 1]])
+
+    def test_pivot_with_repeated_sample_hiding_a_gap(self):
+        # Rango 0..2 con 3 filas, pero el 0 se repite y falta el 1
+        df = pd.DataFrame({
+            "trial": [0, 0, 0],
+            "channel": ["A", "A", "A"],
+            "sample": [0, 0, 2],
+            "value": [1.0, 2.0, 3.0],
+        })
+        data, lengths = pivot_trials(df, ["A"])
+
+        np.testing.assert_array_equal(data[0], [[1.0, 2.0, 3.0]])
+        np.testing.assert_array_equal(lengths, [[3]])
+
+
+class TestBandExtraction:
+
+    def test_batch_matches_per_signal_filtfilt(self):
+        signals = np.random.default_rng(0).standard_normal((4, 3, 256))
+        planes = extract_frequency_bands_batch(signals)
+
+        assert planes.shape == (4, 3, len(BAND_NAMES), 256)
+        expected = np.zeros((len(BAND_NAMES) * 3, 256, 1), dtype=np.float32)
+        for c in range(3):
+            legacy_process_channel(signals[2, c], True, c * len(BAND_NAMES), expected)
+        np.testing.assert_allclose(
+            normalize_planes(planes[2]).reshape(-1, 256), expected[:, :, 0], **TOLERANCE
+        )
+
+    def test_normalize_planes_keeps_flat_signals(self):
+        planes = np.stack([np.full(8, 3.0), np.arange(8.0)])
+        normalized = normalize_planes(planes)
+
+        np.testing.assert_array_equal(normalized[0], planes[0])
+        np.testing.assert_allclose(normalized[1], normalize_signal(planes[1]))
+
+
+class TestBuildTensor:
+
+    @pytest.mark.parametrize("step_size", [256, 128])
+    def test_matches_legacy_builder(self, eeg_parquet, step_size):
+        path, df = eeg_parquet
+        expected = legacy_build_tensor(df, step_size=step_size)
+        result = build_tensor_from_parquet(path, win_size=256, step_size=step_size)
+
+        assert result.dtype == np.float32
+        assert result.shape == expected.shape
+        np.testing.assert_allclose(result, expected, **TOLERANCE)
+
+    def test_raw_mode_matches_legacy_builder(self, eeg_parquet):
+        path, df = eeg_parquet
+        expected = legacy_build_tensor(df, use_bands=False)
+        result = build_tensor_from_parquet(path, use_bands=False)
+        np.testing.assert_allclose(result, expected, **TOLERANCE)
+
+    def test_missing_channel_raises(self, tmp_path):
+        df = make_eeg_frame(n_trials=1)
+        path = tmp_path / "eeg.parquet"
+        df[df["channel"] != "T8"].to_parquet(path, index=False)
+
+        with pytest.raises(ValueError, match="T8"):
+            build_tensor_from_parquet(str(path))
+
+
+class TestTrialFilterMode:
+
+    def test_windows_are_cut_from_trial_filtered_bands(self, eeg_parquet):
+        path, df = eeg_parquet
+        result = build_tensor_from_parquet(path, step_size=128, filter_mode=FILTER_MODE_TRIAL)
+        windowed = build_tensor_from_parquet(path, step_size=128)
+        assert result.shape == windowed.shape
+
+        # Second window of the first trial, channel F1, from its full filtered signal
+        first_trial = df["trial"].unique()[0]
+        trial = df[(df["trial"] == first_trial) & (df["channel"] == "F1")].sort_values("sample")
+        bands = extract_frequency_bands_batch(trial["value"].to_numpy())
+        expected = normalize_planes(bands[:, 128:384])
+
+        np.testing.assert_allclose(result[1, :len(BAND_NAMES), :, 0], expected, atol=1e-5)
+
+    def test_channel_blocks_give_the_same_tensor(self, eeg_parquet, monkeypatch):
+        path, _ = eeg_parquet
+        expected = build_tensor_from_parquet(path, step_size=128, filter_mode=FILTER_MODE_TRIAL)
+
+        # Un canal por bloque: la memoria ya no crece con trials x canales
+        monkeypatch.setattr(preprocessing, "BAND_BATCH_SAMPLES", 1)
+        result = build_tensor_from_parquet(path, step_size=128, filter_mode=FILTER_MODE_TRIAL)
+
+        np.testing.assert_array_equal(result, expected)
+
+    def test_raw_mode_is_unaffected(self, eeg_parquet):
+        path, _ = eeg_parquet
+        np.testing.assert_array_equal(
+            build_tensor_from_parquet(path, use_bands=False, filter_mode=FILTER_MODE_TRIAL),
+            build_tensor_from_parquet(path, use_bands=False),
+        )
+
+    def test_invalid_mode_raises(self, eeg_parquet):
+        path, _ = eeg_parquet
+        with pytest.raises(ValueError, match="filter_mode"):
+            build_tensor_from_parquet(path, filter_mode="session")
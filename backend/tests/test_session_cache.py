@@ -0,0 +1,104 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import Config
+from app.models.session import Session
+from app.utils.session_cache import CachedSession, RefreshBuffer, SessionCache
+
+
+def make_entry(user_id="u1", loaded_at=None):
+    return CachedSession(
+        user_id=user_id,
+        expiration=datetime.now(timezone.utc) + timedelta(minutes=30),
+        loaded_at=time.monotonic() if loaded_at is None else loaded_at,
+    )
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(Config, "REDIS_URL", None)
+    return SessionCache()
+
+
+class TestSessionCache:
+
+    def test_cache_key_does_not_contain_token(self):
+        key = Session.hash_token("header.payload.signature").hex()
+
+        assert len(key) == 64
+        assert "payload" not in key
+        assert key == Session.hash_token("header.payload.signature").hex()
+
+    def test_entries_go_stale_after_ttl(self, cache):
+        cache.put("a", make_entry())
+        cache.put("b", make_entry(loaded_at=time.monotonic() - 60))
+
+        assert cache.get("a").is_fresh(30)
+        assert not cache.get("b").is_fresh(30)
+        assert cache.get("c") is None
+
+    def test_invalidate_user_drops_only_their_sessions(self, cache):
+        cache.put("a", make_entry("u1"))
+        cache.put("b", make_entry("u1"))
+        cache.put("c", make_entry("u2"))
+
+        cache.invalidate_user("u1")
+
+        assert cache.get("a") is None and cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_published_messages_drop_entries(self, cache):
+        cache.put("a", make_entry("u1"))
+        cache.put("b", make_entry("u2"))
+        cache.put("c", make_entry("u3"))
+
+        cache._on_message({"type": "message", "data": b"token:a"})
+        cache._on_message({"type": "message", "data": "user:u2"})
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_unreachable_redis_is_not_fatal(self, cache, monkeypatch):
+        monkeypatch.setattr(Config, "REDIS_URL", "redis://127.0.0.1:1/0")
+        cache.put("a", make_entry())
+
+        cache.invalidate("a")
+
+        assert cache.get("a") is None
+
+    def test_listener_error_clears_cache(self, cache, monkeypatch):
+        monkeypatch.setattr("app.utils.session_cache.time.sleep", lambda s: None)
+        cache.put("a", make_entry())
+
+        cache._on_listener_error(ConnectionError("lost"), None, None)
+
+        assert cache.get("a") is None
+
+
+class TestRefreshBuffer:
+
+    def test_keeps_latest_expiration_per_token(self):
+        buffer = RefreshBuffer()
+        first = datetime.now(timezone.utc)
+        buffer.add(b"t1", first)
+        buffer.add(b"t1", first + timedelta(seconds=5))
+        buffer.add(b"t2", first)
+
+        pending = buffer.drain()
+
+        assert pending == {b"t1": first + timedelta(seconds=5), b"t2": first}
+        assert len(buffer) == 0
+
+    def test_drain_waits_for_interval(self):
+        buffer = RefreshBuffer()
+        buffer.add(b"t1", datetime.now(timezone.utc))
+
+        assert buffer.drain(interval=3600) == {}
+        assert len(buffer) == 1
+        assert list(buffer.drain()) == [b"t1"]
+
+        buffer.add(b"t2", datetime.now(timezone.utc))
+        assert buffer.drain(interval=3600) == {}
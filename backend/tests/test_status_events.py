@@ -0,0 +1,172 @@
+import json
+
+import pytest
+
+from app.config import Config
+from app.utils.status_events import (
+    MemoryStatusBroker,
+    StreamSlots,
+    format_sse,
+    get_status_broker,
+    is_final_event,
+    stream_status_events,
+)
+
+
+def make_event(status, visualization_status=None):
+    return {
+        "id": "rec-1",
+        "status": status,
+        "processing_time_ms": None,
+        "error_msg": None,
+        "visualization_status": visualization_status,
+    }
+
+
+def parse_events(messages):
+    """Datos de los mensajes "status" de un stream SSE (sin comentarios ni retry)"""
+    events = []
+    for message in messages:
+        for line in message.splitlines():
+            if line.startswith("data: "):
+                events.append(json.loads(line[len("data: "):]))
+    return events
+
+
+@pytest.fixture
+def broker():
+    return MemoryStatusBroker()
+
+
+class TestMemoryStatusBroker:
+
+    def test_subscribers_only_get_events_of_their_record(self, broker):
+        sub_a = broker.subscribe("a")
+        sub_b = broker.subscribe("b")
+
+        broker.publish("a", make_event("processing"))
+
+        assert sub_a.get(timeout=0.1)["status"] == "processing"
+        assert sub_b.get(timeout=0.01) is None
+
+    def test_every_subscriber_of_a_record_gets_the_event(self, broker):
+        subs = [broker.subscribe("a") for _ in range(3)]
+
+        broker.publish("a", make_event("processed", "pending"))
+
+        assert all(s.get(timeout=0.1)["visualization_status"] == "pending" for s in subs)
+
+    def test_close_unsubscribes(self, broker):
+        sub = broker.subscribe("a")
+        assert broker.subscriber_count("a") == 1
+
+        sub.close()
+        broker.publish("a", make_event("processing"))
+
+        assert broker.subscriber_count("a") == 0
+        assert sub.get(timeout=0.01) is None
+
+    def test_uuid_and_str_ids_share_the_channel(self, broker):
+        import uuid
+        eeg_id = uuid.uuid4()
+        sub = broker.subscribe(eeg_id)
+
+        broker.publish(str(eeg_id), make_event("processing"))
+
+        assert sub.get(timeout=0.1) is not None
+
+
+class TestStatusStream:
+
+    def test_final_events(self):
+        assert is_final_event(make_event("failed"))
+        assert is_final_event(make_event("processed", "completed"))
+        assert is_final_event(make_event("processed", "failed"))
+        assert not is_final_event(make_event("processed", "pending"))
+        assert not is_final_event(make_event("processing"))
+
+    def test_final_snapshot_ends_the_stream(self, broker):
+        sub = broker.subscribe("rec-1")
+
+        messages = list(stream_status_events(make_event("failed"), sub, heartbeat_seconds=1, max_seconds=5))
+
+        assert len(messages) == 1
+        assert messages[0].startswith("retry: ")
+        assert parse_events(messages)[0]["status"] == "failed"
+        # La suscripción se cierra al terminar
+        assert broker.subscriber_count("rec-1") == 0
+
+    def test_forwards_transitions_until_final(self, broker):
+        sub = broker.subscribe("rec-1")
+        for event in [
+            make_event("processing"),
+            make_event("processed", "pending"),
+            make_event("processed", "processing"),
+            make_event("processed", "completed"),
+            make_event("processed", "completed"),  # no debe llegar: el stream ya terminó
+        ]:
+            broker.publish("rec-1", event)
+
+        messages = list(stream_status_events(make_event("pending"), sub, heartbeat_seconds=1, max_seconds=5))
+        events = parse_events(messages)
+
+        assert [(e["status"], e["visualization_status"]) for e in events] == [
+            ("pending", None),
+            ("processing", None),
+            ("processed", "pending"),
+            ("processed", "processing"),
+            ("processed", "completed"),
+        ]
+
+    def test_heartbeat_and_max_duration(self, broker):
+        sub = broker.subscribe("rec-1")
+
+        messages = list(stream_status_events(make_event("pending"), sub, heartbeat_seconds=0.05, max_seconds=0.2))
+
+        assert len(parse_events(messages)) == 1
+        assert messages.count(": keep-alive\n\n") >= 2
+        assert broker.subscriber_count("rec-1") == 0
+
+    def test_closing_the_stream_early_unsubscribes(self, broker):
+        sub = broker.subscribe("rec-1")
+        stream = stream_status_events(make_event("pending"), sub, heartbeat_seconds=1, max_seconds=5)
+
+        next(stream)
+        stream.close()  # el cliente se desconectó
+
+        assert broker.subscriber_count("rec-1") == 0
+
+    def test_format_sse(self):
+        message = format_sse(make_event("processing"))
+
+        assert message.startswith("event: status\ndata: ")
+        assert message.endswith("\n\n")
+        assert json.loads(message.split("data: ", 1)[1])["status"] == "processing"
+
+    def test_memory_broker_without_redis(self, monkeypatch):
+        monkeypatch.setattr(Config, "REDIS_URL", None)
+
+        assert isinstance(get_status_broker(), MemoryStatusBroker)
+        assert get_status_broker() is get_status_broker()
+
+
+class TestStreamSlots:
+
+    def test_acquire_up_to_the_limit(self):
+        slots = StreamSlots()
+
+        assert slots.acquire(2)
+        assert slots.acquire(2)
+        assert not slots.acquire(2)
+        assert len(slots) == 2
+
+    def test_release_frees_a_slot(self):
+        slots = StreamSlots()
+        slots.acquire(1)
+
+        slots.release()
+
+        assert slots.acquire(1)
+        slots.release()
+        slots.release()  # de más: no baja de cero
+        assert len(slots) == 0
@@ -0,0 +1,90 @@
+import hashlib
+import io
+import os
+
+import pytest
+from flask import Flask, jsonify, request
+from werkzeug.datastructures import FileStorage
+
+from app.config import Config
+from app.exceptions import ValidationError
+from app.utils.uploads import HashingUpload, StreamingUploadRequest, save_upload
+
+
+@pytest.fixture
+def upload_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "EEG_UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(Config, "EEG_MAX_FILE_SIZE_BYTES", 1024 * 1024)
+    return tmp_path
+
+
+@pytest.fixture
+def client(upload_folder):
+    app = Flask(__name__)
+    app.request_class = StreamingUploadRequest
+
+    @app.route("/upload", methods=["POST"])
+    def upload():
+        try:
+            file = request.files["file"]
+            streamed = isinstance(file.stream, HashingUpload)
+            if request.form.get("keep"):
+                size, content_hash = save_upload(file, str(upload_folder / "kept.bin"), Config.EEG_MAX_FILE_SIZE_BYTES)
+                return jsonify(streamed=streamed, size=size, hash=content_hash)
+            return jsonify(streamed=streamed)
+        except ValidationError as e:
+            return jsonify(error=e.message), 400
+
+    return app.test_client()
+
+
+def post(client, payload, **form):
+    return client.post(
+        "/upload",
+        data={"file": (io.BytesIO(payload), "eeg.csv"), **form},
+        content_type="multipart/form-data",
+    )
+
+
+class TestStreamingUploadRequest:
+
+    def test_file_is_streamed_hashed_and_claimed(self, client, upload_folder):
+        payload = os.urandom(300_000)
+        data = post(client, payload, keep="1").get_json()
+
+        assert data["streamed"] is True
+        assert data["size"] == len(payload)
+        assert data["hash"] == hashlib.sha256(payload).hexdigest()
+        assert (upload_folder / "kept.bin").read_bytes() == payload
+        assert os.listdir(upload_folder) == ["kept.bin"]
+
+    def test_unclaimed_file_is_removed_with_the_request(self, client, upload_folder):
+        assert post(client, b"a,b\n1,2\n").get_json()["streamed"] is True
+        assert os.listdir(upload_folder) == []
+
+    def test_size_limit_is_enforced_while_receiving(self, client, upload_folder):
+        response = post(client, b"x" * (1024 * 1024 + 1))
+
+        assert response.status_code == 400
+        assert "maximum allowed size of 1 MB" in response.get_json()["error"]
+        assert os.listdir(upload_folder) == []
+
+
+class TestSaveUpload:
+
+    def test_copies_other_streams_in_chunks(self, upload_folder, monkeypatch):
+        monkeypatch.setattr("app.utils.uploads.UPLOAD_CHUNK_BYTES", 1000)
+        payload = os.urandom(12_345)
+        dest = str(upload_folder / "copy.bin")
+
+        size, content_hash = save_upload(FileStorage(io.BytesIO(payload), "eeg.csv"), dest, 20_000)
+
+        assert (size, content_hash) == (len(payload), hashlib.sha256(payload).hexdigest())
+        assert open(dest, "rb").read() == payload
+
+    def test_copy_over_the_limit_leaves_nothing(self, upload_folder):
+        dest = upload_folder / "copy.bin"
+
+        with pytest.raises(ValidationError, match="maximum allowed size"):
+            save_upload(FileStorage(io.BytesIO(b"x" * 5000), "eeg.csv"), str(dest), 4096)
+        assert not dest.exists()
@@ -0,0 +1,111 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from app.config import Config
+from app.ml import tensor_cache
+from app.ml.tensor_cache import (
+    cache_key,
+    discard_cached_tensor,
+    evict_tensor_cache,
+    get_or_build_tensor,
+)
+from benchmarks._data import make_eeg_frame
+
+PARAMS = {"win_size": 256, "step_size": 256, "use_bands": True, "filter_mode": "window"}
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "EEG_UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(Config, "EEG_TENSOR_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    return tmp_path
+
+
+@pytest.fixture
+def build_calls(monkeypatch):
+    calls = []
+    build = tensor_cache.build_tensor_from_parquet
+
+    def counting_build(*args, **kwargs):
+        calls.append(args)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(tensor_cache, "build_tensor_from_parquet", counting_build)
+    return calls
+
+
+@pytest.fixture
+def eeg_file(cache_folder):
+    path = cache_folder / "eeg.parquet"
+    make_eeg_frame(n_trials=2, n_samples=512).to_parquet(path, index=False)
+    return str(path)
+
+
+class TestTensorCache:
+
+    def test_second_call_loads_memmap_without_rebuilding(self, eeg_file, build_calls):
+        first = get_or_build_tensor(eeg_file, **PARAMS)
+        second = get_or_build_tensor(eeg_file, **PARAMS)
+
+        assert len(build_calls) == 1
+        assert isinstance(second, np.memmap)
+        np.testing.assert_array_equal(first, second)
+
+    def test_params_are_part_of_the_key(self, eeg_file, build_calls):
+        get_or_build_tensor(eeg_file, **PARAMS)
+        get_or_build_tensor(eeg_file, **{**PARAMS, "step_size": 128})
+
+        assert len(build_calls) == 2
+        assert cache_key("abc", PARAMS) != cache_key("abc", {**PARAMS, "step_size": 128})
+
+    def test_preprocessing_version_is_part_of_the_key(self, eeg_file, build_calls, monkeypatch):
+        get_or_build_tensor(eeg_file, **PARAMS)
+        # Un cambio en el preprocesamiento no debe servir tensores viejos
+        monkeypatch.setattr(tensor_cache, "PREPROCESSING_VERSION", tensor_cache.PREPROCESSING_VERSION + 1)
+        get_or_build_tensor(eeg_file, **PARAMS)
+
+        assert len(build_calls) == 2
+
+    def test_discard_removes_entry(self, eeg_file, build_calls):
+        get_or_build_tensor(eeg_file, **PARAMS)
+        discard_cached_tensor(eeg_file, **PARAMS)
+        get_or_build_tensor(eeg_file, **PARAMS)
+
+        assert len(build_calls) == 2
+
+    def test_lru_eviction_keeps_recently_used(self, cache_folder):
+        cache_dir = cache_folder / tensor_cache.CACHE_DIRNAME
+        cache_dir.mkdir()
+        for i, name in enumerate(["old", "used", "new"]):
+            path = cache_dir / f"{name}.npy"
+            np.save(path, np.zeros(1000, dtype=np.float32))
+            os.utime(path, (1000 + i, 1000 + i))
+        os.utime(cache_dir / "used.npy", (2000, 2000))  # touched by a hit
+
+        size = os.path.getsize(cache_dir / "old.npy")
+        assert evict_tensor_cache(2 * size) == 1
+        assert sorted(os.listdir(cache_dir)) == ["new.npy", "used.npy"]
+
+    def test_eviction_removes_orphaned_temp_files(self, cache_folder):
+        cache_dir = cache_folder / tensor_cache.CACHE_DIRNAME
+        cache_dir.mkdir()
+        orphan = cache_dir / "a.npy.1.tmp"
+        writing = cache_dir / "b.npy.2.tmp"
+        orphan.write_bytes(b"partial")
+        writing.write_bytes(b"partial")
+        old = time.time() - tensor_cache.TMP_MAX_AGE_SECONDS - 1
+        os.utime(orphan, (old, old))
+
+        assert evict_tensor_cache(64 * 1024 * 1024) == 0
+        # Solo el de un escritor caído; el reciente puede estar escribiéndose
+        assert os.listdir(cache_dir) == ["b.npy.2.tmp"]
+
+    def test_disabled_cache_always_builds(self, eeg_file, build_calls, monkeypatch):
+        monkeypatch.setattr(Config, "EEG_TENSOR_CACHE_MAX_BYTES", 0)
+        get_or_build_tensor(eeg_file, **PARAMS)
+        get_or_build_tensor(eeg_file, **PARAMS)
+
+        assert len(build_calls) == 2
@@ -0,0 +1,89 @@
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.config import Config
+from app.domain.reader.csv_reader import CsvEegReader
+from app.domain.reader.edf_reader import EdfEegReader
+from app.domain.reader.json_reader import JsonEegReader
+from app.domain.reader.parquet_reader import ParquetEegReader
+from app.domain.storage.dense_eeg import read_dense
+from app.services.eeg_record_service import UPLOAD_PREFIX, EegRecordService
+from benchmarks._data import make_eeg_frame, write_edf
+
+
+@pytest.fixture
+def frame():
+    return make_eeg_frame(n_trials=2, n_samples=300)
+
+
+class TestSniff:
+
+    def test_valid_files_pass(self, tmp_path, frame):
+        frame.to_parquet(tmp_path / "a.parquet", index=False)
+        frame.to_csv(tmp_path / "a.csv", index=False)
+        with open(tmp_path / "a.json", "w") as f:
+            json.dump({"data": frame.to_dict(orient="records")}, f)
+        write_edf(tmp_path / "a.edf", {"EEG F1-REF": np.zeros(512)})
+
+        ParquetEegReader().sniff(str(tmp_path / "a.parquet"))
+        CsvEegReader().sniff(str(tmp_path / "a.csv"))
+        JsonEegReader().sniff(str(tmp_path / "a.json"))
+        EdfEegReader().sniff(str(tmp_path / "a.edf"))
+
+    @pytest.mark.parametrize("reader, name, content", [
+        (CsvEegReader, "a.csv", b"col1,col2\n1,2\n"),
+        (JsonEegReader, "a.json", b'[{"channel": "F1", "trial": 0, "sample": 0}]'),
+        (JsonEegReader, "a.json", b'"not an array"'),
+        (ParquetEegReader, "a.parquet", b"PAR1 not really parquet"),
+        (EdfEegReader, "a.edf", b"0       " + b" " * 100),
+    ])
+    def test_invalid_files_raise(self, tmp_path, reader, name, content):
+        path = tmp_path / name
+        path.write_bytes(content)
+
+        with pytest.raises(ValueError):
+            reader().sniff(str(path))
+
+    def test_json_reads_only_the_first_block(self, tmp_path, frame, monkeypatch):
+        records = frame.to_dict(orient="records")
+        records[-1] = {"channel": "F1"}  # broken far beyond the first block
+        path = tmp_path / "a.json"
+        with open(path, "w") as f:
+            json.dump(records, f)
+        monkeypatch.setattr("app.domain.reader.json_reader.READ_BLOCK_CHARS", 4096)
+
+        JsonEegReader().sniff(str(path))
+
+
+class TestConvertUpload:
+
+    @pytest.fixture(autouse=True)
+    def upload_folder(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "EEG_UPLOAD_FOLDER", str(tmp_path))
+        monkeypatch.setattr(Config, "EEG_STORAGE_FORMAT", "dense")
+
+    def test_converts_to_storage_format(self, tmp_path, frame):
+        upload_path = str(tmp_path / f"{UPLOAD_PREFIX}abc.csv")
+        frame.to_csv(upload_path, index=False)
+        record = SimpleNamespace(file_path=upload_path, file_size_bytes=os.path.getsize(upload_path))
+
+        assert EegRecordService.is_pending_conversion(record)
+        EegRecordService.convert_upload(record)
+
+        assert not EegRecordService.is_pending_conversion(record)
+        assert record.file_path.endswith(".npy")
+        assert read_dense(record.file_path).data.shape == (2, 34, 390)
+        # The upload stays until the caller has committed the new path
+        assert os.path.exists(upload_path)
+
+    def test_invalid_content_raises(self, tmp_path):
+        upload_path = str(tmp_path / f"{UPLOAD_PREFIX}abc.json")
+        with open(upload_path, "w") as f:
+            json.dump([{"channel": "F1", "trial": 0, "sample": 0, "value": 1.0}, {"channel": "F1"}], f)
+
+        with pytest.raises(ValueError, match="Missing required columns"):
+            EegRecordService.convert_upload(SimpleNamespace(file_path=upload_path, file_size_bytes=0))
@@ -21,7 +21,11 @@ import {
 import { useAuth } from "@/contexts/auth-context";
 import { useProcessing } from "@/contexts/processing-context";
 import { patientService, Patient } from "@/services/patient-service";
-import { eegService, type EEGRecord } from "@/services/eeg-service";
+import {
+  eegService,
+  type EEGRecord,
+  type EEGStatusUpdate,
+} from "@/services/eeg-service";
 import { translateError } from "@/utils/error-translations";
 
 const UploadEEGTab = () => {
@@ -115,7 +119,7 @@ const UploadEEGTab = () => {
     });
 
     // Callback for status changes
-    const handleStatusChange = (updatedRecord: EEGRecord) => {
+    const handleStatusChange = (updatedRecord: EEGStatusUpdate) => {
       // Handle failed status with retry information
       if (updatedRecord.status === "failed") {
         retryCount++;
@@ -130,11 +134,10 @@ const UploadEEGTab = () => {
     };
 
     try {
-      const finalRecord = await eegService.pollEEGStatus(
+      // Status stream, with polling as fallback
+      const finalRecord = await eegService.waitForEEGProcessing(
         String(record.id),
         handleStatusChange,
-        120, // 120 retries = 10 minutes with 5s intervals
-        5000, // 5 second intervals
       );
 
       // Final update
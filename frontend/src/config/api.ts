@@ -28,6 +28,7 @@ export const API_ENDPOINTS = {
   EEG_RECORD_BY_ID: (id: string) => `/eeg-records/${id}`,
   EEG_RECORD_UPLOAD: "/eeg-records/upload",
   EEG_RECORD_STATUS: (id: string) => `/eeg-records/${id}/status`,
+  EEG_RECORD_STATUS_STREAM: (id: string) => `/eeg-records/${id}/status/stream`,
   EEG_RECORD_PREDICTION: (id: string) => `/eeg-records/${id}/prediction`,
   EEG_RECORD_VISUALIZATION: (id: string) => `/eeg-records/${id}/visualizations`,
 
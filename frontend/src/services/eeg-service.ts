@@ -4,7 +4,7 @@
  */
 
 import { parse } from "path";
-import { httpClient } from "./http-client";
+import { httpClient, HttpError } from "./http-client";
 import { API_ENDPOINTS } from "@/config/api";
 
 export interface EEGRecord {
@@ -27,6 +27,21 @@ export interface EEGStatus {
   error_message?: string;
 }
 
+/** Evento "status" de /eeg-records/<id>/status/stream */
+export interface EEGStatusEvent {
+  id: string;
+  status: EEGRecord["status"];
+  processing_time_ms: number | null;
+  error_msg: string | null;
+  visualization_status: "pending" | "processing" | "completed" | "failed" | null;
+}
+
+/** Campos de estado que reciben los callbacks de seguimiento */
+export type EEGStatusUpdate = Pick<
+  EEGRecord,
+  "id" | "status" | "error_msg" | "processing_time_ms"
+>;
+
 export interface PredictionResult {
   id: string;
   eeg_record_id: string;
@@ -179,6 +194,74 @@ class EEGService {
     await httpClient.delete(API_ENDPOINTS.PREDICTION_BY_ID(id));
   }
 
+  /**
+   * Wait until an EEG record is processed or failed, following its status
+   * stream. Falls back to polling if the stream is refused (503 when the
+   * worker is full), breaks, or ends before a final status.
+   * @param eegRecordId - The ID of the EEG record to monitor
+   * @param onStatusChange - Callback function when status changes
+   * @returns Promise that resolves with the final status
+   */
+  async waitForEEGProcessing(
+    eegRecordId: string,
+    onStatusChange?: (update: EEGStatusUpdate) => void,
+  ): Promise<EEGStatusUpdate> {
+    let lastStatus: string | null = null;
+    const notify = (update: EEGStatusUpdate) => {
+      if (update.status !== lastStatus) {
+        lastStatus = update.status;
+        onStatusChange?.(update);
+      }
+    };
+
+    try {
+      const final = await this.streamEEGStatus(eegRecordId, notify);
+      if (final) return final;
+    } catch (error) {
+      // Sesión expirada: el polling fallaría igual
+      if (error instanceof HttpError && error.status === 401) throw error;
+      console.warn("EEG status stream unavailable, polling instead:", error);
+    }
+    return this.pollEEGStatus(eegRecordId, notify);
+  }
+
+  /**
+   * Follow the status stream of an EEG record until it is processed or failed.
+   * The stream is read with fetch so the JWT goes in the Authorization header,
+   * as in every other request.
+   * @returns The final status, or null if the stream ended without one
+   */
+  async streamEEGStatus(
+    eegRecordId: string,
+    onStatusChange?: (update: EEGStatusUpdate) => void,
+  ): Promise<EEGStatusUpdate | null> {
+    const controller = new AbortController();
+    let final: EEGStatusUpdate | null = null;
+
+    await httpClient.stream(
+      API_ENDPOINTS.EEG_RECORD_STATUS_STREAM(eegRecordId),
+      (event, data) => {
+        if (event !== "status" || final) return;
+        const payload: EEGStatusEvent = JSON.parse(data);
+        const update: EEGStatusUpdate = {
+          id: payload.id,
+          status: payload.status,
+          error_msg: payload.error_msg ?? undefined,
+          processing_time_ms: payload.processing_time_ms ?? undefined,
+        };
+        onStatusChange?.(update);
+
+        // Las visualizaciones siguen en el stream; aquí basta con la predicción
+        if (update.status === "processed" || update.status === "failed") {
+          final = update;
+          controller.abort();
+        }
+      },
+      controller.signal,
+    );
+    return final;
+  }
+
   /**
    * Poll the status of an EEG record with a callback for updates
    * @param eegRecordId - The ID of the EEG record to monitor
@@ -117,6 +117,64 @@ class HttpClient {
     return this.handleResponse<T>(response);
   }
 
+  /**
+   * GET a Server-Sent Events stream with the Authorization header (EventSource
+   * cannot send headers) and call onMessage with the data of each event.
+   * Resolves when the server ends the stream or signal aborts it.
+   */
+  async stream(
+    endpoint: string,
+    onMessage: (event: string, data: string) => void,
+    signal?: AbortSignal,
+  ): Promise<void> {
+    const headers: HeadersInit = { Accept: "text/event-stream" };
+    const token = this.getToken();
+    if (token) {
+      headers["Authorization"] = `Bearer ${token}`;
+    }
+
+    const response = await fetch(`${this.baseURL}${endpoint}`, {
+      method: "GET",
+      headers,
+      signal,
+    });
+    if (!response.ok || !response.body) {
+      await this.handleResponse(response);
+      throw new HttpError(response.status, "Stream not available");
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    try {
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) return;
+        buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, "\n");
+
+        // Los eventos terminan en una línea vacía; los comentarios (": ...") se ignoran
+        let end;
+        while ((end = buffer.indexOf("\n\n")) >= 0) {
+          const message = buffer.slice(0, end);
+          buffer = buffer.slice(end + 2);
+
+          let event = "message";
+          const data: string[] = [];
+          for (const line of message.split("\n")) {
+            if (line.startsWith("event:")) event = line.slice(6).trim();
+            else if (line.startsWith("data:")) data.push(line.slice(5).trimStart());
+          }
+          if (data.length > 0) onMessage(event, data.join("\n"));
+        }
+      }
+    } catch (error) {
+      if (signal?.aborted) return;
+      throw error;
+    } finally {
+      reader.releaseLock();
+    }
+  }
+
   async uploadFile<T>(endpoint: string, file: File, additionalData?: Record<string, string>): Promise<T> {
     const formData = new FormData();
     formData.append("file", file);